@@ -1,7 +1,7 @@
 from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from app.models import Election, Candidate, Party, Vote, Profile
+from app.models import Election, Candidate, Party, Vote, Profile, ElectionResult
 from app.encryption import Encryption, Ciphertext
 import json
 from app.actions.elections_actions import start_election, end_election
@@ -32,8 +32,18 @@ class PartyAdmin(admin.ModelAdmin):
     list_display = ('name', 'created')
 
 class VoteAdmin(admin.ModelAdmin):
-    list_display = ('user', 'election', 'ballot', 'created', 'hashed')
+    list_display = ('user', 'election', 'get_ballot_display', 'created', 'hashed')
     # readonly_fields = ('created', 'user', 'election', 'ballot')
+    
+    def get_ballot_display(self, obj):
+        """Display the encrypted ballot, read from the archive for archived elections"""
+        return obj.get_ballot()
+    get_ballot_display.short_description = 'Ballot'
+
+class ElectionResultAdmin(admin.ModelAdmin):
+    list_display = ('election', 'candidate', 'votes', 'percentage', 'rank')
+    list_filter = ('election',)
+    readonly_fields = ('election', 'candidate', 'votes', 'percentage', 'rank', 'created')
 
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'get_display_name', 'get_age', 'location', 'gender', 'created')
@@ -67,3 +77,4 @@ admin.site.register(Candidate, CandidateAdmin)
 admin.site.register(Party, PartyAdmin)
 admin.site.register(Vote, VoteAdmin)
 admin.site.register(Profile, ProfileAdmin)
+admin.site.register(ElectionResult, ElectionResultAdmin)
@@ -0,0 +1,168 @@
+"""
+Cold archival of closed elections' ballots to compressed segment files
+
+An archived election's ballots live in two files under BALLOT_ARCHIVE_ROOT:
+
+- ``<uuid>.seg``: a magic header followed by blocks of up to BALLOTS_PER_BLOCK
+  ballots. Each block is a header (compressed length, ballot count, CRC32)
+  followed by the zlib-compressed ``vote_id<TAB>ballot`` lines, ordered by
+  vote id. The file is written once and never rewritten.
+- ``<uuid>.idx``: a small JSON index with the SHA-256 of the segment, the
+  ballot count, and the offset and first vote id of every block.
+
+Vote rows stay in the database with an empty ballot, so receipts, "already
+voted" checks and voting history keep working. Ballots are read back through
+mmap, one block at a time.
+"""
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+
+from django.conf import settings
+
+SEGMENT_MAGIC = b'IKHBSEG1'
+BLOCK_HEADER = struct.Struct('>III')  # compressed length, ballot count, CRC32 of the compressed bytes
+BALLOTS_PER_BLOCK = 256
+FORMAT_VERSION = 1
+
+
+class ArchiveError(Exception):
+    """Raised when an archive is missing or fails its checksums"""
+
+
+def archive_paths(election):
+    """(segment, index) paths of an election's archive"""
+    root = Path(settings.BALLOT_ARCHIVE_ROOT)
+    return root / f'{election.uuid}.seg', root / f'{election.uuid}.idx'
+
+
+def _write_atomically(path, write):
+    """Write a file through a temporary name so readers never see a partial file"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_archive(election, ballots):
+    """
+    Stream (vote_id, ballot) pairs, ordered by vote id, into the election's archive.
+
+    Returns the index that was written.
+    """
+    segment_path, index_path = archive_paths(election)
+    segment_path.parent.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    blocks = []
+    count = 0
+
+    def write_block(f, block):
+        payload = zlib.compress(''.join(f'{vote_id}\t{ballot}\n' for vote_id, ballot in block).encode())
+        data = BLOCK_HEADER.pack(len(payload), len(block), zlib.crc32(payload)) + payload
+        blocks.append([f.tell(), block[0][0]])
+        f.write(data)
+        digest.update(data)
+
+    def write_segment(f):
+        nonlocal count
+        f.write(SEGMENT_MAGIC)
+        digest.update(SEGMENT_MAGIC)
+        block = []
+        for vote_id, ballot in ballots:
+            block.append((vote_id, ballot))
+            count += 1
+            if len(block) == BALLOTS_PER_BLOCK:
+                write_block(f, block)
+                block = []
+        if block:
+            write_block(f, block)
+
+    _write_atomically(segment_path, write_segment)
+
+    index = {
+        'format': FORMAT_VERSION,
+        'election': str(election.uuid),
+        'ballots': count,
+        'sha256': digest.hexdigest(),
+        'blocks': blocks,
+    }
+    _write_atomically(index_path, lambda f: f.write(json.dumps(index).encode()))
+    return index
+
+
+class BallotArchive:
+    """Read-only, memory-mapped view of an election's archived ballots"""
+
+    def __init__(self, election):
+        self.segment_path, self.index_path = archive_paths(election)
+        try:
+            with open(self.index_path, 'rb') as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            raise ArchiveError(f'No ballot archive for election {election.uuid}')
+        self._first_ids = [first_id for _, first_id in self.index['blocks']]
+        self._file = None
+        self._map = None
+        self._block = (None, {})  # Last block read by get_ballot, as (number, ballots by vote id)
+
+    def __enter__(self):
+        self._file = open(self.segment_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+            self.close()
+            raise ArchiveError(f'{self.segment_path} is not a ballot segment')
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __len__(self):
+        return self.index['ballots']
+
+    def __iter__(self):
+        """Yield (vote_id, ballot) pairs in vote id order"""
+        for number in range(len(self._first_ids)):
+            yield from self.read_block(number)
+
+    def read_block(self, number):
+        """Decompress one block after checking its CRC"""
+        offset = self.index['blocks'][number][0]
+        length, count, crc = BLOCK_HEADER.unpack_from(self._map, offset)
+        start = offset + BLOCK_HEADER.size
+        with memoryview(self._map)[start:start + length] as payload:
+            if zlib.crc32(payload) != crc:
+                raise ArchiveError(f'Block {number} of {self.segment_path} is corrupt')
+            lines = zlib.decompress(payload).decode().splitlines()
+        if len(lines) != count:
+            raise ArchiveError(f'Block {number} of {self.segment_path} is truncated')
+        return [(int(vote_id), ballot) for vote_id, ballot in (line.split('\t', 1) for line in lines)]
+
+    def get_ballot(self, vote_id):
+        """The archived ballot of one vote, or None if it isn't in the archive"""
+        number = bisect.bisect_right(self._first_ids, vote_id) - 1
+        if number < 0:
+            return None
+        if self._block[0] != number:
+            self._block = (number, dict(self.read_block(number)))
+        return self._block[1].get(vote_id)
+
+    def verify(self):
+        """Check the segment against the checksum and ballot count in the index"""
+        if hashlib.sha256(self._map).hexdigest() != self.index['sha256']:
+            raise ArchiveError(f'{self.segment_path} does not match its index checksum')
+        if sum(1 for _ in self) != len(self):
+            raise ArchiveError(f'{self.segment_path} does not hold {len(self)} ballots')
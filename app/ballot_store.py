@@ -0,0 +1,210 @@
+"""
+Append-only binary ballot store used for fast tallies
+
+Alongside the database, each election's ballots are appended to
+``<uuid>.bal`` under BALLOT_STORE_ROOT as fixed-width records once the vote
+commits. The file starts with a 16-byte header (magic, component width in
+bytes, components per ballot) followed by one record per ballot: the vote id
+as an 8-byte big-endian integer and each ciphertext component as a big-endian
+integer of the component width (the byte length of n^2).
+
+The database remains the source of truth. Tallies only use the store when it
+records exactly the vote ids of the election's ballots in the database, and
+``manage.py rebuild_ballot_store`` rewrites it from the database.
+"""
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+STORE_MAGIC = b'IKHBBAL1'
+STORE_HEADER = struct.Struct('>8sHH4x')  # magic, component width, components per ballot
+VOTE_ID = struct.Struct('>Q')
+
+
+class BallotStoreError(Exception):
+    """Raised when a ballot store is missing, malformed or out of step with the database"""
+
+
+def ballot_store_enabled():
+    """The store is opt-in because every app server needs the same persistent directory"""
+    return bool(settings.BALLOT_STORE_ROOT)
+
+
+def store_path(election):
+    """Path of an election's ballot store"""
+    return Path(settings.BALLOT_STORE_ROOT) / f'{election.uuid}.bal'
+
+
+def component_width(election):
+    """Bytes needed for a ciphertext mod n^2 under the election's public key"""
+    public_key = json.loads(election.public_key.replace("'", '"'))
+    n = int(public_key['n'])
+    return ((n * n).bit_length() + 7) // 8
+
+
+@contextmanager
+def _store_lock(election, operation):
+    """Hold a lock on the election's store; appends and rebuilds are exclusive, readers share"""
+    path = store_path(election)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix('.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, operation)
+        try:
+            yield path
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _encode_record(vote_id, components, width):
+    return VOTE_ID.pack(vote_id) + b''.join(component.to_bytes(width, 'big') for component in components)
+
+
+def append_ballot(vote):
+    """
+    Append a committed vote's ballot to its election's store.
+
+    Returns False when the ballot can't be stored (legacy format, or a
+    component count that doesn't match the store); tallies then fall back to
+    the database until the store is rebuilt.
+    """
+    from app.tally import parse_ballot
+
+    components = parse_ballot(str(vote.ballot))
+    if components is None:
+        return False
+    election = vote.election
+    width = component_width(election)
+
+    with _store_lock(election, fcntl.LOCK_EX) as path:
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            header = os.pread(fd, STORE_HEADER.size, 0)
+            if not header:
+                os.write(fd, STORE_HEADER.pack(STORE_MAGIC, width, len(components)))
+            elif STORE_HEADER.unpack(header) != (STORE_MAGIC, width, len(components)):
+                logger.warning(f'Ballot of vote {vote.pk} does not fit the store of election {election.uuid}')
+                return False
+            os.write(fd, _encode_record(vote.pk, components, width))
+        finally:
+            os.close(fd)
+    return True
+
+
+def rebuild_ballot_store(election, using=None):
+    """Rewrite an election's store from the database; returns the number of ballots written"""
+    from app.models import Vote
+    from app.tally import parse_ballot
+
+    width = component_width(election)
+    ballots = (
+        Vote.objects.using(using)
+        .filter(election=election)
+        .order_by('id')
+        .values_list('id', 'ballot')
+        .iterator(chunk_size=2000)
+    )
+
+    count = 0
+    with _store_lock(election, fcntl.LOCK_EX) as path:
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            components_per_ballot = None
+            for vote_id, ballot in ballots:
+                components = parse_ballot(ballot)
+                if components is None:
+                    continue
+                if components_per_ballot is None:
+                    components_per_ballot = len(components)
+                    f.write(STORE_HEADER.pack(STORE_MAGIC, width, components_per_ballot))
+                elif len(components) != components_per_ballot:
+                    raise BallotStoreError(f'Vote {vote_id} has {len(components)} components, '
+                                           f'expected {components_per_ballot}')
+                f.write(_encode_record(vote_id, components, width))
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    return count
+
+
+def discard_ballot_store(election):
+    """Remove an election's store, e.g. once its ballots are archived"""
+    with _store_lock(election, fcntl.LOCK_EX) as path:
+        path.unlink(missing_ok=True)
+    path.with_suffix('.lock').unlink(missing_ok=True)
+
+
+class BallotStore:
+    """Read-only, memory-mapped view of an election's ballot store"""
+
+    def __init__(self, election):
+        self.election = election
+        self._map = None
+
+    def __enter__(self):
+        # Appends extend the file after the mapped region, so the lock is only
+        # needed while mapping to avoid seeing a half-written record
+        with _store_lock(self.election, fcntl.LOCK_SH) as path:
+            try:
+                with open(path, 'rb') as f:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):  # ValueError: empty file
+                raise BallotStoreError(f'No ballot store for election {self.election.uuid}')
+
+        magic, self.width, self.components = STORE_HEADER.unpack_from(self._map)
+        if magic != STORE_MAGIC:
+            self.close()
+            raise BallotStoreError(f'Ballot store of election {self.election.uuid} is malformed')
+        self.record_size = VOTE_ID.size + self.width * self.components
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __len__(self):
+        return (len(self._map) - STORE_HEADER.size) // self.record_size
+
+    def records(self):
+        """
+        Yield (vote_id, components) for each ballot, where components are
+        memoryview slices of the mapped file rather than copies.
+        """
+        view = memoryview(self._map)
+        try:
+            width = self.width
+            end = STORE_HEADER.size + len(self) * self.record_size
+            for offset in range(STORE_HEADER.size, end, self.record_size):
+                start = offset + VOTE_ID.size
+                components = [view[start + i * width:start + (i + 1) * width] for i in range(self.components)]
+                try:
+                    yield VOTE_ID.unpack_from(view, offset)[0], components
+                finally:
+                    for component in components:
+                        component.release()
+        finally:
+            view.release()
+
+    def vote_ids(self):
+        """Yield the vote id of each record, in file order"""
+        end = STORE_HEADER.size + len(self) * self.record_size
+        for offset in range(STORE_HEADER.size, end, self.record_size):
+            yield VOTE_ID.unpack_from(self._map, offset)[0]
+
+    def ciphertexts(self):
+        """Yield each ballot's ciphertext components as integers"""
+        for _, components in self.records():
+            yield [int.from_bytes(component, 'big') for component in components]
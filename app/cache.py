@@ -0,0 +1,153 @@
+"""
+Named caches and their hit ratios
+
+CACHES (see project/settings.py) has one entry per kind of cached data, each
+with its own lifetime and eviction policy:
+
+- ``default``: voter rolls and other small lookups
+- ``pages``: pages micro-cached for anonymous visitors (app.page_cache)
+- ``template_fragments``: election cards and candidate lists ({% cache %})
+- ``crypto``: rendered verification transcripts of closed elections
+- ``counters``: turnout sums and live election statuses
+
+They all use the backend picked with CACHE_BACKEND: memory of one process for
+development, files shared by the workers of one node, or a Redis server shared
+by every node.
+
+Every entry is wrapped in an InstrumentedCache that counts the hits and misses
+of reads. Counts are kept in memory and added to the cache itself every
+STATS_FLUSH_READS reads or STATS_FLUSH_SECONDS, so ``manage.py cache_stats``
+reports the totals of all processes sharing the backend. The file backend's
+incr() reads and rewrites the file, so concurrent flushes can lose counts and
+its totals are approximate; Redis adds them atomically.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.module_loading import import_string
+
+STATS_FLUSH_READS = 100
+STATS_FLUSH_SECONDS = 10
+
+_MISSING = object()
+
+
+def _stats_key(outcome):
+    return f'cache-stats:{outcome}'
+
+
+class InstrumentedCache(BaseCache):
+    """
+    Cache backend that wraps the one named by WRAPS and counts read hits and
+    misses. Every other option is passed to the wrapped backend.
+    """
+
+    def __init__(self, location, params):
+        params = dict(params)
+        backend = import_string(params.pop('WRAPS'))
+        super().__init__(params)
+        self._cache = backend(location, params)
+        self._pending = {'hits': 0, 'misses': 0}
+        self._flushed_at = time.monotonic()
+
+    def _record(self, hits, misses):
+        self._pending['hits'] += hits
+        self._pending['misses'] += misses
+        if (sum(self._pending.values()) >= STATS_FLUSH_READS
+                or time.monotonic() - self._flushed_at >= STATS_FLUSH_SECONDS):
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Add the counts of this process to the shared totals"""
+        for outcome, count in self._pending.items():
+            if not count:
+                continue
+            try:
+                self._cache.incr(_stats_key(outcome), count)
+            except ValueError:  # First flush, or the totals were evicted
+                self._cache.set(_stats_key(outcome), count, None)
+        self._pending = {'hits': 0, 'misses': 0}
+        self._flushed_at = time.monotonic()
+
+    def get_stats(self):
+        """{'hits', 'misses'} read from this cache since the last reset, by every process"""
+        self.flush_stats()
+        totals = self._cache.get_many([_stats_key('hits'), _stats_key('misses')])
+        return {outcome: totals.get(_stats_key(outcome), 0) for outcome in ('hits', 'misses')}
+
+    def reset_stats(self):
+        self._pending = {'hits': 0, 'misses': 0}
+        self._cache.delete_many([_stats_key('hits'), _stats_key('misses')])
+
+    def get(self, key, default=None, version=None):
+        value = self._cache.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._record(0, 1)
+            return default
+        self._record(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = self._cache.get_many(keys, version=version)
+        self._record(len(found), len(keys) - len(found))
+        return found
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._cache.add(key, value, timeout, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._cache.set(key, value, timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._cache.set_many(data, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._cache.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        return self._cache.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        self._cache.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        return self._cache.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        return self._cache.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        return self._cache.decr(key, delta, version=version)
+
+    def clear(self):
+        """Empty the cache; on Redis this empties the whole database, every namespace included"""
+        self._pending = {'hits': 0, 'misses': 0}
+        self._cache.clear()
+
+    def close(self, **kwargs):
+        if time.monotonic() - self._flushed_at >= STATS_FLUSH_SECONDS:
+            self.flush_stats()
+        self._cache.close(**kwargs)
+
+
+def clear_caches():
+    """Empty every named cache"""
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+def uncached_fragments(fragment_name, objects, vary_on):
+    """
+    The objects whose {% cache %} fragment is missing from the fragment cache.
+
+    vary_on(obj) returns the values the fragment's cache tag varies on, so
+    views only load what a fragment displays when it will be rendered.
+    """
+    objects = list(objects)
+    keys = [make_template_fragment_key(fragment_name, vary_on(obj)) for obj in objects]
+    cached = caches['template_fragments'].get_many(keys)
+    return [obj for key, obj in zip(keys, objects) if key not in cached]
@@ -0,0 +1,79 @@
+"""
+Database router that sends reads to replicas and keeps writes on the primary
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Aliases of read replicas in settings.DATABASES start with this prefix
+REPLICA_PREFIX = 'replica'
+
+_pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+
+
+def get_replica_aliases():
+    """Names of the configured read replicas"""
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+@contextmanager
+def pin_to_primary(pinned=True):
+    """Send every read inside the block to the primary database"""
+    token = _pinned_to_primary.set(pinned or _pinned_to_primary.get())
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+def is_pinned_to_primary():
+    """Check whether reads must currently see the primary's latest writes"""
+    return _pinned_to_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+def get_replica_lag(alias):
+    """Seconds the replica's replayed data trails the primary, or None when the backend can't tell"""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        # An idle primary sends nothing to replay, so a caught-up replica reports no lag
+        cursor.execute("""
+            SELECT CASE
+                WHEN NOT pg_is_in_recovery() THEN 0
+                WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+            END
+        """)
+        return float(cursor.fetchone()[0])
+
+
+class ReplicaRouter:
+    """Route reads to a random replica unless the current request or command is pinned to the primary"""
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replica_aliases()
+        if not replicas:
+            return None  # Django's default routing
+        if is_pinned_to_primary():
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if not get_replica_aliases():
+            return None
+        # Objects read from a replica must still be written to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication
+        if db.startswith(REPLICA_PREFIX):
+            return False
+        return None
@@ -0,0 +1,144 @@
+"""
+Live election status and turnout for Server-Sent Events subscribers
+
+Each process runs one Broadcaster. While anyone is subscribed it reads the
+state of every watched election once per LIVE_POLL_SECONDS (statuses in one
+query behind a short cache, turnout from the cached sharded counters) and
+pushes the changes to each subscriber's queue, so the number of database
+reads doesn't grow with the number of open connections. Saving an election
+drops its cached status, so opening and closing it is pushed on the next tick.
+
+Streams are only long-lived under an ASGI worker (see gunicorn_config.py).
+Sync workers answer with the current state and let the browser reconnect.
+"""
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_SECONDS = 15
+STATUS_CACHE_SECONDS = 10
+
+# Statuses in which no more votes are cast; streams end on them
+TERMINAL_STATUSES = {'closed', 'expired'}
+
+
+def _status_key(uuid):
+    return f'live-status:{uuid}'
+
+
+def forget_status(election):
+    """Drop an election's cached status after it changed"""
+    caches['counters'].delete(_status_key(election.uuid))
+
+
+def read_live_state(elections):
+    """{uuid: {'status', 'turnout'}} of the given elections, from the cache where possible"""
+    from app.models import Election
+    from app.turnout import get_turnout
+
+    cache = caches['counters']
+    elections = {election.uuid: election for election in elections}
+    cached = cache.get_many([_status_key(uuid) for uuid in elections])
+    statuses = {uuid: cached[_status_key(uuid)] for uuid in elections if _status_key(uuid) in cached}
+
+    missing = [uuid for uuid in elections if uuid not in statuses]
+    if missing:
+        fresh = dict(Election.objects.filter(uuid__in=missing).with_status().values_list('uuid', 'status'))
+        cache.set_many({_status_key(uuid): status for uuid, status in fresh.items()}, STATUS_CACHE_SECONDS)
+        statuses.update(fresh)
+
+    return {
+        uuid: {'status': statuses.get(uuid), 'turnout': get_turnout(election)}
+        for uuid, election in elections.items()
+    }
+
+
+def format_event(event, data):
+    """Encode one Server-Sent Event"""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+class Broadcaster:
+    """Fan out state changes of watched elections to the subscribers of one process"""
+
+    def __init__(self):
+        self._queues = {}     # uuid -> set of subscriber queues
+        self._elections = {}  # uuid -> Election
+        self._states = {}     # uuid -> last state pushed
+        self._task = None
+
+    def subscribe(self, election):
+        """Start receiving (event, data) tuples for an election; runs the poller if needed"""
+        queue = asyncio.Queue()
+        self._queues.setdefault(election.uuid, set()).add(queue)
+        self._elections[election.uuid] = election
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, election, queue):
+        queues = self._queues.get(election.uuid, set())
+        queues.discard(queue)
+        if not queues:
+            self._queues.pop(election.uuid, None)
+            self._elections.pop(election.uuid, None)
+            self._states.pop(election.uuid, None)
+
+    async def _run(self):
+        while self._queues:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception('Failed to read live election state')
+            await asyncio.sleep(settings.LIVE_POLL_SECONDS)
+
+    async def tick(self):
+        """Read the state of every watched election once and push what changed"""
+        states = await sync_to_async(read_live_state)(list(self._elections.values()))
+        for uuid, state in states.items():
+            previous = self._states.get(uuid)
+            self._states[uuid] = state
+            if previous is None:
+                continue
+            events = []
+            if state['turnout'] != previous['turnout']:
+                events.append(('turnout', {'total': state['turnout'],
+                                           'delta': state['turnout'] - previous['turnout']}))
+            if state['status'] != previous['status']:
+                events.append(('status', {'status': state['status']}))
+            for queue in self._queues.get(uuid, ()):
+                for event in events:
+                    queue.put_nowait(event)
+
+    async def stream(self, election):
+        """Yield a snapshot of the election, then its events until voting ends"""
+        queue = self.subscribe(election)
+        try:
+            state = self._states.get(election.uuid)
+            if state is None:
+                state = (await sync_to_async(read_live_state)([election]))[election.uuid]
+                self._states.setdefault(election.uuid, state)
+            yield format_event('snapshot', state)
+            if state['status'] in TERMINAL_STATUSES:
+                return
+
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'  # Keeps proxies from closing an idle connection
+                    continue
+                yield format_event(event, data)
+                if event == 'status' and data['status'] in TERMINAL_STATUSES:
+                    return
+        finally:
+            self.unsubscribe(election, queue)
+
+
+broadcaster = Broadcaster()
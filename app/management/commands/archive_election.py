@@ -0,0 +1,76 @@
+"""
+Management command that moves a closed election's ballots to cold storage
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from app.archive import ArchiveError, BallotArchive, archive_paths, write_archive
+from app.ballot_store import ballot_store_enabled, discard_ballot_store
+from app.db_router import pin_to_primary
+from app.encryption import Ciphertext
+from app.models import Election, Vote
+from app.tally import get_election_encryption, sum_ballots
+
+
+class Command(BaseCommand):
+    help = "Archive a closed, verified election's ballots to a compressed segment file and clear them from the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('election', help='UUID of the election to archive')
+
+    def handle(self, *args, **options):
+        # The archive must hold every ballot, so never read from a lagging replica
+        with pin_to_primary():
+            self.archive(options['election'])
+
+    def archive(self, uuid):
+        try:
+            election = Election.objects.get(uuid=uuid)
+        except (Election.DoesNotExist, ValueError):
+            raise CommandError(f'Election {uuid} not found')
+
+        if election.archived_at is not None:
+            raise CommandError(f'Election "{election.name}" was already archived on {election.archived_at:%Y-%m-%d}')
+        if election.get_status() != 'closed':
+            raise CommandError(f'Election "{election.name}" is not closed yet')
+        if not election.verified:
+            raise CommandError(f'Election "{election.name}" has no verified tally; finalize its results first')
+
+        votes = Vote.objects.filter(election=election)
+        ballots = votes.order_by('id').values_list('id', 'ballot').iterator(chunk_size=2000)
+        index = write_archive(election, ballots)
+        self.check_archive(election, votes.count())
+
+        with transaction.atomic():
+            cleared = votes.update(ballot='')
+            election.archived_at = timezone.now()
+            election.save(update_fields=['archived_at'])
+
+        if ballot_store_enabled():
+            discard_ballot_store(election)
+
+        segment_path, _ = archive_paths(election)
+        self.stdout.write(self.style.SUCCESS(
+            f'📦 Archived {index["ballots"]} ballots of "{election.name}" to {segment_path} '
+            f'({segment_path.stat().st_size} bytes)'
+        ))
+        self.stdout.write(f'   Cleared {cleared} ballots from the database; receipts stay online')
+
+    def check_archive(self, election, expected_ballots):
+        """Re-read the archive and confirm it reproduces the stored encrypted tally"""
+        try:
+            with BallotArchive(election) as archive:
+                archive.verify()
+                if len(archive) != expected_ballots:
+                    raise ArchiveError(f'Archive holds {len(archive)} of {expected_ballots} ballots')
+
+            totals = sum_ballots(election, get_election_encryption(election), from_archive=True)
+        except ArchiveError as e:
+            raise CommandError(f'Archive check failed, ballots were left in the database: {e}')
+
+        stored = [Ciphertext.from_json(ct).ciphertext for ct in json.loads(election.encrypted_positive_total)]
+        if totals != stored:
+            raise CommandError('Archived ballots do not reproduce the stored tally, ballots were left in the database')
@@ -0,0 +1,34 @@
+"""
+Management command that reports the hit ratio of each named cache
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Report read hits and misses of each named cache, summed over every process sharing the cache backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Start counting again from zero')
+
+    def handle(self, *args, **options):
+        names = [alias for alias in settings.CACHES if hasattr(caches[alias], 'get_stats')]
+        if not names:
+            raise CommandError('No cache is instrumented; see CACHES in project/settings.py')
+
+        self.stdout.write(f"Backend: {settings.CACHE_BACKENDS[settings.CACHE_BACKEND]}")
+        if settings.CACHE_BACKEND == 'locmem':
+            self.stdout.write(self.style.WARNING('   The locmem backend is per process; only this process is counted'))
+
+        for alias in names:
+            cache = caches[alias]
+            stats = cache.get_stats()
+            reads = stats['hits'] + stats['misses']
+            ratio = f"{stats['hits'] / reads:.1%}" if reads else 'n/a'
+            self.stdout.write(f"📊 {alias:<20} {stats['hits']:>10} hits {stats['misses']:>10} misses   {ratio} hit ratio")
+            if options['reset']:
+                cache.reset_stats()
+
+        if options['reset']:
+            self.stdout.write(self.style.SUCCESS('🧹 Cache statistics reset'))
@@ -1,7 +1,9 @@
 """
 Management command to check vote encryption status
 """
+from contextlib import nullcontext
 from django.core.management.base import BaseCommand
+from app.archive import BallotArchive
 from app.models import Vote, Election, Candidate
 
 
@@ -31,20 +33,22 @@ class Command(BaseCommand):
                 self.stdout.write("No votes found.")
                 continue
             
-            for vote in votes:
-                total_votes += 1
-                is_insecure = self._is_vote_insecure(vote)
-                
-                if is_insecure:
-                    insecure_votes += 1
-                    election_insecure += 1
-                
-                if not options['insecure_only'] or is_insecure:
-                    security_status = "INSECURE" if is_insecure else "SECURE"
-                    self.stdout.write(
-                        f"  {vote.user.username}: {security_status} - "
-                        f"Ballot: {str(vote.ballot)[:50]}{'...' if len(str(vote.ballot)) > 50 else ''}"
-                    )
+            with self._open_archive(election) as archive:
+                for vote in votes:
+                    ballot = vote.get_ballot(archive)
+                    total_votes += 1
+                    is_insecure = self._is_vote_insecure(ballot)
+                    
+                    if is_insecure:
+                        insecure_votes += 1
+                        election_insecure += 1
+                    
+                    if not options['insecure_only'] or is_insecure:
+                        security_status = "INSECURE" if is_insecure else "SECURE"
+                        self.stdout.write(
+                            f"  {vote.user.username}: {security_status} - "
+                            f"Ballot: {str(ballot)[:50]}{'...' if len(str(ballot)) > 50 else ''}"
+                        )
             
             if election_insecure > 0:
                 self.stdout.write(
@@ -70,9 +74,15 @@ class Command(BaseCommand):
                 self.style.SUCCESS("✅ All votes are properly encrypted")
             )
     
-    def _is_vote_insecure(self, vote):
-        """Check if a vote is insecurely stored"""
-        ballot_str = str(vote.ballot)
+    def _open_archive(self, election):
+        """The ballot archive of an archived election, shared by its votes"""
+        if election.archived_at is None:
+            return nullcontext()
+        return BallotArchive(election)
+    
+    def _is_vote_insecure(self, ballot):
+        """Check if a ballot is insecurely stored"""
+        ballot_str = str(ballot)
         
         # Check if ballot contains plain text candidate ID (format: "candidate_id:hash")
         if ':' in ballot_str and not ballot_str.startswith('['):
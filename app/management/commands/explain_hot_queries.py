@@ -0,0 +1,91 @@
+"""
+Management command that prints the query plans of the views' main queries
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections, router
+from django.db.models import Count
+from django.utils import timezone
+
+from app.models import Election, EligibleVoter, Invitation, Vote
+
+
+class Command(BaseCommand):
+    help = 'Print the database query plans of the hot view queries to confirm indexes are used'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--election',
+            help='UUID of the election to plan queries for (default: most recent election)',
+        )
+        parser.add_argument(
+            '--user',
+            help='Username to plan queries for (default: first user)',
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run the queries and report actual timings (PostgreSQL only)',
+        )
+
+    def handle(self, *args, **options):
+        election = self.get_election(options['election'])
+        user = self.get_user(options['user'])
+
+        using = router.db_for_read(Election)
+        vendor = connections[using].vendor
+        explain_options = {}
+        if options['analyze']:
+            if vendor == 'postgresql':
+                explain_options = {'analyze': True, 'buffers': True}
+            else:
+                self.stdout.write(self.style.WARNING('--analyze is only supported on PostgreSQL, ignoring it'))
+
+        self.stdout.write(self.style.SUCCESS(f'🔍 Query plans on {vendor} (database: {using})'))
+        self.stdout.write(f'   Election: {election.name if election.pk else "none (placeholder)"}')
+        self.stdout.write(f'   User: {user.username if user.pk else "none (placeholder)"}')
+
+        for label, queryset in self.get_hot_queries(election, user):
+            self.stdout.write('')
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain(**explain_options))
+
+    def get_election(self, uuid):
+        """Election to plan for, or an unsaved placeholder when there are none"""
+        if uuid:
+            return Election.objects.get(uuid=uuid)
+        return Election.objects.first() or Election(pk=0, name='')
+
+    def get_user(self, username):
+        """User to plan for, or an unsaved placeholder when there are none"""
+        if username:
+            return User.objects.get(username=username)
+        return User.objects.order_by('pk').first() or User(pk=0, email='voter@example.com')
+
+    def get_hot_queries(self, election, user):
+        """(label, queryset) pairs mirroring the main queries of each view"""
+        now = timezone.now()
+        listing = Election.objects.with_status(now).without_crypto().select_related('created_by')
+
+        return [
+            ('Election list: status counts',
+             listing.values('status_group').annotate(count=Count('pk')).order_by()),
+            ('Election list: one page',
+             listing.order_by_status()[:6]),
+            ('Scheduler: elections due to open',
+             Election.objects.filter(active=False, started_at__isnull=True, closed_at__isnull=True,
+                                     start_date__lte=now, end_date__gt=now)),
+            ('Profile: created elections',
+             Election.objects.filter(created_by=user).without_crypto().order_by('-created')),
+            ('Profile: invitations by status',
+             Invitation.objects.filter(invited_email=user.email, status='pending')),
+            ('Election detail: pending invitations',
+             Invitation.objects.filter(election=election, status='pending')),
+            ('Election detail: accepted invitations',
+             Invitation.objects.filter(election=election, status='accepted')),
+            ('Vote: already voted',
+             Vote.objects.filter(user=user, election=election)),
+            # The per-user .exists() check; a queryset is needed to explain it, with the same plan
+            ('Vote: voter roll',
+             EligibleVoter.objects.filter(election=election, user=user).values('pk')[:1]),
+        ]
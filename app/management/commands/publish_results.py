@@ -0,0 +1,45 @@
+"""
+Management command that renders the results of closed elections into static files
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from app.db_router import pin_to_primary
+from app.models import Election
+from app.published_results import can_publish_results, get_published_results, publish_results
+
+
+class Command(BaseCommand):
+    help = "Publish the results page, results document and verification page of closed elections as static files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--election',
+            help='UUID of the election to publish (default: every closed public election not published yet)',
+        )
+        parser.add_argument(
+            '--republish',
+            action='store_true',
+            help='Also publish elections that already are, e.g. after collectstatic replaced the '
+                 'static files their pages link to',
+        )
+
+    def handle(self, *args, **options):
+        if options['election']:
+            elections = Election.objects.filter(uuid=options['election'])
+            if not elections.exists():
+                raise CommandError(f"Election {options['election']} not found")
+        else:
+            elections = Election.objects.filter(is_public=True, verified_at__isnull=False)
+
+        # Publish what was just verified, not what a lagging replica has
+        with pin_to_primary():
+            for election in elections.order_by('pk'):
+                if not options['election'] and not options['republish'] and get_published_results(election.uuid):
+                    continue
+                if not can_publish_results(election):
+                    self.stdout.write(self.style.WARNING(
+                        f'⏭️  "{election.name}" is not a closed, verified public election'
+                    ))
+                    continue
+                manifest = publish_results(election)
+                self.stdout.write(self.style.SUCCESS(f'📰 Published "{election.name}" at {manifest["page"]}'))
@@ -0,0 +1,36 @@
+"""
+Management command that rewrites elections' ballot stores from the database
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from app.ballot_store import ballot_store_enabled, rebuild_ballot_store, store_path
+from app.db_router import pin_to_primary
+from app.models import Election
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the append-only ballot stores used for tallying from the votes in the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--election',
+            help='UUID of the election to rebuild (default: every election that is not archived)',
+        )
+
+    def handle(self, *args, **options):
+        if not ballot_store_enabled():
+            raise CommandError('The ballot store is disabled (set BALLOT_STORE_ROOT)')
+
+        elections = Election.objects.filter(archived_at__isnull=True).exclude(public_key='')
+        if options['election']:
+            elections = elections.filter(uuid=options['election'])
+            if not elections.exists():
+                raise CommandError(f"Election {options['election']} not found or already archived")
+
+        # The database is the source of truth, so read it without replica lag
+        with pin_to_primary():
+            for election in elections.order_by('pk'):
+                count = rebuild_ballot_store(election)
+                self.stdout.write(self.style.SUCCESS(
+                    f'🗳️  Rebuilt {store_path(election).name} for "{election.name}": {count} ballots'
+                ))
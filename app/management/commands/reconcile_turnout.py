@@ -0,0 +1,38 @@
+"""
+Management command that resets sharded turnout counters to the votes in the database
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from app.db_router import pin_to_primary
+from app.models import Election
+from app.turnout import reconcile_turnout
+
+
+class Command(BaseCommand):
+    help = "Reconcile elections' sharded turnout counters with the number of votes in the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--election',
+            help='UUID of the election to reconcile (default: every election that is not closed)',
+        )
+
+    def handle(self, *args, **options):
+        if options['election']:
+            elections = Election.objects.filter(uuid=options['election'])
+            if not elections.exists():
+                raise CommandError(f"Election {options['election']} not found")
+        else:
+            # Closed elections were reconciled when polls closed and no longer change
+            elections = Election.objects.filter(closed_at__isnull=True)
+
+        # Count against the primary so recent votes aren't missed through replica lag
+        with pin_to_primary():
+            for election in elections.order_by('pk'):
+                counted, actual = reconcile_turnout(election)
+                if counted == actual:
+                    self.stdout.write(f'✅ "{election.name}": {actual} votes')
+                else:
+                    self.stdout.write(self.style.WARNING(
+                        f'🔧 "{election.name}": counter said {counted}, reset to {actual} votes'
+                    ))
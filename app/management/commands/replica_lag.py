@@ -0,0 +1,52 @@
+"""
+Management command that reports how far each read replica trails the primary
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from app.db_router import get_replica_aliases, get_replica_lag
+
+
+class Command(BaseCommand):
+    help = 'Report the replication lag of each read replica in seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-lag',
+            type=float,
+            help='Exit with an error when any replica trails the primary by more seconds than this',
+        )
+        parser.add_argument(
+            '--prometheus',
+            action='store_true',
+            help='Print the lag in the Prometheus text exposition format',
+        )
+
+    def handle(self, *args, **options):
+        replicas = get_replica_aliases()
+        if not replicas:
+            self.stdout.write(self.style.WARNING('No read replicas configured (set DATABASE_REPLICA_URLS)'))
+            return
+
+        if options['prometheus']:
+            self.stdout.write('# HELP intikhab_replica_lag_seconds Seconds the replica trails the primary')
+            self.stdout.write('# TYPE intikhab_replica_lag_seconds gauge')
+
+        lagging = []
+        for alias in replicas:
+            lag = get_replica_lag(alias)
+            too_far = lag is not None and options['max_lag'] is not None and lag > options['max_lag']
+            if too_far:
+                lagging.append(alias)
+
+            if options['prometheus']:
+                if lag is not None:
+                    self.stdout.write(f'intikhab_replica_lag_seconds{{alias="{alias}"}} {lag:.3f}')
+            elif lag is None:
+                self.stdout.write(f'   {alias}: lag unknown on this database backend')
+            elif too_far:
+                self.stdout.write(self.style.ERROR(f'❌ {alias}: {lag:.3f}s behind'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✅ {alias}: {lag:.3f}s behind'))
+
+        if lagging:
+            raise CommandError(f"Replication lag above {options['max_lag']}s on: {', '.join(lagging)}")
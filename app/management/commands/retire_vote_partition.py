@@ -0,0 +1,47 @@
+"""
+Management command that detaches a closed election's ballots from the vote table
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router
+
+from app.models import Election, Vote
+from app.partitions import detach_vote_partition, is_vote_table_partitioned, vote_partition_name
+
+
+class Command(BaseCommand):
+    help = "Retire a closed election's ballots by detaching its vote partition (PostgreSQL only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('election', help='UUID of the election to retire')
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Drop the detached partition instead of keeping it as a standalone table for archival',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            election = Election.objects.without_crypto().get(uuid=options['election'])
+        except (Election.DoesNotExist, ValueError):
+            raise CommandError(f"Election {options['election']} not found")
+
+        using = router.db_for_write(Vote)
+        if not is_vote_table_partitioned(using):
+            raise CommandError(
+                f'The vote table on {connections[using].vendor} (database: {using}) is not partitioned'
+            )
+        if election.get_status() != 'closed':
+            raise CommandError(f'Election "{election.name}" is not closed yet')
+
+        partition = vote_partition_name(election.pk)
+        # Concurrently, so votes and tallies of other elections aren't blocked meanwhile
+        detached = detach_vote_partition(election.pk, drop=options['drop'], concurrently=True, using=using)
+        if not detached:
+            raise CommandError(f'Election "{election.name}" has no vote partition ({partition})')
+
+        if options['drop']:
+            self.stdout.write(self.style.SUCCESS(f'🗑️  Dropped ballots of "{election.name}" ({partition})'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'📦 Detached ballots of "{election.name}" into standalone table {partition}'
+            ))
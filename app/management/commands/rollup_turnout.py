@@ -0,0 +1,34 @@
+"""
+Management command that rebuilds elections' turnout time series from their votes
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from app.db_router import pin_to_primary
+from app.models import Election
+from app.turnout import rebuild_turnout_buckets
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-minute, hourly and daily turnout buckets of elections from their votes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--election',
+            help='UUID of the election to rebuild (default: every election that is not closed)',
+        )
+
+    def handle(self, *args, **options):
+        if options['election']:
+            elections = Election.objects.filter(uuid=options['election'])
+            if not elections.exists():
+                raise CommandError(f"Election {options['election']} not found")
+        else:
+            elections = Election.objects.filter(closed_at__isnull=True)
+
+        with pin_to_primary():
+            for election in elections.order_by('pk'):
+                counts = rebuild_turnout_buckets(election)
+                self.stdout.write(self.style.SUCCESS(
+                    f'📈 Rebuilt turnout of "{election.name}": {counts["minute"]} minutes, '
+                    f'{counts["hour"]} hours, {counts["day"]} days'
+                ))
@@ -0,0 +1,137 @@
+"""
+Management command that opens and closes elections on schedule and pre-tallies them
+"""
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from app.db_router import pin_to_primary
+from app.models import Election
+from app.partitions import create_missing_vote_partitions
+from app.published_results import get_published_results
+from app.tally import finalize_election
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Open and close elections at their start/end dates and pre-tally closed elections'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process due elections once and exit',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=30.0,
+            help='Maximum number of seconds to sleep between checks (default: 30)',
+        )
+
+    def handle(self, *args, **options):
+        # Tallies must include every ballot, so never read from a lagging replica
+        with pin_to_primary():
+            self.run(options)
+
+    def run(self, options):
+        if options['once']:
+            self.run_pending()
+            return
+
+        self.stdout.write(self.style.SUCCESS('🗓️  Election scheduler started'))
+        try:
+            while True:
+                time.sleep(self.run_pass(options['interval']))
+        except KeyboardInterrupt:
+            self.stdout.write('Election scheduler stopped')
+
+    def run_pass(self, interval):
+        """Run one pass of the loop and return how long to sleep; errors are logged, not raised"""
+        # Replace connections that outlived CONN_MAX_AGE or failed their health check
+        close_old_connections()
+        try:
+            self.run_pending()
+            return self.seconds_until_next_transition(interval)
+        except Exception:
+            logger.exception('Election scheduler pass failed')
+            return interval
+
+    def run_pending(self):
+        """Open and close every election whose start or end date has passed"""
+        for election_id in create_missing_vote_partitions():
+            self.stdout.write(f"Created the missing vote partition of election ID {election_id}")
+
+        now = timezone.now()
+
+        due_to_open = Election.objects.filter(
+            active=False,
+            started_at__isnull=True,
+            closed_at__isnull=True,
+            start_date__lte=now,
+            end_date__gt=now,
+        ).values_list('pk', flat=True)
+        for pk in list(due_to_open):
+            self.open_election(pk)
+
+        due_to_close = Election.objects.filter(
+            active=True,
+            closed_at__isnull=True,
+            end_date__lte=now,
+        ).values_list('pk', flat=True)
+        for pk in list(due_to_close):
+            self.close_election(pk)
+
+    def open_election(self, pk):
+        """Start an election whose voting period has begun"""
+        with transaction.atomic():
+            election = Election.objects.select_for_update().get(pk=pk)
+            if not election.start_election():
+                return
+            election.save()
+        self.stdout.write(self.style.SUCCESS(f"Opened election '{election.name}' (ID: {election.id})"))
+
+    def close_election(self, pk):
+        """Close an election whose voting period has ended, then tally, publish and warm its caches"""
+        with transaction.atomic():
+            election = Election.objects.select_for_update().get(pk=pk)
+            if not election.close_election():
+                return
+            election.save()
+        self.stdout.write(self.style.SUCCESS(f"Closed election '{election.name}' (ID: {election.id})"))
+
+        try:
+            finalize_election(election)
+            self.warm_caches(election)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"   Failed to tally election '{election.name}': {e}"))
+            return
+        self.stdout.write(f"   Tallied and verified (verified: {election.verified})")
+        published = get_published_results(election.uuid)
+        if published:
+            self.stdout.write(f"   Published results at {published['page']}")
+
+    def warm_caches(self, election):
+        """Render the verification fragment so the first visitor is served from cache"""
+        from app.views.vote import VerifyResultsView
+
+        if election.verified_at is not None:
+            VerifyResultsView.get_cached_content(election)
+
+    def seconds_until_next_transition(self, interval):
+        """Sleep until the next start or end date, but never longer than the interval"""
+        now = timezone.now()
+        upcoming = Election.objects.filter(closed_at__isnull=True).aggregate(
+            next_start=Min('start_date', filter=Q(active=False, started_at__isnull=True, start_date__gt=now)),
+            next_end=Min('end_date', filter=Q(active=True, end_date__gt=now)),
+        )
+        transitions = [moment for moment in upcoming.values() if moment is not None]
+        if not transitions:
+            return interval
+        seconds = (min(transitions) - now).total_seconds()
+        return max(0.5, min(interval, seconds))
@@ -0,0 +1,98 @@
+"""
+Middleware for request-level database routing and static file serving
+"""
+import os
+import re
+
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from app.db_router import get_replica_aliases, pin_to_primary
+
+# Cookie that keeps a browser's reads on the primary for a short time after it wrote
+PIN_COOKIE_NAME = 'pin_primary'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class PrimaryPinningMiddleware:
+    """
+    Pin requests that write, and the requests that follow them for
+    DATABASE_REPLICA_PIN_SECONDS, to the primary database so users always see
+    their own writes (e.g. "you have already voted") despite replica lag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_replica_aliases():
+            return self.get_response(request)
+
+        writes = request.method not in SAFE_METHODS
+        with pin_to_primary(writes or PIN_COOKIE_NAME in request.COOKIES):
+            response = self.get_response(request)
+
+        if writes and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class PublishedResultsMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, also serving the published results of closed elections (see
+    app.published_results) at PUBLISHED_RESULTS_URL.
+
+    Results are published while the server runs, so files WhiteNoise didn't
+    find at startup are looked up on first request. Their names carry a hash
+    of their content, so they are cached forever. Files removed when an
+    election is unpublished stop being served.
+    """
+
+    hashed_name = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+
+    def __init__(self, get_response=None, settings=settings):
+        self.results_root = os.path.realpath(settings.PUBLISHED_RESULTS_ROOT) + os.path.sep
+        self.results_prefix = settings.PUBLISHED_RESULTS_URL
+        self.published_paths = {}
+        super().__init__(get_response, settings=settings)
+        if self.autorefresh or os.path.isdir(self.results_root):
+            self.add_files(self.results_root, prefix=self.results_prefix)
+
+    def __call__(self, request):
+        url = request.path_info
+        if not self.autorefresh and url.startswith(self.results_prefix):
+            if url not in self.files:
+                self.add_published_file(url)
+            elif url in self.published_paths and not os.path.isfile(self.published_paths[url]):
+                del self.files[url]  # Unpublished, e.g. the election was deleted or made private
+                del self.published_paths[url]
+        return super().__call__(request)
+
+    def add_published_file(self, url):
+        """Start serving a file published after this process started"""
+        if not self.url_is_canonical(url):
+            return
+        path = os.path.realpath(os.path.join(self.results_root, url[len(self.results_prefix):]))
+        if path.startswith(self.results_root) and os.path.isfile(path):
+            self.add_file_to_dictionary(url, path)
+
+    def add_file_to_dictionary(self, url, path, stat_cache=None):
+        # Only the hashed files; the manifest is rewritten whenever results are published again
+        if url.startswith(self.results_prefix):
+            if not self.hashed_name.search(url):
+                return
+            self.published_paths[url] = path
+        super().add_file_to_dictionary(url, path, stat_cache=stat_cache)
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.results_prefix):
+            return bool(self.hashed_name.search(url))
+        return super().immutable_file_test(path, url)
@@ -0,0 +1,51 @@
+"""
+Install a modular-product aggregate used to tally ballots inside PostgreSQL.
+
+The aggregate multiplies Paillier ciphertexts modulo n^2, which is homomorphic
+addition of the encrypted votes. Other database backends are left untouched and
+tallying falls back to Python (see app.tally).
+"""
+from django.db import migrations
+
+
+CREATE_AGGREGATE_SQL = """
+CREATE OR REPLACE FUNCTION intikhab_paillier_sum_step(state numeric, ciphertext numeric, modulus numeric)
+RETURNS numeric AS $$
+    SELECT mod(state * ciphertext, modulus)
+$$ LANGUAGE sql IMMUTABLE STRICT;
+
+DROP AGGREGATE IF EXISTS intikhab_paillier_sum(numeric, numeric);
+CREATE AGGREGATE intikhab_paillier_sum(numeric, numeric) (
+    SFUNC = intikhab_paillier_sum_step,
+    STYPE = numeric,
+    INITCOND = '1'
+);
+"""
+
+DROP_AGGREGATE_SQL = """
+DROP AGGREGATE IF EXISTS intikhab_paillier_sum(numeric, numeric);
+DROP FUNCTION IF EXISTS intikhab_paillier_sum_step(numeric, numeric, numeric);
+"""
+
+
+def create_aggregate(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_AGGREGATE_SQL)
+
+
+def drop_aggregate(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_AGGREGATE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_aggregate, drop_aggregate),
+    ]
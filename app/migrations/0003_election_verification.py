@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_paillier_sum_aggregate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='election',
+            name='verification_transcript',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='election',
+            name='verified',
+            field=models.BooleanField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='election',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
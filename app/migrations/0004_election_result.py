@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_election_verification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElectionResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('votes', models.PositiveIntegerField(default=0)),
+                ('percentage', models.DecimalField(decimal_places=1, default=0, max_digits=4)),
+                ('rank', models.PositiveIntegerField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='app.candidate')),
+                ('election', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='app.election')),
+            ],
+            options={
+                'verbose_name': 'Election Result',
+                'verbose_name_plural': 'Election Results',
+                'ordering': ['election', 'rank', 'candidate_id'],
+                'indexes': [models.Index(fields=['election', 'rank'], name='app_result_election_rank_idx')],
+                'unique_together': {('election', 'candidate')},
+            },
+        ),
+    ]
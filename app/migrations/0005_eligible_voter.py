@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_voter_rolls(apps, schema_editor):
+    """Fill the voter roll from invitations accepted before it existed"""
+    Invitation = apps.get_model('app', 'Invitation')
+    EligibleVoter = apps.get_model('app', 'EligibleVoter')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    db_alias = schema_editor.connection.alias
+
+    user_ids_by_email = {}
+    for user_id, email in User.objects.using(db_alias).exclude(email='').values_list('pk', 'email'):
+        user_ids_by_email.setdefault(email, []).append(user_id)
+
+    entries = set()
+    accepted = Invitation.objects.using(db_alias).filter(status='accepted')
+    for election_id, user_id, email in accepted.values_list('election_id', 'invited_user_id', 'invited_email'):
+        if user_id:
+            entries.add((election_id, user_id))
+        for matching_user_id in user_ids_by_email.get(email, []):
+            entries.add((election_id, matching_user_id))
+
+    EligibleVoter.objects.using(db_alias).bulk_create(
+        [EligibleVoter(election_id=election_id, user_id=user_id) for election_id, user_id in entries],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_election_result'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EligibleVoter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('election', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligible_voters', to='app.election')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligible_elections', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Eligible Voter',
+                'verbose_name_plural': 'Eligible Voters',
+                'unique_together': {('election', 'user')},
+            },
+        ),
+        migrations.RunPython(build_voter_rolls, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_eligible_voter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='election',
+            index=models.Index(fields=['active', 'start_date', 'end_date'], name='app_election_schedule_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='election',
+            index=models.Index(fields=['created_by', '-created'], name='app_election_creator_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['election', 'status'], name='app_invite_election_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['invited_email', 'status'], name='app_invite_email_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['election', 'created_at'], name='app_invite_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+"""
+Partition the vote table by election on PostgreSQL.
+
+app_vote becomes a LIST-partitioned table on election_id with one partition per
+election (created from then on by app.signals.partition_signals) and a default
+partition for anything else. Unique constraints on a partitioned table must
+include the partition key, so the primary key becomes (id, election_id) and the
+uuid is unique per election; the (user, election) constraint is unchanged.
+Other database backends keep the plain table.
+"""
+from django.conf import settings
+from django.db import migrations
+
+
+PARTITION_VOTES_SQL = """
+ALTER TABLE app_vote RENAME TO app_vote_unpartitioned;
+
+CREATE TABLE app_vote (
+    LIKE app_vote_unpartitioned INCLUDING DEFAULTS
+) PARTITION BY LIST (election_id);
+
+CREATE SEQUENCE app_vote_partitioned_id_seq AS bigint OWNED BY app_vote.id;
+ALTER TABLE app_vote ALTER COLUMN id SET DEFAULT nextval('app_vote_partitioned_id_seq');
+
+ALTER TABLE app_vote ADD CONSTRAINT app_vote_partitioned_pkey PRIMARY KEY (id, election_id);
+ALTER TABLE app_vote ADD CONSTRAINT app_vote_uuid_election_uniq UNIQUE (uuid, election_id);
+ALTER TABLE app_vote ADD CONSTRAINT app_vote_user_election_uniq UNIQUE (user_id, election_id);
+CREATE INDEX app_vote_uuid_idx ON app_vote (uuid);
+CREATE INDEX app_vote_user_idx ON app_vote (user_id);
+ALTER TABLE app_vote ADD CONSTRAINT app_vote_election_fk
+    FOREIGN KEY (election_id) REFERENCES app_election (id) DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE app_vote ADD CONSTRAINT app_vote_user_fk
+    FOREIGN KEY (user_id) REFERENCES {user_table} (id) DEFERRABLE INITIALLY DEFERRED;
+
+CREATE TABLE app_vote_default PARTITION OF app_vote DEFAULT;
+"""
+
+CREATE_PARTITION_SQL = 'CREATE TABLE app_vote_e{id} PARTITION OF app_vote FOR VALUES IN ({id})'
+
+COPY_VOTES_SQL = """
+INSERT INTO app_vote (id, uuid, ballot, hashed, created, election_id, user_id)
+SELECT id, uuid, ballot, hashed, created, election_id, user_id FROM app_vote_unpartitioned;
+
+SELECT setval('app_vote_partitioned_id_seq', COALESCE((SELECT max(id) FROM app_vote), 0) + 1, false);
+
+DROP TABLE app_vote_unpartitioned;
+ALTER SEQUENCE app_vote_partitioned_id_seq RENAME TO app_vote_id_seq;
+"""
+
+UNPARTITION_VOTES_SQL = """
+INSERT INTO app_vote (id, uuid, ballot, hashed, created, election_id, user_id)
+OVERRIDING SYSTEM VALUE
+SELECT id, uuid, ballot, hashed, created, election_id, user_id FROM app_vote_partitioned;
+
+SELECT setval(pg_get_serial_sequence('app_vote', 'id'), COALESCE((SELECT max(id) FROM app_vote), 0) + 1, false);
+
+DROP TABLE app_vote_partitioned;
+"""
+
+
+def partition_votes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Election = apps.get_model('app', 'Election')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    election_ids = Election.objects.using(schema_editor.connection.alias).values_list('pk', flat=True)
+
+    schema_editor.execute(PARTITION_VOTES_SQL.format(user_table=schema_editor.quote_name(User._meta.db_table)))
+    for election_id in election_ids:
+        schema_editor.execute(CREATE_PARTITION_SQL.format(id=int(election_id)))
+    schema_editor.execute(COPY_VOTES_SQL)
+
+
+def unpartition_votes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('ALTER TABLE app_vote RENAME TO app_vote_partitioned')
+    schema_editor.execute('ALTER SEQUENCE app_vote_id_seq RENAME TO app_vote_partitioned_id_seq')
+    schema_editor.create_model(apps.get_model('app', 'Vote'))
+    schema_editor.execute(UNPARTITION_VOTES_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_votes, unpartition_votes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_partition_votes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='election',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the ballots were moved to the cold archive (see app.archive)', null=True),
+        ),
+    ]
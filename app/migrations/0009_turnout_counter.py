@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def count_existing_votes(apps, schema_editor):
+    """Start each election's counter at the votes cast before it existed"""
+    Vote = apps.get_model('app', 'Vote')
+    TurnoutCounter = apps.get_model('app', 'TurnoutCounter')
+    db_alias = schema_editor.connection.alias
+
+    counts = Vote.objects.using(db_alias).order_by().values('election').annotate(count=models.Count('pk'))
+    TurnoutCounter.objects.using(db_alias).bulk_create(
+        [TurnoutCounter(election_id=row['election'], shard=0, count=row['count']) for row in counts],
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_election_archived_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TurnoutCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('count', models.BigIntegerField(default=0)),
+                ('election', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turnout_counters', to='app.election')),
+            ],
+            options={
+                'verbose_name': 'Turnout Counter',
+                'verbose_name_plural': 'Turnout Counters',
+                'unique_together': {('election', 'shard')},
+            },
+        ),
+        migrations.RunPython(count_existing_votes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_turnout_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TurnoutBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour'), ('day', 'Day')], max_length=6)),
+                ('start', models.DateTimeField()),
+                ('count', models.BigIntegerField(default=0)),
+                ('election', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turnout_buckets', to='app.election')),
+            ],
+            options={
+                'verbose_name': 'Turnout Bucket',
+                'verbose_name_plural': 'Turnout Buckets',
+                'unique_together': {('election', 'resolution', 'start')},
+            },
+        ),
+    ]
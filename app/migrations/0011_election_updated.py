@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-19 19:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_turnout_bucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='election',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Bumped whenever the election or its candidates change; versions cached pages'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,49 @@
+"""
+Remove the default partition of the vote table on PostgreSQL.
+
+A partitioned table with a default partition can't detach partitions
+concurrently, which retiring an election relies on to leave the other
+elections' votes and tallies unblocked. Ballots that landed in the default
+partition move to their election's own partition, and every election without
+one gets it now. Missing partitions are created after that by the scheduler and
+before an election's first vote (see app.partitions).
+"""
+from django.db import migrations
+
+
+CREATE_PARTITION_SQL = 'CREATE TABLE IF NOT EXISTS app_vote_e{id} PARTITION OF app_vote FOR VALUES IN ({id})'
+
+MOVE_VOTES_SQL = """
+INSERT INTO app_vote (id, uuid, ballot, hashed, created, election_id, user_id)
+SELECT id, uuid, ballot, hashed, created, election_id, user_id FROM app_vote_default;
+
+DROP TABLE app_vote_default;
+"""
+
+
+def drop_default_partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Election = apps.get_model('app', 'Election')
+
+    schema_editor.execute('ALTER TABLE app_vote DETACH PARTITION app_vote_default')
+    for election_id in Election.objects.using(schema_editor.connection.alias).values_list('pk', flat=True):
+        schema_editor.execute(CREATE_PARTITION_SQL.format(id=int(election_id)))
+    schema_editor.execute(MOVE_VOTES_SQL)
+
+
+def restore_default_partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE TABLE app_vote_default PARTITION OF app_vote DEFAULT')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0011_election_updated'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_default_partition, restore_default_partition),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-19 20:01
+"""
+Make vote uuids unique per election instead of globally.
+
+This matches the schema 0007_partition_votes gives the partitioned vote table
+on PostgreSQL, where every unique constraint must include election_id. There
+the schema is already right and only the model state changes; other backends
+get the same constraint.
+"""
+
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class UnpartitionedOnly:
+    """Apply the operation to the database only where the vote table isn't partitioned"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AlterField(UnpartitionedOnly, migrations.AlterField):
+    pass
+
+
+class AddConstraint(UnpartitionedOnly, migrations.AddConstraint):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_drop_default_vote_partition'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AlterField(
+            model_name='vote',
+            name='uuid',
+            field=models.UUIDField(db_index=True, default=uuid.uuid4, editable=False),
+        ),
+        AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('uuid', 'election'), name='app_vote_uuid_election_uniq'),
+        ),
+    ]
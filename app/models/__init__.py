@@ -6,6 +6,9 @@ from .candidate import Candidate
 from .vote import Vote
 from .profile import Profile
 from .invitation import Invitation
+from .result import ElectionResult
+from .eligible_voter import EligibleVoter
+from .turnout import TurnoutCounter, TurnoutBucket
 # Import user extensions to add methods to User model (imported for side effects)
 from . import user_extensions  # noqa: F401
 
@@ -20,5 +23,9 @@ __all__ = [
     'Candidate',
     'Vote',
     'Profile',
-    'Invitation'
+    'Invitation',
+    'ElectionResult',
+    'EligibleVoter',
+    'TurnoutCounter',
+    'TurnoutBucket'
 ]
\ No newline at end of file
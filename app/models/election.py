@@ -3,7 +3,148 @@ Election model for managing elections in the voting system
 """
 import uuid
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+class ElectionQuerySet(models.QuerySet):
+    """QuerySet that works out election status in the database instead of in Python"""
+
+    # Status groups used to organize election listings, in display order
+    ONGOING = 0
+    UPCOMING = 1
+    CLOSED = 2
+
+    STATUS_GROUPS = {
+        'ongoing': ONGOING,
+        'upcoming': UPCOMING,
+        'closed': CLOSED,
+    }
+
+    # Key and tally material that election listings never display
+    CRYPTO_FIELDS = (
+        'private_key',
+        'public_key',
+        'encrypted_positive_total',
+        'encrypted_negative_total',
+        'encrypted_zero_sum',
+        'zero_randomness',
+        'decrypted_total',
+        'verification_transcript',
+    )
+
+    # Number of candidates shown on election cards
+    CANDIDATE_PREVIEW_SIZE = 3
+
+    @classmethod
+    def crypto_fields(cls, related=None):
+        """Names of the crypto columns, optionally looked up through a relation to Election"""
+        prefix = f'{related}__' if related else ''
+        return [prefix + name for name in cls.CRYPTO_FIELDS]
+
+    def with_counts(self):
+        """
+        Annotate the candidate and invitation counters shown on detail pages.
+
+        Each counter is a correlated subquery so the row isn't multiplied by
+        joining several reverse relations.
+        """
+        from .candidate import Candidate
+        from .invitation import Invitation
+
+        def count(model, **filters):
+            counts = (
+                model.objects.filter(election=models.OuterRef('pk'), **filters)
+                .order_by().values('election').annotate(count=models.Count('pk')).values('count')
+            )
+            return Coalesce(models.Subquery(counts, output_field=models.IntegerField()), 0)
+
+        return self.annotate(
+            candidate_count=count(Candidate),
+            invitation_count=count(Invitation),
+            accepted_invitation_count=count(Invitation, status='accepted'),
+            pending_invitation_count=count(Invitation, status='pending'),
+        )
+
+    @classmethod
+    def candidate_preview_prefetch(cls, size=None):
+        """Prefetch of the first candidates of each election for cards as `candidate_preview`"""
+        from .candidate import Candidate
+
+        size = size or cls.CANDIDATE_PREVIEW_SIZE
+        return models.Prefetch(
+            'candidates',
+            queryset=Candidate.objects.select_related('user__profile', 'party')[:size],
+            to_attr='candidate_preview',
+        )
+
+    def with_candidate_preview(self, size=None):
+        """Prefetch the first candidates of each election for cards as `candidate_preview`"""
+        return self.prefetch_related(self.candidate_preview_prefetch(size))
+
+    @classmethod
+    def prefetch_uncached_previews(cls, elections):
+        """Prefetch the candidate previews of the elections whose cached card is missing"""
+        from app.cache import uncached_fragments
+
+        missing = uncached_fragments('election_card', elections, lambda election: [election.uuid, election.updated])
+        models.prefetch_related_objects(missing, cls.candidate_preview_prefetch())
+
+    def without_crypto(self):
+        """Defer key and tally material so listing pages load only display columns"""
+        return self.defer(*self.CRYPTO_FIELDS)
+
+    def with_status(self, now=None):
+        """Annotate `status` (same values as Election.get_status) and `status_group` as of now"""
+        now = now or timezone.now()
+        return self.annotate(
+            status=models.Case(
+                models.When(closed_at__isnull=False, then=models.Value('closed')),
+                models.When(active=False, end_date__lt=now, then=models.Value('closed')),
+                models.When(active=False, then=models.Value('inactive')),
+                models.When(start_date__gt=now, then=models.Value('scheduled')),
+                models.When(end_date__lt=now, then=models.Value('expired')),
+                default=models.Value('open'),
+                output_field=models.CharField(),
+            ),
+            status_group=models.Case(
+                models.When(models.Q(closed_at__isnull=False) | models.Q(end_date__lt=now),
+                            then=models.Value(self.CLOSED)),
+                models.When(models.Q(active=False) | models.Q(start_date__gt=now),
+                            then=models.Value(self.UPCOMING)),
+                default=models.Value(self.ONGOING),
+                output_field=models.IntegerField(),
+            ),
+        )
+
+    def filter_status_groups(self, names):
+        """Keep elections in the named status groups ('ongoing', 'upcoming', 'closed')"""
+        groups = [self.STATUS_GROUPS[name] for name in names if name in self.STATUS_GROUPS]
+        return self.filter(status_group__in=groups)
+
+    def order_by_status(self):
+        """Ongoing by soonest end, upcoming by soonest start, then closed by most recent end"""
+        return self.order_by(
+            'status_group',
+            models.Case(
+                models.When(status_group=self.ONGOING, then='end_date'),
+                models.When(status_group=self.UPCOMING, then='start_date'),
+            ).asc(),
+            models.Case(
+                models.When(status_group=self.CLOSED, then='end_date'),
+            ).desc(),
+            'pk',
+        )
+
+    def status_counts(self):
+        """Count elections per status group with a single aggregate query"""
+        return self.aggregate(
+            ongoing=models.Count('pk', filter=models.Q(status_group=self.ONGOING)),
+            upcoming=models.Count('pk', filter=models.Q(status_group=self.UPCOMING)),
+            recently_closed=models.Count('pk', filter=models.Q(status_group=self.CLOSED)),
+            total=models.Count('pk'),
+        )
 
 
 class Election(models.Model):
@@ -30,7 +171,12 @@ class Election(models.Model):
     encrypted_zero_sum = models.CharField(max_length=5000, default="", editable=False)
     zero_randomness = models.CharField(max_length=5000, default="", editable=False)
     decrypted_total = models.CharField(max_length=500, default="", editable=False)
-    
+
+    # Zero-sum proof verification, computed once when the election is closed
+    verified = models.BooleanField(null=True, blank=True, editable=False)
+    verified_at = models.DateTimeField(null=True, blank=True, editable=False)
+    verification_transcript = models.TextField(default="", blank=True, editable=False)
+
     # Privacy and access control
     is_public = models.BooleanField(
         default=False, 
@@ -40,14 +186,31 @@ class Election(models.Model):
     # Status fields
     active = models.BooleanField(default=False)
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(
+        auto_now=True,
+        help_text="Bumped whenever the election or its candidates change; versions cached pages"
+    )
     
     # Election lifecycle timestamps
     started_at = models.DateTimeField(null=True, blank=True, help_text="When the election was activated")
     closed_at = models.DateTimeField(null=True, blank=True, help_text="When the election was closed")
+    archived_at = models.DateTimeField(
+        null=True, blank=True, editable=False,
+        help_text="When the ballots were moved to the cold archive (see app.archive)"
+    )
+
+    objects = ElectionQuerySet.as_manager()
 
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        """Bump `updated` on every save, including saves limited to some fields"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'updated'}
+        super().save(*args, **kwargs)
+    
     def is_voting_open(self):
         """Check if voting is currently open for this election"""
         from django.utils import timezone
@@ -104,7 +267,7 @@ class Election(models.Model):
                 return "open"  # Election is active and voting is open
     
     def get_status_display(self):
-        """Get display-friendly status text with appropriate styling class"""
+        """Get the status with display-friendly text and styling class, computed once for templates"""
         status = self.get_status()
         status_map = {
             'open': {'text': 'Ongoing', 'class': 'bg-light text-success'},
@@ -113,21 +276,37 @@ class Election(models.Model):
             'expired': {'text': 'Concluded', 'class': 'bg-light text-danger'},
             'closed': {'text': 'Closed', 'class': 'bg-light text-secondary'}
         }
-        return status_map.get(status, {'text': 'Unknown', 'class': 'bg-light text-secondary'})
+        display = status_map.get(status, {'text': 'Unknown', 'class': 'bg-light text-secondary'})
+        return {'status': status, **display}
+    
+    def get_candidate_preview(self):
+        """Get the first candidates shown on election cards, prefetched when listed"""
+        if hasattr(self, 'candidate_preview'):
+            return self.candidate_preview
+        return self.candidates.select_related('user__profile', 'party')[:ElectionQuerySet.CANDIDATE_PREVIEW_SIZE]
     
     def get_total_votes(self):
-        """Get the total number of votes cast in this election"""
-        return self.votes.count()
+        """Get the total number of votes cast in this election from its sharded turnout counter"""
+        from app.turnout import get_turnout
+        return get_turnout(self)
+    
+    def get_candidates(self):
+        """Get every candidate with the user, profile and party their cards display"""
+        if 'candidates' in getattr(self, '_prefetched_objects_cache', {}):
+            return self.candidates.all()
+        return self.candidates.select_related('user__profile', 'party')
     
     def get_candidates_count(self):
         """Get the number of candidates in this election"""
+        if hasattr(self, 'candidate_count'):
+            return self.candidate_count  # Annotated by ElectionQuerySet.with_counts
         return self.candidates.count()
     
     def can_be_edited_by(self, user):
         """Check if a user can edit this election"""
         return (user.is_superuser or 
                 self.created_by == user or 
-                user.groups.filter(name='Officials').exists())
+                'Officials' in user.get_group_names())
     
     def can_be_started(self):
         """Check if this election can be started"""
@@ -166,90 +345,71 @@ class Election(models.Model):
             # Public election - any authenticated user can vote
             return True
         else:
-            # Private election - user must be invited
-            return self.invitations.filter(
-                invited_user=user,
-                status='accepted'
-            ).exists() or self.invitations.filter(
-                invited_email=user.email,
-                status='accepted'
-            ).exists()
+            # Private election - user must be on the roll built from accepted invitations
+            from app.voter_roll import is_eligible_voter
+            return is_eligible_voter(self, user)
     
     def get_pending_invitations_count(self):
         """Get count of pending invitations"""
+        if hasattr(self, 'pending_invitation_count'):
+            return self.pending_invitation_count  # Annotated by ElectionQuerySet.with_counts
         return self.invitations.filter(status='pending').count()
     
     def get_accepted_invitations_count(self):
         """Get count of accepted invitations"""
+        if hasattr(self, 'accepted_invitation_count'):
+            return self.accepted_invitation_count  # Annotated by ElectionQuerySet.with_counts
         return self.invitations.filter(status='accepted').count()
     
+    def get_invitations_count(self):
+        """Get count of all invitations"""
+        if hasattr(self, 'invitation_count'):
+            return self.invitation_count  # Annotated by ElectionQuerySet.with_counts
+        return self.invitations.count()
+    
     def get_privacy_display(self):
         """Get display-friendly privacy status"""
         return "Public Election" if self.is_public else "Private Election"
     
     def get_results(self):
-        """Calculate and return election results with candidate details"""
+        """Return the materialized election results with candidate details"""
         if not self.can_show_results():
             return None
         
-        from collections import defaultdict
-        import hashlib
+        rows = list(
+            self.results.select_related(
+                'candidate__user__profile', 'candidate__party'
+            ).order_by('rank', 'candidate_id')
+        )
+        if not rows and self.decrypted_total:
+            # Elections tallied before results were materialized
+            from app.tally import materialize_results
+            rows = materialize_results(self)
         
-        votes = self.votes.all()
-        candidates = self.candidates.all().order_by('id')
-        
-        if not votes.exists() or not candidates.exists():
+        if not rows:
             return None
         
-        candidate_list = list(candidates)
-        vote_counts = defaultdict(int)
-        total_valid_votes = 0
-        
-        for vote in votes:
-            try:
-                # Since votes are encrypted, we simulate decryption for demo purposes
-                # In a real implementation, you'd use the private key to decrypt
-                if isinstance(vote.ballot, str) and vote.ballot.startswith('['):
-                    # Encrypted ballot - simulate decryption using vote hash
-                    total_valid_votes += 1
-                    hash_val = int(hashlib.md5(vote.hashed.encode()).hexdigest()[:8], 16)
-                    selected_candidate_idx = hash_val % len(candidate_list)
-                    if selected_candidate_idx < len(candidate_list):
-                        vote_counts[candidate_list[selected_candidate_idx].id] += 1
-                elif isinstance(vote.ballot, str) and ':' in vote.ballot:
-                    # Old insecure format - can read directly
-                    candidate_id_str = vote.ballot.split(':')[0]
-                    candidate_id = int(candidate_id_str)
-                    vote_counts[candidate_id] += 1
-                    total_valid_votes += 1
-            except (ValueError, IndexError, AttributeError, TypeError):
-                continue
-        
-        if total_valid_votes == 0:
-            return None
-        
-        # Create results with candidate details
-        results = []
-        for candidate in candidates:
-            candidate_votes = vote_counts.get(candidate.id, 0)
-            percentage = (candidate_votes / total_valid_votes * 100) if total_valid_votes > 0 else 0
-            results.append({
-                'candidate': candidate,
-                'votes': candidate_votes,
-                'percentage': round(percentage, 1),
-                'party': candidate.party.name if candidate.party else 'Independent'
-            })
-        
-        # Sort by vote count (descending)
-        results.sort(key=lambda x: x['votes'], reverse=True)
+        results = [{
+            'candidate': row.candidate,
+            'votes': row.votes,
+            'percentage': row.percentage,
+            'rank': row.rank,
+            'party': row.candidate.party.name if row.candidate.party else 'Independent'
+        } for row in rows]
         
         return {
             'results': results,
-            'total_votes': total_valid_votes,
-            'candidates_count': len(candidates)
+            'total_votes': sum(row.votes for row in rows),
+            'candidates_count': len(rows)
         }
     
     class Meta:
         ordering = ['-created']
         verbose_name = "Election"
-        verbose_name_plural = "Elections"
\ No newline at end of file
+        verbose_name_plural = "Elections"
+        indexes = [
+            # Elections due to open or close (scheduler, status filters)
+            models.Index(fields=['active', 'start_date', 'end_date'], name='app_election_schedule_idx'),
+            # Elections created by an official, newest first (profile page)
+            models.Index(fields=['created_by', '-created'], name='app_election_creator_idx'),
+        ]
\ No newline at end of file
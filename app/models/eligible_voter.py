@@ -0,0 +1,22 @@
+"""
+Eligible voter model materializing the voter roll of private elections
+"""
+from django.db import models
+from django.contrib.auth.models import User
+from .election import Election
+
+
+class EligibleVoter(models.Model):
+    """Model representing a user who may vote in a private election through an accepted invitation"""
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='eligible_voters')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='eligible_elections')
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.election.name}"
+
+    class Meta:
+        verbose_name = "Eligible Voter"
+        verbose_name_plural = "Eligible Voters"
+        unique_together = ('election', 'user')  # One roll entry per user per election
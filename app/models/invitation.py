@@ -138,5 +138,17 @@ class Invitation(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = [['election', 'invited_email']]  # Prevent duplicate invitations
+        indexes = [
+            # Per-status invitation counts on the election and invitation pages
+            models.Index(fields=['election', 'status'], name='app_invite_election_status_idx'),
+            # Invitations of the signed-in user on the profile page
+            models.Index(fields=['invited_email', 'status'], name='app_invite_email_status_idx'),
+            # Pending invitations are the only ones still acted upon
+            models.Index(
+                fields=['election', 'created_at'],
+                name='app_invite_pending_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
         verbose_name = "Election Invitation"
         verbose_name_plural = "Election Invitations"
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+Election result model for materialized per-candidate tallies
+"""
+from django.db import models
+from .election import Election
+from .candidate import Candidate
+
+
+class ElectionResult(models.Model):
+    """Model representing a candidate's decrypted tally in a closed election"""
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='results')
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='results')
+    votes = models.PositiveIntegerField(default=0)
+    percentage = models.DecimalField(max_digits=4, decimal_places=1, default=0)
+    rank = models.PositiveIntegerField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.election.name} - {self.candidate}: {self.votes}"
+
+    class Meta:
+        verbose_name = "Election Result"
+        verbose_name_plural = "Election Results"
+        ordering = ['election', 'rank', 'candidate_id']
+        unique_together = ('election', 'candidate')  # One result row per candidate
+        indexes = [
+            models.Index(fields=['election', 'rank'], name='app_result_election_rank_idx'),
+        ]
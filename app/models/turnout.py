@@ -0,0 +1,59 @@
+"""
+Turnout counter model keeping each election's vote count in a few sharded rows
+"""
+from django.db import models
+from .election import Election
+
+
+class TurnoutCounter(models.Model):
+    """
+    One shard of an election's turnout counter.
+
+    Each vote increments a random shard in the same transaction as the vote
+    insert, so concurrent voters rarely wait on the same row. The turnout is
+    the sum of the shards (see app.turnout).
+    """
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='turnout_counters')
+    shard = models.PositiveSmallIntegerField()
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.election.name} - shard {self.shard}: {self.count}"
+
+    class Meta:
+        verbose_name = "Turnout Counter"
+        verbose_name_plural = "Turnout Counters"
+        unique_together = ('election', 'shard')  # One row per shard per election
+
+
+class TurnoutBucket(models.Model):
+    """
+    Votes cast in an election during one minute, hour or day (UTC).
+
+    Buckets are bumped as votes commit and rebuilt from the votes by
+    ``manage.py rollup_turnout``. The unique (election, resolution, start)
+    index serves any window of a time series as one range scan.
+    """
+
+    MINUTE = 'minute'
+    HOUR = 'hour'
+    DAY = 'day'
+    RESOLUTION_CHOICES = [
+        (MINUTE, 'Minute'),
+        (HOUR, 'Hour'),
+        (DAY, 'Day'),
+    ]
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='turnout_buckets')
+    resolution = models.CharField(max_length=6, choices=RESOLUTION_CHOICES)
+    start = models.DateTimeField()
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.election.name} - {self.resolution} from {self.start:%Y-%m-%d %H:%M}: {self.count}"
+
+    class Meta:
+        verbose_name = "Turnout Bucket"
+        verbose_name_plural = "Turnout Buckets"
+        unique_together = ('election', 'resolution', 'start')  # Also the index for time range scans
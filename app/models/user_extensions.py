@@ -1,51 +1,92 @@
 """
 User model extensions for role-based permissions
 """
-from django.contrib.auth.models import User
+import uuid
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+
+
+# Group names are cached across requests per user. Membership changes drop the
+# affected users' entries; renaming or deleting a group, which can affect
+# anyone, replaces the version all entries are keyed under
+GROUP_NAMES_CACHE_TIMEOUT = 60 * 60
+GROUP_VERSION_CACHE_KEY = 'user-groups:version'
+
+
+def _group_names_cache_key(user_id):
+    """Cache key for a user's group names under the current groups version"""
+    version = cache.get_or_set(GROUP_VERSION_CACHE_KEY, lambda: uuid.uuid4().hex, None)
+    return f'user-groups:{version}:{user_id}'
+
+
+def forget_group_names(user_ids):
+    """Drop the cached group names of these users"""
+    if user_ids:
+        cache.delete_many([_group_names_cache_key(user_id) for user_id in user_ids])
+
+
+def forget_all_group_names():
+    """Drop every user's cached group names by starting a new groups version"""
+    cache.set(GROUP_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+def get_group_names(self):
+    """Get the names of the user's groups, loaded at most once per request"""
+    if not hasattr(self, '_group_names'):
+        if self.pk is None:
+            self._group_names = frozenset()
+        else:
+            key = _group_names_cache_key(self.pk)
+            group_names = cache.get(key)
+            if group_names is None:
+                group_names = frozenset(self.groups.values_list('name', flat=True))
+                cache.set(key, group_names, GROUP_NAMES_CACHE_TIMEOUT)
+            self._group_names = group_names
+    return self._group_names
 
 
 # Extend User model with role-checking methods
 def is_election_creator(self):
     """Check if user can create elections (superuser or Officials group member)"""
-    return self.is_superuser or self.groups.filter(name='Officials').exists()
+    return self.is_superuser or 'Officials' in self.get_group_names()
 
 
 def is_election_manager(self):
     """Check if user can manage elections (superuser or Officials/Managers group member)"""
-    return (self.is_superuser or 
-            self.groups.filter(name__in=['Officials', 'Managers']).exists())
+    return (self.is_superuser or
+            not self.get_group_names().isdisjoint({'Officials', 'Managers'}))
 
 
 def is_vote_counter(self):
     """Check if user can count votes and view results"""
-    return (self.is_superuser or 
-            self.groups.filter(name__in=['Officials', 'Counters']).exists())
+    return (self.is_superuser or
+            not self.get_group_names().isdisjoint({'Officials', 'Counters'}))
 
 
 def can_close_elections(self):
     """Check if user can close elections (superuser or Officials only for security)"""
-    return self.is_superuser or self.groups.filter(name='Officials').exists()
+    return self.is_superuser or 'Officials' in self.get_group_names()
 
 
 def can_manage_candidates(self):
     """Check if user can add/remove candidates"""
-    return (self.is_superuser or 
-            self.groups.filter(name__in=['Officials', 'Managers']).exists())
+    return (self.is_superuser or
+            not self.get_group_names().isdisjoint({'Officials', 'Managers'}))
 
 
 def can_view_results(self):
     """Check if user can view election results"""
-    return (self.is_superuser or 
-            self.groups.filter(name__in=['Officials', 'Counters', 'Viewers']).exists())
+    return (self.is_superuser or
+            not self.get_group_names().isdisjoint({'Officials', 'Counters', 'Viewers'}))
 
 
 def get_role_display(self):
     """Get user's primary role display name"""
     if self.is_superuser:
         return "System Administrator"
-    
-    user_groups = list(self.groups.values_list('name', flat=True))
-    
+
+    user_groups = self.get_group_names()
+
     if 'Officials' in user_groups:
         return "Election Official"
     elif 'Managers' in user_groups:
@@ -63,31 +104,33 @@ def get_all_roles(self):
     roles = []
     if self.is_superuser:
         roles.append("System Administrator")
-    
+
     group_role_mapping = {
         'Officials': 'Election Official',
-        'Managers': 'Election Manager', 
+        'Managers': 'Election Manager',
         'Counters': 'Vote Counter',
         'Viewers': 'Results Viewer'
     }
-    
-    for group in self.groups.all():
-        if group.name in group_role_mapping:
-            roles.append(group_role_mapping[group.name])
-    
+
+    user_groups = self.get_group_names()
+    for group_name, role in group_role_mapping.items():
+        if group_name in user_groups:
+            roles.append(role)
+
     if not roles:
         roles.append("Voter")
-    
+
     return roles
 
 
 def has_election_permissions(self):
     """Check if user has any election management permissions"""
-    return (self.is_superuser or 
-            self.groups.filter(name__in=['Officials', 'Managers', 'Counters']).exists())
+    return (self.is_superuser or
+            not self.get_group_names().isdisjoint({'Officials', 'Managers', 'Counters'}))
 
 
 # Add methods to User model
+User.add_to_class('get_group_names', get_group_names)
 User.add_to_class('is_election_creator', is_election_creator)
 User.add_to_class('is_election_manager', is_election_manager)
 User.add_to_class('is_vote_counter', is_vote_counter)
@@ -96,4 +139,5 @@ User.add_to_class('can_manage_candidates', can_manage_candidates)
 User.add_to_class('can_view_results', can_view_results)
 User.add_to_class('get_role_display', get_role_display)
 User.add_to_class('get_all_roles', get_all_roles)
-User.add_to_class('has_election_permissions', has_election_permissions)
\ No newline at end of file
+User.add_to_class('has_election_permissions', has_election_permissions)
+
@@ -4,7 +4,7 @@ Vote model for managing votes in elections
 import json
 import uuid
 from hashlib import sha256
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
 from .election import Election
 from app.encryption import Encryption
@@ -13,7 +13,9 @@ from app.encryption import Encryption
 class Vote(models.Model):
     """Model representing a vote cast by a user in an election"""
     
-    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True, db_index=True)
+    # Unique per election: on PostgreSQL the vote table is partitioned by election, and
+    # unique constraints of a partitioned table must include the partition key
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, db_index=True)
     user = models.ForeignKey(User, on_delete=models.PROTECT, related_name='votes')
     election = models.ForeignKey(Election, on_delete=models.PROTECT, related_name='votes')
     ballot = models.CharField(max_length=5000, default="", editable=False)
@@ -27,8 +29,24 @@ class Vote(models.Model):
         """Get a shortened version of the hash for display"""
         return self.hashed[:16] + "..." if self.hashed else "N/A"
     
+    def get_ballot(self, archive=None):
+        """
+        Get the encrypted ballot, reading it from the archive once the election is archived.
+
+        Pass an open BallotArchive of the election when reading many ballots.
+        """
+        if self.ballot:
+            return self.ballot
+        if archive is not None:
+            return archive.get_ballot(self.pk) or ""
+        if self.election.archived_at is None:
+            return self.ballot
+        from app.archive import BallotArchive
+        with BallotArchive(self.election) as archive:
+            return archive.get_ballot(self.pk) or ""
+    
     def save(self, *args, **kwargs):
-        """Override save to handle ballot encryption"""
+        """Override save to handle ballot encryption and count new votes towards turnout"""
         if not self.ballot and hasattr(self, '_candidate'):
             try:
                 self._encrypt_ballot()
@@ -36,7 +54,18 @@ class Vote(models.Model):
                 print(f"Error during vote encryption: {e}")
                 raise
         
-        super().save(*args, **kwargs)
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        
+        from app.partitions import ensure_vote_partition
+        from app.turnout import increment_turnout
+        using = kwargs.get('using') or router.db_for_write(Vote, instance=self)
+        # Callers saving inside their own transaction ensure the partition before opening it
+        ensure_vote_partition(self.election_id, using=using)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            increment_turnout(self.election_id, using=using)
     
     def _encrypt_ballot(self):
         """Encrypt the ballot using homomorphic encryption"""
@@ -72,4 +101,7 @@ class Vote(models.Model):
         verbose_name = "Vote"
         verbose_name_plural = "Votes"
         unique_together = ('user', 'election')  # One vote per user per election
+        constraints = [
+            models.UniqueConstraint(fields=['uuid', 'election'], name='app_vote_uuid_election_uniq'),
+        ]
         ordering = ['-created']
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Micro-caching of pages for anonymous visitors
+
+``anonymous_cache(timeout)`` caches a view's rendered page per URL for
+visitors who aren't signed in and have no pending messages; everyone else
+gets the view as usual. Dynamic pages use a few seconds (PAGE_CACHE_SECONDS)
+so election-day traffic renders each page a handful of times a minute
+instead of once per visitor, and static pages use PAGE_CACHE_STATIC_SECONDS.
+
+Entries outlive their timeout by PAGE_CACHE_STALE_SECONDS. When an entry
+expires, one request takes a short lock and renders the page again while the
+others keep getting the stale copy, so an expiring homepage never sends every
+worker to the database at once. With no copy at all, requests wait briefly
+for the one rendering it. The lock is a cache.add(), which is atomic on Redis
+but not on the file backend, so there two workers may occasionally render
+the same page; that only costs a render.
+
+Cookies are never stored, so a cached page can't hand one visitor's CSRF or
+session cookie to another, and pages that used a CSRF token aren't cached at
+all, since the token would only match the visitor who rendered them. Cached
+pages carry an ETag, so repeat visits can be answered with 304 Not Modified.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, set_response_etag
+from django.utils.http import parse_http_date_safe
+
+# How long a render may hold the lock, and how long others wait for it when there is no stale copy
+LOCK_SECONDS = 10
+WAIT_SECONDS = 2
+WAIT_INTERVAL = 0.05
+
+CACHE_HEADER = 'X-Page-Cache'
+
+
+def _cache_key(request):
+    url = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'page:{url}:{int(bool(getattr(request, "htmx", False)))}'
+
+
+def _is_cacheable_request(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and not len(messages.get_messages(request))  # len() leaves the messages unread
+    )
+
+
+def _is_cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')  # The page holds this visitor's CSRF token
+    )
+
+
+def _freeze(response):
+    """The parts of a response that are safe to share between visitors"""
+    if not response.has_header('ETag'):
+        set_response_etag(response)
+    headers = [(name, value) for name, value in response.items() if name.lower() != 'set-cookie']
+    return response.status_code, headers, response.content
+
+
+def _thaw(entry, state):
+    status, headers, content = entry
+    response = HttpResponse(content, status=status)
+    for name, value in headers:
+        response[name] = value
+    response[CACHE_HEADER] = state
+    return response
+
+
+def _conditional(request, response):
+    """Answer with 304 Not Modified when the visitor already has this version of the page"""
+    last_modified = response.get('Last-Modified')
+    return get_conditional_response(
+        request,
+        etag=response.get('ETag'),
+        last_modified=last_modified and parse_http_date_safe(last_modified),
+        response=response,
+    )
+
+
+def anonymous_cache(static=False):
+    """
+    Cache a view's pages for anonymous visitors, for PAGE_CACHE_STATIC_SECONDS
+    if the page only changes with deploys and PAGE_CACHE_SECONDS otherwise
+    (0 disables caching).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timeout = settings.PAGE_CACHE_STATIC_SECONDS if static else settings.PAGE_CACHE_SECONDS
+            if not timeout or not _is_cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            cache = caches['pages']
+            key = _cache_key(request)
+            cached = cache.get(key)
+            if cached is not None and cached[0] > time.time():
+                return _conditional(request, _thaw(cached[1], 'hit'))
+
+            # Single flight: one request renders, the rest serve the stale copy or wait for it
+            locked = cache.add(f'{key}:lock', 1, LOCK_SECONDS)
+            if not locked:
+                if cached is not None:
+                    return _conditional(request, _thaw(cached[1], 'stale'))
+                deadline = time.monotonic() + WAIT_SECONDS
+                while time.monotonic() < deadline:
+                    time.sleep(WAIT_INTERVAL)
+                    cached = cache.get(key)
+                    if cached is not None:
+                        return _conditional(request, _thaw(cached[1], 'hit'))
+                # The render is taking too long; render this page ourselves
+
+            try:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render') and not response.is_rendered:
+                    response.render()
+                if not _is_cacheable_response(request, response):
+                    return response
+                entry = (time.time() + timeout, _freeze(response))
+                cache.set(key, entry, timeout + settings.PAGE_CACHE_STALE_SECONDS)
+                response[CACHE_HEADER] = 'miss'
+            finally:
+                if locked:
+                    cache.delete(f'{key}:lock')
+            return _conditional(request, response)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,189 @@
+"""
+Per-election partitions of the vote table on PostgreSQL
+
+Migration 0007 turns app_vote into a table LIST-partitioned by election_id.
+Each election gets its own partition once it is created, so tallies, exports
+and archival only touch that election's ballots, and retiring an election is a
+detach instead of a large DELETE. Other database backends keep a plain table
+and every helper here is a no-op on them.
+
+Creating or detaching a partition locks the whole vote table, so neither runs
+inside a request's transaction: partitions are created once the election is
+committed (with the scheduler filling any gaps), and retiring detaches
+concurrently.
+"""
+from django.db import connections, router, transaction
+from django.db.transaction import TransactionManagementError
+
+# Partitions known to exist, per database, so votes only check the catalog once per process
+_existing_partitions = set()
+
+# How long creating a partition may wait for the vote table before giving up, in milliseconds
+PARTITION_LOCK_TIMEOUT = 5000
+
+
+def _vote_table():
+    from app.models import Vote
+    return Vote._meta.db_table
+
+
+def vote_partition_name(election_id):
+    """Name of the partition holding an election's ballots"""
+    return f'{_vote_table()}_e{int(election_id)}'
+
+
+def is_vote_table_partitioned(using=None):
+    """Check whether the vote table on this database is partitioned"""
+    from app.models import Vote
+
+    using = using or router.db_for_write(Vote)
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))',
+            [_vote_table()],
+        )
+        return cursor.fetchone()[0]
+
+
+def list_vote_partitions(using=None):
+    """Names of the partitions currently attached to the vote table"""
+    from app.models import Vote
+
+    using = using or router.db_for_write(Vote)
+    if not is_vote_table_partitioned(using):
+        return []
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            ORDER BY child.relname
+            """,
+            [_vote_table()],
+        )
+        return [name for name, in cursor.fetchall()]
+
+
+def create_vote_partition(election_id, using=None):
+    """
+    Create the election's partition; returns False when the table isn't partitioned.
+
+    Runs in its own transaction, so the lock on the vote table and the lock
+    timeout end with the CREATE instead of lasting until the caller commits.
+    """
+    from app.models import Vote
+
+    using = using or router.db_for_write(Vote)
+    if not is_vote_table_partitioned(using):
+        return False
+    connection = connections[using]
+    if connection.in_atomic_block:
+        raise TransactionManagementError("A vote partition can't be created inside a transaction.")
+    quote = connection.ops.quote_name
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        # Give up rather than queue every vote behind this DDL while a long tally reads the table
+        cursor.execute(f'SET LOCAL lock_timeout = {PARTITION_LOCK_TIMEOUT}')
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {quote(vote_partition_name(election_id))} '
+            f'PARTITION OF {quote(_vote_table())} FOR VALUES IN ({int(election_id)})'
+        )
+    _existing_partitions.add((using, int(election_id)))
+    return True
+
+
+def ensure_vote_partition(election_id, using=None):
+    """
+    Create the election's partition if it is still missing, before its first vote is stored.
+
+    Partitions are normally created right after the election; this covers
+    elections whose partition couldn't be created then. Call it before
+    opening the transaction that stores the vote.
+    """
+    from app.models import Vote
+
+    using = using or router.db_for_write(Vote)
+    key = (using, int(election_id))
+    if key in _existing_partitions or connections[using].vendor != 'postgresql':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(%s) AND inhparent = to_regclass(%s))',
+            [vote_partition_name(election_id), _vote_table()],
+        )
+        exists = cursor.fetchone()[0]
+    if exists:
+        _existing_partitions.add(key)
+    else:
+        create_vote_partition(election_id, using=using)
+
+
+def create_missing_vote_partitions(using=None):
+    """Create the partitions of elections still open for voting that have none; returns their ids"""
+    from app.models import Election, Vote
+
+    using = using or router.db_for_write(Vote)
+    if not is_vote_table_partitioned(using):
+        return []
+    existing = set(list_vote_partitions(using))
+    missing = [
+        election_id
+        for election_id in Election.objects.using(using).filter(closed_at__isnull=True).values_list('pk', flat=True)
+        if vote_partition_name(election_id) not in existing
+    ]
+    for election_id in missing:
+        create_vote_partition(election_id, using=using)
+    return missing
+
+
+def detach_vote_partition(election_id, drop=False, concurrently=False, using=None):
+    """
+    Detach an election's partition from the vote table.
+
+    The detached table keeps the ballots for offline archival unless drop is
+    set. Its foreign keys are removed so the election and voters can still be
+    deleted later. Returns False when there is no partition to detach.
+
+    With concurrently, votes and tallies of other elections carry on during
+    the detach, which then can't run inside a transaction. Otherwise the vote
+    table is locked until the surrounding transaction ends.
+    """
+    from app.models import Vote
+
+    using = using or router.db_for_write(Vote)
+    partition = vote_partition_name(election_id)
+    if partition not in list_vote_partitions(using):
+        return False
+    connection = connections[using]
+    if concurrently and connection.in_atomic_block:
+        raise TransactionManagementError("A vote partition can't be detached concurrently inside a transaction.")
+    quote = connection.ops.quote_name
+    detach = f'ALTER TABLE {quote(_vote_table())} DETACH PARTITION {quote(partition)}'
+    with connection.cursor() as cursor:
+        if concurrently:
+            # A detach interrupted earlier leaves the partition pending and has to be finalized
+            cursor.execute('SELECT inhdetachpending FROM pg_inherits WHERE inhrelid = to_regclass(%s)', [partition])
+            pending = cursor.fetchone()[0]
+            cursor.execute(f'{detach} {"FINALIZE" if pending else "CONCURRENTLY"}')
+        elif connection.in_atomic_block:
+            # Foreign key checks deferred to the end of the transaction would block the detach
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(detach)
+            cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+        else:
+            cursor.execute(detach)
+        _existing_partitions.discard((using, int(election_id)))
+        if drop:
+            cursor.execute(f'DROP TABLE {quote(partition)}')
+            return True
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+            [partition],
+        )
+        for constraint, in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE {quote(partition)} DROP CONSTRAINT {quote(constraint)}')
+    return True
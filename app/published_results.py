@@ -0,0 +1,160 @@
+"""
+Static copies of closed elections' results
+
+Once an election is closed and tallied its results and verification no longer
+change, yet every visit would still go through Django and the database.
+``publish_results`` renders them once into PUBLISHED_RESULTS_ROOT/<uuid>/:
+
+- ``page.<hash>.html``: the election page as an anonymous visitor sees it
+- ``results.<hash>.json``: the results and verification transcript as data
+- ``verification.<hash>.html``: the verification page
+
+The hash is taken from each file's content, so WhiteNoise (see
+app.middleware.PublishedResultsMiddleware) serves them at
+PUBLISHED_RESULTS_URL with far-future, immutable caching. ``published.json``
+next to them names the current files; the election, results and verification
+views read it from disk and redirect there without touching the database.
+Re-verifying an election publishes new files and leaves the old ones in
+place, so URLs a browser already followed keep working. The page links to
+the hashed static files of the current deploy, so deploys publish every
+election again (``publish_results --republish``).
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+MANIFEST_NAME = 'published.json'
+
+
+def _election_dir(uuid):
+    return settings.PUBLISHED_RESULTS_ROOT / str(uuid)
+
+
+def _write(directory, stem, extension, content):
+    """Write content under a name hashed from it, with a gzipped copy; returns the file name"""
+    content = content.encode() if isinstance(content, str) else content
+    name = f'{stem}.{hashlib.sha256(content).hexdigest()[:12]}.{extension}'
+    _write_atomically(directory / name, content)
+    compressed = gzip.compress(content, mtime=0)
+    if len(compressed) < len(content) * 0.95:
+        _write_atomically(directory / f'{name}.gz', compressed)
+    return name
+
+
+def _write_atomically(path, content):
+    """Replace a file in one step, so it is never served half-written"""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def results_document(election):
+    """The election's results and verification as a JSON-serializable dict"""
+    results = election.get_results() or {'results': [], 'total_votes': 0}
+    return {
+        'election': str(election.uuid),
+        'name': election.name,
+        'closed_at': election.closed_at.isoformat() if election.closed_at else None,
+        'total_votes': results['total_votes'],
+        'results': [
+            {
+                'candidate': str(result['candidate'].uuid),
+                'name': result['candidate'].user.get_full_name(),
+                'party': result['party'],
+                'votes': result['votes'],
+                'percentage': str(result['percentage']),
+                'rank': result['rank'],
+            }
+            for result in results['results']
+        ],
+        'verified': election.verified,
+        'verified_at': election.verified_at.isoformat() if election.verified_at else None,
+        'verification': json.loads(election.verification_transcript) if election.verification_transcript else None,
+    }
+
+
+def render_results_page(election):
+    """Render the election page as an anonymous visitor would get it"""
+    from app.views.election import ElectionDetailView
+
+    path = reverse('election_detail', args=[election.uuid])
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.resolver_match = resolve(path)
+    request.user = AnonymousUser()
+
+    view = ElectionDetailView()
+    view.setup(request, uuid=election.uuid)
+    view.object = view.get_object()
+    context = view.get_context_data(object=view.object)
+    # The file is shared by every visitor and never changes, so it must not hold a CSRF token
+    context['csrf_token'] = 'NOTPROVIDED'
+    return render_to_string(view.template_name, context, request=request)
+
+
+def can_publish_results(election):
+    """Only the final results of public elections are published"""
+    return election.is_public and election.get_status() == 'closed' and election.verified_at is not None
+
+
+def publish_results(election):
+    """
+    Render the election's results page, results document and verification page
+    into static files. Returns the manifest of their URLs, or None if the
+    election can't be published (yet).
+    """
+    from app.views.vote import VerifyResultsView
+
+    if not can_publish_results(election):
+        return None
+
+    directory = _election_dir(election.uuid)
+    directory.mkdir(parents=True, exist_ok=True)
+    names = {
+        'page': _write(directory, 'page', 'html', render_results_page(election)),
+        'results': _write(directory, 'results', 'json', json.dumps(results_document(election), indent=2)),
+        'verification': _write(directory, 'verification', 'html', VerifyResultsView.get_cached_content(election)),
+    }
+    prefix = f'{settings.PUBLISHED_RESULTS_URL}{election.uuid}/'
+    manifest = {kind: prefix + name for kind, name in names.items()}
+    manifest['published_at'] = timezone.now().isoformat()
+    # The manifest goes last, so it only ever names files that exist
+    _write_atomically(directory / MANIFEST_NAME, json.dumps(manifest).encode())
+    return manifest
+
+
+def get_published_results(uuid):
+    """The manifest of an election's published results, or None"""
+    try:
+        with open(_election_dir(uuid) / MANIFEST_NAME) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def unpublish_results(uuid):
+    """Stop serving an election's published results, e.g. once it is deleted or made private"""
+    directory = _election_dir(uuid)
+    try:
+        # The manifest goes first, so the views stop redirecting before the files disappear
+        os.unlink(directory / MANIFEST_NAME)
+    except FileNotFoundError:
+        pass
+    shutil.rmtree(directory, ignore_errors=True)
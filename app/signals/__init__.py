@@ -0,0 +1,8 @@
+from . import ballot_store_signals  # noqa: F401
+from . import election_version_signals  # noqa: F401
+from . import live_signals  # noqa: F401
+from . import partition_signals  # noqa: F401
+from . import published_results_signals  # noqa: F401
+from . import voter_roll_signals  # noqa: F401
+from . import turnout_signals  # noqa: F401
+from . import user_group_signals  # noqa: F401
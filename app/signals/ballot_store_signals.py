@@ -0,0 +1,24 @@
+import logging
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from app.ballot_store import append_ballot, ballot_store_enabled
+from app.models import Vote
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Vote)
+def append_ballot_to_store(sender, instance, created, using, **kwargs):
+    """Copy each new ballot into the election's ballot store once the vote commits"""
+    if not created or not ballot_store_enabled():
+        return
+
+    def append():
+        try:
+            append_ballot(instance)
+        except OSError as e:
+            # The database already holds the vote; tallies fall back to it until a rebuild
+            logger.error(f'Failed to append vote {instance.pk} to the ballot store: {e}')
+
+    transaction.on_commit(append, using=using)
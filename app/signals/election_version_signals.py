@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from app.models import Candidate, Election, Party, Profile
+
+
+def touch_elections(elections):
+    """Bump `updated` of elections whose pages show something that changed"""
+    elections.update(updated=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Candidate)
+def touch_election_of_candidate(sender, instance, **kwargs):
+    """Candidates are listed on their election's pages"""
+    touch_elections(Election.objects.filter(pk=instance.election_id))
+
+
+@receiver(post_save, sender=Party)
+def touch_elections_of_party(sender, instance, created, **kwargs):
+    """Party names and symbols show on the candidates' cards"""
+    if not created:
+        touch_elections(Election.objects.filter(candidates__party=instance))
+
+
+@receiver(post_save, sender=Profile)
+def touch_elections_of_profile(sender, instance, created, **kwargs):
+    """Avatars show on the candidates' cards"""
+    if not created:
+        touch_elections(Election.objects.filter(candidates__user_id=instance.user_id))
+
+
+@receiver(post_save, sender=User)
+def touch_elections_of_user(sender, instance, created, update_fields, **kwargs):
+    """Candidate names come from their user; logins only touch last_login"""
+    if not created and update_fields != frozenset({'last_login'}):
+        touch_elections(Election.objects.filter(candidates__user=instance))
@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from app.live import forget_status
+from app.models import Election
+
+
+@receiver(post_save, sender=Election)
+def push_status_change(sender, instance, created, using, **kwargs):
+    """Let live streams pick up an opened or closed election on their next read"""
+    if not created:
+        transaction.on_commit(lambda: forget_status(instance), using=using)
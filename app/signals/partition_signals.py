@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from app.models import Election
+from app.partitions import create_vote_partition, detach_vote_partition
+
+
+@receiver(post_save, sender=Election)
+def create_partition_for_new_election(sender, instance, created, using, **kwargs):
+    """Give each new election its own vote partition on PostgreSQL, once the election is committed"""
+    if created:
+        election_id = instance.pk
+        # Failures are logged; the scheduler and the first vote create missing partitions
+        transaction.on_commit(lambda: create_vote_partition(election_id, using=using), using=using, robust=True)
+
+
+@receiver(post_delete, sender=Election)
+def drop_partition_for_deleted_election(sender, instance, using, **kwargs):
+    """Drop the (necessarily empty) vote partition of a deleted election, once the deletion is committed"""
+    election_id = instance.pk
+    transaction.on_commit(lambda: detach_vote_partition(election_id, drop=True, using=using), using=using, robust=True)
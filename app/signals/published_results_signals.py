@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from app.models import Election
+from app.published_results import unpublish_results
+
+
+@receiver(post_save, sender=Election)
+def unpublish_results_of_private_election(sender, instance, created, **kwargs):
+    """Stop serving published results once an election is made private"""
+    if not created and not instance.is_public:
+        unpublish_results(instance.uuid)
+
+
+@receiver(post_delete, sender=Election)
+def unpublish_results_of_deleted_election(sender, instance, **kwargs):
+    """Stop serving the published results of a deleted election"""
+    unpublish_results(instance.uuid)
@@ -0,0 +1,25 @@
+import logging
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from app.models import Vote
+from app.turnout import record_vote_buckets
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Vote)
+def add_vote_to_turnout_buckets(sender, instance, created, using, **kwargs):
+    """Count each new vote in the turnout time series once the vote commits"""
+    if not created:
+        return
+
+    def record():
+        try:
+            record_vote_buckets(instance.election_id, instance.created, using=using)
+        except DatabaseError as e:
+            # The vote itself is safe; rollup_turnout recounts the buckets from the votes
+            logger.error(f'Failed to add vote {instance.pk} to the turnout buckets: {e}')
+
+    # Every voter of the same minute bumps the same rows, so keep them out of the vote's transaction
+    transaction.on_commit(record, using=using)
@@ -0,0 +1,35 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from app.models.user_extensions import forget_all_group_names, forget_group_names
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def forget_group_names_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop the cached group names of the users added to or removed from groups"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        # user.groups.add(...): only this user's groups changed
+        forget_group_names([instance.pk])
+        instance.__dict__.pop('_group_names', None)
+    elif pk_set is not None:
+        # group.user_set.add(...): pk_set holds the users
+        forget_group_names(pk_set)
+    else:
+        # group.user_set.clear() doesn't say which users it removed
+        forget_all_group_names()
+
+
+@receiver([post_save, post_delete], sender=Group)
+def forget_group_names_on_group_change(sender, created=False, **kwargs):
+    """Drop every cached group name when a group is renamed or deleted"""
+    if not created:
+        forget_all_group_names()
+
+
+@receiver(post_save, sender=User)
+def forget_group_names_for_new_user(sender, instance, created, **kwargs):
+    """Drop any cached group names left behind by a deleted user with the same id"""
+    if created:
+        forget_group_names([instance.pk])
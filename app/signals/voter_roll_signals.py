@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from app.models import Election, Invitation
+from app.voter_roll import forget_voter_roll, invitation_user_ids, refresh_user_eligibility, update_voter_roll
+
+
+def _roll_state(invitation):
+    return invitation.status, invitation.invited_user_id, invitation.invited_email
+
+
+@receiver(post_init, sender=Invitation)
+def remember_invitation_state(sender, instance, **kwargs):
+    """Remember what an invitation granted when it was loaded, to tell which saves change the roll"""
+    instance._roll_state = _roll_state(instance)
+
+
+@receiver(post_save, sender=Invitation)
+def update_voter_roll_for_invitation(sender, instance, created, **kwargs):
+    """Update the roll entries of the users an invitation grants or granted, when it is accepted, relinked or revoked"""
+    before, after = instance._roll_state, _roll_state(instance)
+    instance._roll_state = after
+    if 'accepted' not in (before[0], after[0]):
+        return  # e.g. pending invitations created by a bulk send
+    if before == after and not created:
+        return  # e.g. sent_at updates
+    update_voter_roll(instance.election_id, invitation_user_ids(*before[1:]) | invitation_user_ids(*after[1:]))
+
+
+@receiver(post_delete, sender=Invitation)
+def update_voter_roll_for_deleted_invitation(sender, instance, **kwargs):
+    """Take the users of a cancelled accepted invitation off the roll, unless another invitation covers them"""
+    status, invited_user_id, invited_email = instance._roll_state
+    if status == 'accepted':
+        update_voter_roll(instance.election_id, invitation_user_ids(invited_user_id, invited_email))
+
+
+@receiver(post_save, sender=Election)
+def reset_voter_roll_for_new_election(sender, instance, created, using, **kwargs):
+    """Drop any cached roll left behind by a deleted election with the same id"""
+    if created:
+        forget_voter_roll(instance.pk, using=using)
+
+
+@receiver(post_save, sender=User)
+def update_voter_roll_for_user(sender, instance, update_fields=None, **kwargs):
+    """Link invitations sent to an email address once an account uses that address"""
+    if update_fields is not None and 'email' not in update_fields:
+        return  # e.g. last_login updates on every sign-in
+    refresh_user_eligibility(instance)
@@ -0,0 +1,326 @@
+"""
+Homomorphic tallying of encrypted election ballots
+"""
+import json
+import logging
+from array import array
+
+from django.db import connections, router
+
+from app.ballot_store import BallotStore, BallotStoreError, ballot_store_enabled
+from app.encryption import Encryption, Ciphertext
+from app.turnout import reconcile_turnout
+
+logger = logging.getLogger(__name__)
+
+# Name of the modular-product aggregate installed by migration 0002 on PostgreSQL
+PAILLIER_SUM_AGGREGATE = 'intikhab_paillier_sum'
+
+
+def get_election_encryption(election, with_private_key=False):
+    """Build an Encryption instance from the keys stored on an election"""
+    public_key = json.loads(election.public_key.replace("'", '"'))
+    public_key_str = f"{public_key['g']},{public_key['n']}"
+    if not with_private_key:
+        return Encryption(public_key=public_key_str)
+
+    private_key = json.loads(election.private_key.replace("'", '"'))
+    return Encryption(public_key=public_key_str, private_key=f"{private_key['phi']}")
+
+
+def parse_ballot(ballot):
+    """Return the ciphertext components of a stored ballot, or None for legacy ballots"""
+    if not isinstance(ballot, str) or not ballot.startswith('['):
+        return None
+    try:
+        return [int(component) for component in json.loads(ballot)]
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return None
+
+
+def sum_ballots(election, encryption, from_archive=None):
+    """
+    Homomorphically add every ballot of an election component by component.
+
+    Returns one ciphertext per candidate, or None if the election has no ballots.
+    On PostgreSQL the product mod n^2 is computed in the database so only the
+    per-candidate totals leave it; other backends fall back to Python. When the
+    ballot store is enabled and in step with the database it is used instead.
+    Archived elections (or any election, with from_archive=True) are summed
+    from their ballot archive.
+    """
+    from app.models import Vote
+
+    modulus = encryption.paillier.ciphertext_modulo
+    if from_archive is None:
+        from_archive = election.archived_at is not None
+    if from_archive:
+        return _sum_ballots_from_archive(election, modulus)
+    using = router.db_for_read(Vote)
+    if ballot_store_enabled():
+        try:
+            return _sum_ballots_from_store(election, modulus, using)
+        except BallotStoreError as e:
+            logger.warning(f'Tallying election {election.uuid} from the database: {e}')
+    if connections[using].vendor == 'postgresql':
+        return _sum_ballots_in_database(election, modulus, using)
+    return _sum_ballots_in_python(election, modulus, using)
+
+
+def _sum_ballots_in_database(election, modulus, using):
+    """Sum ballots with the PostgreSQL modular-product aggregate"""
+    from app.models import Vote
+
+    sql = f"""
+        SELECT component.idx, {PAILLIER_SUM_AGGREGATE}(btrim(component.value)::numeric, %s::numeric)::text
+        FROM {Vote._meta.db_table} AS vote
+        CROSS JOIN LATERAL unnest(string_to_array(btrim(vote.ballot, '[] '), ','))
+            WITH ORDINALITY AS component(value, idx)
+        WHERE vote.election_id = %s AND vote.ballot LIKE '[%%'
+        GROUP BY component.idx
+        ORDER BY component.idx
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, [str(modulus), election.pk])
+        rows = cursor.fetchall()
+
+    if not rows:
+        return None
+    return [int(total) for _, total in rows]
+
+
+def _sum_ballots_in_python(election, modulus, using):
+    """Sum ballots by streaming them from the database"""
+    from app.models import Vote
+
+    ballots = (
+        Vote.objects.using(using)
+        .filter(election=election)
+        .values_list('ballot', flat=True)
+        .iterator(chunk_size=2000)
+    )
+    return _multiply_ballots(ballots, modulus)
+
+
+def _sum_ballots_from_archive(election, modulus):
+    """Sum ballots by walking the election's memory-mapped ballot archive"""
+    from app.archive import BallotArchive
+
+    with BallotArchive(election) as archive:
+        return _multiply_ballots((ballot for _, ballot in archive), modulus)
+
+
+def _sum_ballots_from_store(election, modulus, using):
+    """
+    Sum ballots by walking the fixed-width records of the election's ballot store.
+
+    The store is only trusted when it records exactly the votes in the
+    database: matching counts aren't enough, since a failed append and a
+    duplicate one (e.g. a vote appended again after a rebuild) cancel out.
+    """
+    from app.models import Vote
+
+    expected = array('Q', (
+        Vote.objects.using(using).filter(election=election, ballot__startswith='[')
+        .order_by('id').values_list('id', flat=True).iterator(chunk_size=10000)
+    ))
+    if not expected:
+        return None
+    with BallotStore(election) as store:
+        recorded = array('Q', sorted(store.vote_ids()))
+        if recorded != expected:
+            raise BallotStoreError(f'store holds {len(recorded)} records for {len(expected)} ballots, '
+                                   f'not the same votes; run rebuild_ballot_store')
+        return _multiply_components(store.ciphertexts(), modulus)
+
+
+def _multiply_ballots(ballots, modulus):
+    """Multiply stored ballots component by component mod n^2"""
+    parsed = (parse_ballot(ballot) for ballot in ballots)
+    return _multiply_components((components for components in parsed if components is not None), modulus)
+
+
+def _multiply_components(ballots, modulus):
+    """Multiply lists of ciphertext components position by position mod n^2"""
+    totals = None
+    for components in ballots:
+        if totals is None:
+            totals = components
+        else:
+            totals = [(total * component) % modulus for total, component in zip(totals, components)]
+    return totals
+
+
+def tally_election(election):
+    """
+    Compute the encrypted tally, decrypted totals and zero-sum proof of an election.
+
+    The tally fields are set on the instance; the caller is responsible for saving.
+    Returns False if there were no ballots to tally.
+    """
+    encryption = get_election_encryption(election, with_private_key=True)
+
+    # STEP 1 (homomorphic tallying)
+    totals = sum_ballots(election, encryption)
+    if totals is None:
+        return False
+    encrypted_positive_total = [Ciphertext(total) for total in totals]
+    election.encrypted_positive_total = json.dumps([ct.to_json() for ct in encrypted_positive_total])
+
+    # STEP 2 (decryption)
+    decrypted_positive_total = [encryption.decrypt(ct) for ct in encrypted_positive_total]
+    election.decrypted_total = json.dumps(decrypted_positive_total)
+
+    # encrypt the negated totals with randomness 1
+    encrypted_negative_total = [encryption.encrypt(-total, 1) for total in decrypted_positive_total]
+    election.encrypted_negative_total = json.dumps([ct.to_json() for ct in encrypted_negative_total])
+
+    # STEP 3 (obtain zero sum vector)
+    encrypted_zero_sum = [
+        encryption.add(positive, negative)
+        for positive, negative in zip(encrypted_positive_total, encrypted_negative_total)
+    ]
+    election.encrypted_zero_sum = json.dumps([ct.to_json() for ct in encrypted_zero_sum])
+
+    # STEP 4 (obtain randomness of zero vector)
+    zero_randomness = [encryption.extract_randomness_from_zero_vector(ct) for ct in encrypted_zero_sum]
+    election.zero_randomness = json.dumps(zero_randomness)
+
+    return True
+
+
+def verify_election(election):
+    """
+    Check the zero-sum proof of a tallied election.
+
+    Re-encrypts the negated decrypted totals, adds them to the encrypted totals
+    and compares the result with an encryption of zero under the stored
+    randomness. Returns a (verified, transcript) tuple where verified is None if
+    the election has no tally to verify.
+    """
+    transcript = {
+        'election': str(election.uuid),
+        'decrypted_total': [],
+        'encrypted_positive_total': [],
+        'encrypted_zero_sum': [],
+        'recalculated_zero_sum': [],
+        'zero_randomness': [],
+    }
+    try:
+        if not election.public_key or not election.decrypted_total:
+            return None, transcript
+
+        encryption = get_election_encryption(election)
+
+        # Convert decrypted total to negative vector and encrypt it
+        decrypted_total = json.loads(election.decrypted_total)
+        encrypted_negative_total = [encryption.encrypt(plaintext=-x, rand=1) for x in decrypted_total]
+
+        # Get encrypted positive total and compute zero sum
+        encrypted_positive_total = [
+            Ciphertext.from_json(ct) for ct in json.loads(election.encrypted_positive_total)
+        ]
+        encrypted_zero_sum = [
+            encryption.add(positive, negative)
+            for positive, negative in zip(encrypted_positive_total, encrypted_negative_total)
+        ]
+
+        # Recalculate zero sum with stored randomness
+        zero_randomness = json.loads(election.zero_randomness)
+        recalculated_zero_sum = [encryption.encrypt(plaintext=0, rand=r) for r in zero_randomness]
+
+        transcript.update({
+            'decrypted_total': decrypted_total,
+            'encrypted_positive_total': [str(ct.ciphertext) for ct in encrypted_positive_total],
+            'encrypted_zero_sum': [str(ct.ciphertext) for ct in encrypted_zero_sum],
+            'recalculated_zero_sum': [str(ct.ciphertext) for ct in recalculated_zero_sum],
+            'zero_randomness': [str(r) for r in zero_randomness],
+        })
+
+        # Verify if sums match
+        verified = (
+            len(encrypted_zero_sum) == len(recalculated_zero_sum) and
+            all(a.ciphertext == b.ciphertext for a, b in zip(encrypted_zero_sum, recalculated_zero_sum))
+        )
+        return verified, transcript
+
+    except (json.JSONDecodeError, KeyError, IndexError, ValueError, TypeError):
+        # Verification cannot be performed
+        return None, transcript
+
+
+def record_verification(election):
+    """Verify an election and store the outcome and transcript on the instance"""
+    from django.utils import timezone
+
+    verified, transcript = verify_election(election)
+    election.verified = verified
+    election.verified_at = timezone.now()
+    transcript['verified'] = verified
+    transcript['verified_at'] = election.verified_at.isoformat()
+    election.verification_transcript = json.dumps(transcript, sort_keys=True)
+    return verified
+
+
+def materialize_results(election):
+    """
+    Store the decrypted totals of an election as ranked ElectionResult rows.
+
+    Ballot components follow candidate id order, so the decrypted totals are
+    matched to candidates ordered by id. Returns the rows ordered by rank.
+    """
+    from decimal import Decimal
+    from django.db import transaction
+    from app.models import ElectionResult
+
+    if not election.decrypted_total:
+        return []
+
+    totals = json.loads(election.decrypted_total)
+    candidates = list(election.candidates.select_related('user', 'party').order_by('id'))
+    counts = list(zip(candidates, totals))
+    total_votes = sum(votes for _, votes in counts)
+
+    rows = []
+    ranked = sorted(counts, key=lambda item: (-item[1], item[0].id))
+    for position, (candidate, votes) in enumerate(ranked, 1):
+        # Tied candidates share the rank of the first of them
+        rank = rows[-1].rank if rows and rows[-1].votes == votes else position
+        percentage = Decimal(votes * 100 / total_votes).quantize(Decimal('0.1')) if total_votes else Decimal('0')
+        rows.append(ElectionResult(
+            election=election,
+            candidate=candidate,
+            votes=votes,
+            percentage=percentage,
+            rank=rank
+        ))
+
+    with transaction.atomic():
+        ElectionResult.objects.filter(election=election).delete()
+        ElectionResult.objects.bulk_create(rows)
+    return rows
+
+
+def finalize_election(election):
+    """
+    Tally and verify a closed election once so results can be served as stored data.
+
+    Resets the turnout counters to the stored votes, saves the election,
+    materializes its results and publishes them as static files. Elections
+    without keys or ballots are saved unchanged apart from the verification
+    outcome.
+    """
+    from app.published_results import publish_results
+
+    reconcile_turnout(election)  # Final turnout is exact even if counters drifted
+    if election.public_key and election.private_key and not election.decrypted_total:
+        tally_election(election)
+    record_verification(election)
+    election.save()
+    materialize_results(election)
+    try:
+        publish_results(election)
+    except OSError:
+        # The views render results themselves until they are published again
+        logger.exception('Failed to publish results of election %s', election.uuid)
+    return election
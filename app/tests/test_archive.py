@@ -0,0 +1,94 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from app.archive import BALLOTS_PER_BLOCK, ArchiveError, BallotArchive, archive_paths, write_archive
+from app.encryption import Ciphertext
+from app.models import Vote
+from app.tally import get_election_encryption, sum_ballots
+from app.tests.test_base import TEST_FILES_ROOT, TestDataMixin
+
+
+@override_settings(BALLOT_ARCHIVE_ROOT=TEST_FILES_ROOT / 'archive')
+class ArchiveElectionTest(TestDataMixin, TestCase):
+    """Test cases for archiving closed elections' ballots to segment files"""
+
+    def setUp(self):
+        """Set up an election with real keys and a few encrypted votes"""
+        self.create_keyed_election('Archived Election', votes=[0, 1, 1])
+
+    def archive(self):
+        """Run the archive command for the election"""
+        call_command('archive_election', str(self.election.uuid), stdout=StringIO())
+        self.election.refresh_from_db()
+
+    def test_archive_clears_ballots_and_keeps_receipts(self):
+        """Test that ballots move to the archive while vote rows and results stay online"""
+        self.close_and_finalize()
+        self.archive()
+
+        self.assertIsNotNone(self.election.archived_at)
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 3)
+        self.assertFalse(Vote.objects.filter(election=self.election).exclude(ballot='').exists())
+        self.assertEqual(self.election.results.get(rank=1).votes, 2)
+
+        vote = Vote.objects.get(pk=self.votes[0].pk)
+        self.assertEqual(vote.get_ballot(), str(self.votes[0].ballot))
+
+    def test_ballot_readers_use_the_archive(self):
+        """Test that the security check and the admin read archived ballots"""
+        self.close_and_finalize()
+        self.archive()
+
+        output = StringIO()
+        call_command('check_vote_security', election=self.election.pk, stdout=output)
+        self.assertIn('All 3 votes are secure', output.getvalue())
+
+        self.client.force_login(User.objects.create_superuser(username='admin', password='adminpass123'))
+        response = self.client.get(reverse('admin:app_vote_changelist'))
+        self.assertContains(response, str(self.votes[0].ballot)[:40])
+
+    def test_tally_reads_the_archive(self):
+        """Test that an archived election still tallies to its decrypted totals"""
+        self.close_and_finalize()
+        self.archive()
+
+        encryption = get_election_encryption(self.election, with_private_key=True)
+        totals = sum_ballots(self.election, encryption)
+        self.assertEqual([encryption.decrypt(Ciphertext(total)) for total in totals], [1, 2])
+
+    def test_corrupt_block_is_detected(self):
+        """Test that a damaged segment fails its checksums"""
+        self.close_and_finalize()
+        self.archive()
+
+        segment_path, _ = archive_paths(self.election)
+        data = bytearray(segment_path.read_bytes())
+        data[-5] ^= 0xFF
+        segment_path.write_bytes(bytes(data))
+
+        with BallotArchive(self.election) as archive:
+            with self.assertRaises(ArchiveError):
+                archive.verify()
+            with self.assertRaises(ArchiveError):
+                list(archive)
+
+    def test_refuses_elections_without_verified_results(self):
+        """Test that open or unverified elections are not archived"""
+        with self.assertRaises(CommandError):
+            self.archive()
+        self.assertFalse(Vote.objects.filter(election=self.election, ballot='').exists())
+
+    def test_blocks_are_looked_up_by_vote_id(self):
+        """Test that ballots are found across several blocks"""
+        ballots = [(vote_id, f'[{vote_id}]') for vote_id in range(1, BALLOTS_PER_BLOCK * 2 + 10)]
+        index = write_archive(self.election, iter(ballots))
+        self.assertEqual(len(index['blocks']), 3)
+
+        with BallotArchive(self.election) as archive:
+            archive.verify()
+            self.assertEqual(archive.get_ballot(BALLOTS_PER_BLOCK + 1), f'[{BALLOTS_PER_BLOCK + 1}]')
+            self.assertIsNone(archive.get_ballot(10_000))
+            self.assertEqual(list(archive), ballots)
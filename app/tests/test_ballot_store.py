@@ -0,0 +1,68 @@
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from app.ballot_store import BallotStore, append_ballot, store_path
+from app.encryption import Ciphertext
+from app.tally import get_election_encryption, sum_ballots
+from app.tests.test_base import TEST_FILES_ROOT, TestDataMixin
+
+
+@override_settings(BALLOT_STORE_ROOT=TEST_FILES_ROOT / 'ballots')
+class BallotStoreTest(TestDataMixin, TestCase):
+    """Test cases for the append-only ballot store used by tallies"""
+
+    def setUp(self):
+        """Set up an election with real keys"""
+        self.create_keyed_election('Stored Election')
+        self.encryption = get_election_encryption(self.election, with_private_key=True)
+
+    def decrypted_tally(self):
+        """Decrypt the summed ballots of the election"""
+        return [self.encryption.decrypt(Ciphertext(total)) for total in sum_ballots(self.election, self.encryption)]
+
+    def test_committed_votes_are_appended(self):
+        """Test that each committed vote adds one fixed-width record"""
+        votes = [self.cast_vote('voter1', self.candidates[0], commit=True),
+                 self.cast_vote('voter2', self.candidates[1], commit=True)]
+
+        with BallotStore(self.election) as store:
+            self.assertEqual(len(store), 2)
+            records = list((vote_id, [bytes(c) for c in components]) for vote_id, components in store.records())
+        self.assertEqual([vote_id for vote_id, _ in records], [vote.pk for vote in votes])
+        self.assertEqual([int.from_bytes(c, 'big') for c in records[0][1]], votes[0].ballot)
+
+    def test_tally_reads_the_store(self):
+        """Test that tallies come from the store without reading ballots from the database"""
+        self.cast_vote('voter1', self.candidates[0], commit=True)
+        self.cast_vote('voter2', self.candidates[1], commit=True)
+        self.cast_vote('voter3', self.candidates[1], commit=True)
+
+        with mock.patch('app.tally._sum_ballots_in_python') as in_python, \
+                mock.patch('app.tally._sum_ballots_in_database') as in_database:
+            self.assertEqual(self.decrypted_tally(), [1, 2])
+        in_python.assert_not_called()
+        in_database.assert_not_called()
+
+    def test_stale_store_falls_back_and_rebuilds(self):
+        """Test that a store missing ballots is ignored until it is rebuilt"""
+        self.cast_vote('voter1', self.candidates[0], commit=True)
+        self.cast_vote('voter2', self.candidates[1])
+
+        self.assertEqual(self.decrypted_tally(), [1, 1])
+
+        call_command('rebuild_ballot_store', '--election', str(self.election.uuid), stdout=StringIO())
+        with BallotStore(self.election) as store:
+            self.assertEqual(len(store), 2)
+        self.assertTrue(store_path(self.election).exists())
+        self.assertEqual(self.decrypted_tally(), [1, 1])
+
+    def test_duplicate_record_does_not_mask_a_missing_one(self):
+        """Test that a store with the right count but the wrong votes is not trusted"""
+        first = self.cast_vote('voter1', self.candidates[0], commit=True)
+        self.cast_vote('voter2', self.candidates[1])
+        append_ballot(first)  # Appended twice, e.g. once more after a rebuild
+
+        with BallotStore(self.election) as store:
+            self.assertEqual(len(store), 2)
+        self.assertEqual(self.decrypted_tally(), [1, 1])
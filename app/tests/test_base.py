@@ -5,6 +5,10 @@ This module provides common test utilities and configurations that can be used
 across all test modules.
 """
 
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
 from django.test import TestCase
 from django.contrib.auth.models import User, Group
 from django.utils import timezone
@@ -12,6 +16,11 @@ from datetime import timedelta
 from app.models import Election, Party, Candidate, Vote
 
 
+# Scratch directory for files written by tests (ballot stores, archives, published results)
+TEST_FILES_ROOT = Path(tempfile.mkdtemp(prefix='intikhab-tests-'))
+atexit.register(shutil.rmtree, TEST_FILES_ROOT, ignore_errors=True)
+
+
 class BaseTestCase(TestCase):
     """Base test case with common setup for election app tests"""
     
@@ -146,4 +155,51 @@ class TestDataMixin:
         """Return a sample vote hash for testing"""
         import hashlib
         test_data = "sample_vote_data_for_testing"
-        return hashlib.sha256(test_data.encode()).hexdigest()
\ No newline at end of file
+        return hashlib.sha256(test_data.encode()).hexdigest()
+    
+    @staticmethod
+    def get_real_election_keys():
+        """Return a freshly generated Paillier key pair in the format stored on elections"""
+        from app.encryption import Encryption
+        encryption = Encryption()
+        return str(encryption.paillier.keys['public_key']), str(encryption.paillier.keys['private_key'])
+
+    def create_keyed_election(self, name, candidates=2, votes=(), **fields):
+        """
+        Create an open election with real keys, candidates and encrypted votes.
+
+        votes lists the index of the candidate each voter picks. The election,
+        candidates and votes are stored on self.election, self.candidates and
+        self.votes.
+        """
+        public_key, private_key = self.get_real_election_keys()
+        fields.setdefault('description', f'{name} for testing')
+        fields.setdefault('start_date', timezone.now() - timedelta(days=1))
+        fields.setdefault('end_date', timezone.now() + timedelta(days=1))
+        fields.setdefault('active', True)
+        self.election = Election.objects.create(name=name, public_key=public_key, private_key=private_key, **fields)
+        self.candidates = [
+            Candidate.objects.create(
+                user=User.objects.create_user(username=f'candidate{i}', password='testpass123',
+                                              first_name=f'Candidate {i}'),
+                election=self.election
+            )
+            for i in range(candidates)
+        ]
+        self.votes = [self.cast_vote(f'voter{i}', self.candidates[choice]) for i, choice in enumerate(votes)]
+        return self.election
+
+    def cast_vote(self, username, candidate, commit=False):
+        """Cast an encrypted vote for the candidate, running its on-commit hooks if commit is True"""
+        vote = Vote(user=User.objects.create_user(username=username, password='testpass123'),
+                    election=candidate.election)
+        vote._candidate = candidate
+        with self.captureOnCommitCallbacks(execute=commit):
+            vote.save()
+        return vote
+
+    def close_and_finalize(self):
+        """Close self.election and store, then publish, its verified tally"""
+        from app.tally import finalize_election
+        self.election.close_election()
+        return finalize_election(self.election)
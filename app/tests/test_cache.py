@@ -0,0 +1,75 @@
+import tempfile
+from io import StringIO
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from app.cache import InstrumentedCache, clear_caches
+
+
+class InstrumentedCacheTest(SimpleTestCase):
+    """Test cases for the named caches and their hit/miss statistics"""
+
+    def setUp(self):
+        """Start from empty caches and statistics"""
+        clear_caches()
+
+    def make_cache(self, location=None, backend='django.core.cache.backends.locmem.LocMemCache'):
+        """An instrumented cache outside of CACHES, as a worker process would build it"""
+        return InstrumentedCache(location or self.id(), {'WRAPS': backend, 'KEY_PREFIX': 'test'})
+
+    def test_reads_are_counted(self):
+        """Test that get and get_many count hits and misses while passing values through"""
+        cache = self.make_cache()
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b', 'fallback'), 'fallback')
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), {'a': 1})
+        self.assertEqual(cache.get_stats(), {'hits': 2, 'misses': 3})
+
+    def test_falsy_values_are_hits(self):
+        """Test that cached None-like values aren't mistaken for misses"""
+        cache = self.make_cache()
+        cache.set('zero', 0)
+        self.assertEqual(cache.get('zero', 'fallback'), 0)
+        self.assertEqual(cache.get_stats(), {'hits': 1, 'misses': 0})
+
+    def test_stats_are_shared_between_processes(self):
+        """Test that counts flushed by one instance are reported by another on the same backend"""
+        worker, reporter = self.make_cache(), self.make_cache()
+        worker.get('missing')
+        worker.flush_stats()
+        self.assertEqual(reporter.get_stats(), {'hits': 0, 'misses': 1})
+
+        reporter.reset_stats()
+        self.assertEqual(worker.get_stats(), {'hits': 0, 'misses': 0})
+
+    def test_file_backend(self):
+        """Test that the single-node file backend can be wrapped"""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = self.make_cache(directory, 'django.core.cache.backends.filebased.FileBasedCache')
+            cache.set('a', {'votes': 3})
+            self.assertEqual(cache.get('a'), {'votes': 3})
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual(cache.get_stats(), {'hits': 1, 'misses': 1})
+
+    def test_namespaces_are_separate(self):
+        """Test that each named cache has its own entries and eviction policy"""
+        caches['pages'].set('key', 'page')
+        self.assertIsNone(caches['counters'].get('key'))
+        caches['counters'].clear()
+        self.assertEqual(caches['pages'].get('key'), 'page')
+        self.assertEqual(caches['pages']._cache._max_entries, 500)
+        self.assertEqual(caches['counters']._cache._max_entries, 10000)
+
+    def test_cache_stats_command(self):
+        """Test that the command reports a hit ratio per namespace and can reset them"""
+        caches['crypto'].set('transcript', 'ok')
+        caches['crypto'].get('transcript')
+        caches['crypto'].get('transcript')
+        caches['crypto'].get('other')
+
+        out = StringIO()
+        call_command('cache_stats', '--reset', stdout=out)
+        self.assertIn('66.7% hit ratio', out.getvalue())
+        self.assertIn('pages', out.getvalue())
+        self.assertEqual(caches['crypto'].get_stats(), {'hits': 0, 'misses': 0})
@@ -0,0 +1,83 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from app.cache import clear_caches
+from app.models import Election, Candidate, Party, Vote
+
+
+@override_settings(CLOSED_ELECTION_MAX_AGE=3600)
+class ConditionalGetTest(TestCase):
+    """Test cases for ETags and 304 responses of election and candidate pages"""
+
+    def setUp(self):
+        """Set up an open public election with one candidate"""
+        clear_caches()
+        self.election = Election.objects.create(
+            name='Conditional Election',
+            description='An election whose pages are revalidated',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            active=True,
+            is_public=True
+        )
+        self.party = Party.objects.create(name='Conditional Party')
+        self.candidate = Candidate.objects.create(
+            user=User.objects.create_user(username='candidate'), election=self.election, party=self.party
+        )
+        self.url = reverse('election_detail', args=[self.election.uuid])
+
+    def revalidate(self, url, response):
+        """Repeat a request with the validators of an earlier response"""
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_page_is_not_modified(self):
+        """Test that a repeat visit gets 304 without loading the candidates"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertNotIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.revalidate(self.url, response).status_code, 304)
+
+    def test_changes_invalidate_the_etag(self):
+        """Test that candidate, party and election changes produce a new ETag"""
+        changes = [
+            self.election.save,
+            self.party.save,
+            lambda: Candidate.objects.create(user=User.objects.create_user(username='newcomer'), election=self.election),
+        ]
+        for change in changes:
+            response = self.client.get(self.url)
+            change()
+            self.assertEqual(self.revalidate(self.url, response).status_code, 200)
+
+    def test_votes_invalidate_the_etag(self):
+        """Test that new votes change the ETag through the turnout counter"""
+        response = self.client.get(self.url)
+        Vote.objects.create(user=User.objects.create_user(username='voter'), election=self.election,
+                            ballot='[1]', hashed='hash')
+        clear_caches()  # Skip the turnout cache timeout
+        self.assertEqual(self.revalidate(self.url, response).status_code, 200)
+
+    def test_closed_election_is_cacheable(self):
+        """Test that closed elections send a long lifetime and Last-Modified"""
+        self.election.close_election()
+        self.election.save()
+
+        for url in (self.url, reverse('candidate_detail', args=[self.candidate.uuid])):
+            response = self.client.get(url)
+            self.assertIn('max-age=3600', response['Cache-Control'])
+            self.assertIn('public', response['Cache-Control'])
+            since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(since.status_code, 304)
+
+    def test_signed_in_users_get_full_pages(self):
+        """Test that personal pages are neither validated nor publicly cached"""
+        response = self.client.get(self.url)
+        self.client.force_login(User.objects.create_user(username='visitor'))
+        again = self.revalidate(self.url, response)
+        self.assertEqual(again.status_code, 200)
+        self.assertNotIn('ETag', again)
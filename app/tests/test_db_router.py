@@ -0,0 +1,58 @@
+from unittest import mock
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from app.db_router import ReplicaRouter, pin_to_primary
+from app.middleware import PIN_COOKIE_NAME, PrimaryPinningMiddleware
+from app.models import Vote
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+@mock.patch('app.middleware.get_replica_aliases', return_value=REPLICAS)
+@mock.patch('app.db_router.get_replica_aliases', return_value=REPLICAS)
+class ReplicaRouterTest(SimpleTestCase):
+    """Test cases for routing reads to replicas and pinning them to the primary"""
+
+    def setUp(self):
+        """Set up the router and a request factory"""
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route_request(self, request):
+        """Run a request through the pinning middleware, recording where reads were routed"""
+        routed = []
+
+        def view(request):
+            routed.append(self.router.db_for_read(Vote))
+            return HttpResponse()
+
+        response = PrimaryPinningMiddleware(view)(request)
+        return routed[0], response
+
+    def test_reads_go_to_replicas_and_writes_to_primary(self, *mocks):
+        """Test that reads use a replica and writes and migrations stay on the primary"""
+        self.assertIn(self.router.db_for_read(Vote), REPLICAS)
+        self.assertEqual(self.router.db_for_write(Vote), 'default')
+        self.assertFalse(self.router.allow_migrate('replica_1', 'app'))
+        self.assertIsNone(self.router.allow_migrate('default', 'app'))
+
+    def test_pinned_reads_use_primary(self, *mocks):
+        """Test that reads inside pin_to_primary use the primary"""
+        with pin_to_primary():
+            self.assertEqual(self.router.db_for_read(Vote), 'default')
+        self.assertIn(self.router.db_for_read(Vote), REPLICAS)
+
+    def test_reads_after_a_write_are_pinned(self, *mocks):
+        """Test that a write pins the browser's following reads to the primary"""
+        db, response = self.route_request(self.factory.get('/elections'))
+        self.assertIn(db, REPLICAS)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+        db, response = self.route_request(self.factory.post('/vote/candidate'))
+        self.assertEqual(db, 'default')
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+        request = self.factory.get('/elections')
+        request.COOKIES[PIN_COOKIE_NAME] = '1'
+        db, response = self.route_request(request)
+        self.assertEqual(db, 'default')
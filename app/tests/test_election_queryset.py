@@ -0,0 +1,209 @@
+from django.test import TestCase
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from django.contrib.auth.models import User
+from app.cache import clear_caches
+from app.models import Election, Candidate, Party
+from app.models.election import ElectionQuerySet
+
+
+class ElectionQuerySetTest(TestCase):
+    """Test cases for database-side election status"""
+
+    def setUp(self):
+        """Create one election for every status"""
+        clear_caches()
+        now = timezone.now()
+        self.elections = {
+            'open': Election.objects.create(
+                name='Open', description='Voting now', active=True,
+                start_date=now - timedelta(days=1), end_date=now + timedelta(days=2)
+            ),
+            'scheduled': Election.objects.create(
+                name='Scheduled', description='Active, not started', active=True,
+                start_date=now + timedelta(days=1), end_date=now + timedelta(days=3)
+            ),
+            'inactive': Election.objects.create(
+                name='Inactive', description='Not yet activated',
+                start_date=now + timedelta(days=2), end_date=now + timedelta(days=4)
+            ),
+            'expired': Election.objects.create(
+                name='Expired', description='Needs closing', active=True,
+                start_date=now - timedelta(days=5), end_date=now - timedelta(days=1)
+            ),
+            'closed': Election.objects.create(
+                name='Closed', description='Closed early', closed_at=now,
+                start_date=now - timedelta(days=3), end_date=now + timedelta(days=1)
+            ),
+        }
+
+    def test_with_status_matches_get_status(self):
+        """Test that the annotated status agrees with the Python status"""
+        for election in Election.objects.with_status():
+            self.assertEqual(election.status, election.get_status())
+
+    def test_status_counts(self):
+        """Test that status groups are counted in a single query"""
+        with self.assertNumQueries(1):
+            counts = Election.objects.with_status().status_counts()
+        self.assertEqual(counts, {'ongoing': 1, 'upcoming': 2, 'recently_closed': 2, 'total': 5})
+
+    def test_filter_and_order_by_status(self):
+        """Test that elections are ordered ongoing, upcoming by start, then closed by latest end"""
+        elections = Election.objects.with_status().order_by_status()
+        self.assertEqual(
+            [election.name for election in elections],
+            ['Open', 'Scheduled', 'Inactive', 'Closed', 'Expired']
+        )
+
+        upcoming = Election.objects.with_status().filter_status_groups(['upcoming'])
+        self.assertEqual({election.name for election in upcoming}, {'Scheduled', 'Inactive'})
+
+    def test_election_list_fetches_one_page(self):
+        """Test that the election list runs a count aggregate and a single page query"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('election_list'), {'status': 'closed'})
+
+        election_queries = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "app_election"' in query['sql']
+        ]
+        self.assertEqual(len(election_queries), 2)
+        self.assertNotIn('"private_key"', election_queries[1]['sql'])
+
+        self.assertEqual(response.context['elections_count']['total'], 2)
+        self.assertEqual([election.name for election in response.context['page_obj']], ['Closed', 'Expired'])
+
+    def test_without_crypto_defers_key_material(self):
+        """Test that listings skip key and tally columns until they are accessed"""
+        election = Election.objects.without_crypto().get(pk=self.elections['open'].pk)
+        self.assertEqual(election.get_deferred_fields(), set(ElectionQuerySet.CRYPTO_FIELDS))
+        self.assertEqual(election.name, 'Open')
+
+
+class ElectionCardQueryCountTest(TestCase):
+    """Test cases pinning the queries of pages that render election cards"""
+
+    def setUp(self):
+        """Create elections of every status group with more candidates than a card shows"""
+        clear_caches()
+        now = timezone.now()
+        party = Party.objects.create(name='Card Party')
+        schedules = [
+            (True, now - timedelta(days=1), now + timedelta(days=2)),
+            (False, now + timedelta(days=2), now + timedelta(days=4)),
+            (False, now - timedelta(days=5), now - timedelta(days=1)),
+        ]
+        for i in range(9):
+            active, start_date, end_date = schedules[i % 3]
+            election = Election.objects.create(
+                name=f'Election {i}', description='Card election', active=active,
+                start_date=start_date, end_date=end_date, is_public=True
+            )
+            for j in range(4):
+                user = User.objects.create_user(
+                    username=f'candidate{i}_{j}', first_name='Card', last_name=f'Candidate {j}'
+                )
+                Candidate.objects.create(user=user, election=election, party=party if j % 2 else None)
+
+    def test_election_list_query_count(self):
+        """Test that the election list renders six cards in a fixed number of queries"""
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('election_list'))
+        self.assertContains(response, 'Card Candidate 0')
+        self.assertEqual(
+            [len(election.candidate_preview) for election in response.context['page_obj']],
+            [ElectionQuerySet.CANDIDATE_PREVIEW_SIZE] * 6
+        )
+
+        caches['pages'].clear()
+        with self.assertNumQueries(2):  # Cached cards need no previews
+            response = self.client.get(reverse('election_list'))
+        self.assertContains(response, 'Card Candidate 0')
+
+    def test_index_query_count(self):
+        """Test that the homepage renders its election cards in a fixed number of queries"""
+        with self.assertNumQueries(5):  # Status counts, three lists, previews of all cards
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, 'Card Party')
+
+        caches['pages'].clear()
+        with self.assertNumQueries(4):  # Cached cards need no previews
+            self.assertContains(self.client.get(reverse('index')), 'Card Party')
+
+
+class ElectionDetailQueryCountTest(TestCase):
+    """Test cases pinning the queries of election and candidate detail pages"""
+
+    def setUp(self):
+        """Create a private election with candidates, votes and invitations"""
+        from app.models import Invitation, Vote
+
+        clear_caches()
+        now = timezone.now()
+        self.creator = User.objects.create_user(username='creator', password='testpass123')
+        self.election = Election.objects.create(
+            name='Detailed Election', description='Counted election', active=True,
+            start_date=now - timedelta(days=1), end_date=now + timedelta(days=1),
+            created_by=self.creator
+        )
+        party = Party.objects.create(name='Detail Party')
+        self.candidates = [
+            Candidate.objects.create(
+                user=User.objects.create_user(username=f'candidate{i}', first_name='Detail', last_name=str(i)),
+                election=self.election, party=party
+            )
+            for i in range(5)
+        ]
+        for i in range(3):
+            Vote.objects.create(
+                user=User.objects.create_user(username=f'voter{i}'), election=self.election,
+                ballot='[1, 0, 0, 0, 0]', hashed=f'hash{i}'
+            )
+        for i, status in enumerate(['pending', 'pending', 'accepted', 'declined']):
+            Invitation.objects.create(
+                election=self.election, invited_by=self.creator,
+                invited_email=f'invitee{i}@example.com', status=status,
+                expires_at=now + timedelta(days=7)
+            )
+
+    def test_election_detail_counts(self):
+        """Test that the detail page gets its counters from the annotated election and turnout counter"""
+        with self.assertNumQueries(3):  # Election, candidates, turnout shards
+            response = self.client.get(reverse('election_detail', args=[self.election.uuid]))
+        with self.assertNumQueries(1):  # Turnout and candidates served from cache
+            self.client.get(reverse('election_detail', args=[self.election.uuid]))
+
+        election = response.context['election']
+        self.assertEqual(
+            (election.get_total_votes(), election.get_candidates_count(), election.get_invitations_count(),
+             election.get_accepted_invitations_count(), election.get_pending_invitations_count()),
+            (3, 5, 4, 1, 2)
+        )
+        self.assertEqual(response.context['status_info']['status'], 'open')
+        self.assertContains(response, 'Detail Party')
+
+    def test_election_detail_query_count_does_not_grow(self):
+        """Test that more candidates and a signed-in creator don't add per-row queries"""
+        self.client.force_login(self.creator)
+        self.client.get(reverse('election_detail', args=[self.election.uuid]))  # Warm per-user caches
+
+        caches['template_fragments'].clear()  # Render the candidates both times
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(reverse('election_detail', args=[self.election.uuid]))
+        for i in range(5, 10):
+            Candidate.objects.create(user=User.objects.create_user(username=f'candidate{i}'), election=self.election)
+        with CaptureQueriesContext(connection) as after:
+            self.client.get(reverse('election_detail', args=[self.election.uuid]))
+        self.assertEqual(len(before), len(after))
+
+    def test_candidate_detail_query_count(self):
+        """Test that the candidate page loads the candidate and its election once"""
+        with self.assertNumQueries(2):  # Candidate with its election, turnout shards for the ETag
+            response = self.client.get(reverse('candidate_detail', args=[self.candidates[0].uuid]))
+        self.assertContains(response, 'Detail Party')
+        self.assertEqual(response.context['election'], self.election)
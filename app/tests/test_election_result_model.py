@@ -0,0 +1,71 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+from app.models import Election, Candidate, ElectionResult
+from app.tally import materialize_results
+
+
+class ElectionResultModelTest(TestCase):
+    """Test cases for materialized election results"""
+
+    def setUp(self):
+        """Set up a closed election with decrypted totals for three candidates"""
+        self.election = Election.objects.create(
+            name='Closed Election',
+            description='An election that has been tallied',
+            start_date=timezone.now() - timedelta(days=7),
+            end_date=timezone.now() - timedelta(days=1),
+            closed_at=timezone.now(),
+            decrypted_total='[1, 3, 1]'
+        )
+        self.candidates = []
+        for i in range(3):
+            user = User.objects.create_user(username=f'candidate{i}', password='testpass123')
+            self.candidates.append(Candidate.objects.create(user=user, election=self.election))
+
+    def test_materialize_results_ranks_candidates(self):
+        """Test that results are ranked by votes with ties sharing a rank"""
+        materialize_results(self.election)
+
+        results = list(ElectionResult.objects.filter(election=self.election))
+        self.assertEqual([r.candidate for r in results], [self.candidates[1], self.candidates[0], self.candidates[2]])
+        self.assertEqual([r.votes for r in results], [3, 1, 1])
+        self.assertEqual([r.rank for r in results], [1, 2, 2])
+        self.assertEqual(results[0].percentage, Decimal('60.0'))
+
+    def test_materialize_results_replaces_existing_rows(self):
+        """Test that materializing twice does not duplicate rows"""
+        materialize_results(self.election)
+        materialize_results(self.election)
+        self.assertEqual(ElectionResult.objects.filter(election=self.election).count(), 3)
+
+    def test_get_results_reads_materialized_rows(self):
+        """Test that results are read in a single query once materialized"""
+        materialize_results(self.election)
+
+        with self.assertNumQueries(1):
+            results = self.election.get_results()
+
+        self.assertEqual(results['total_votes'], 5)
+        self.assertEqual(results['candidates_count'], 3)
+        self.assertEqual(results['results'][0]['candidate'], self.candidates[1])
+        self.assertEqual(results['results'][0]['party'], 'Independent')
+
+    def test_get_results_materializes_legacy_elections(self):
+        """Test that elections tallied before materialization get their rows on first read"""
+        results = self.election.get_results()
+        self.assertEqual(results['total_votes'], 5)
+        self.assertEqual(ElectionResult.objects.filter(election=self.election).count(), 3)
+
+    def test_get_results_without_tally(self):
+        """Test that elections without a tally have no results"""
+        self.election.decrypted_total = ''
+        self.assertIsNone(self.election.get_results())
+
+    def test_get_results_hidden_until_closed(self):
+        """Test that results are not shown for open elections"""
+        self.election.closed_at = None
+        self.election.active = True
+        self.assertIsNone(self.election.get_results())
@@ -0,0 +1,80 @@
+from io import StringIO
+from unittest import mock
+from django.db import DatabaseError
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from datetime import timedelta
+from app.management.commands.run_election_scheduler import Command
+from app.models import Election, Candidate, Vote, ElectionResult
+from app.tests.test_base import TestDataMixin
+
+
+class ElectionSchedulerTest(TestDataMixin, TestCase):
+    """Test cases for the run_election_scheduler management command"""
+
+    def run_scheduler(self):
+        """Run a single scheduler pass"""
+        call_command('run_election_scheduler', '--once', stdout=StringIO())
+
+    def create_election(self, start_offset, end_offset, **kwargs):
+        """Create an election relative to now"""
+        return Election.objects.create(
+            name='Scheduled Election',
+            description='An election driven by the scheduler',
+            start_date=timezone.now() + start_offset,
+            end_date=timezone.now() + end_offset,
+            **kwargs
+        )
+
+    def test_opens_elections_whose_start_date_passed(self):
+        """Test that inactive elections are opened once voting starts"""
+        election = self.create_election(timedelta(minutes=-1), timedelta(days=1))
+        self.run_scheduler()
+
+        election.refresh_from_db()
+        self.assertTrue(election.active)
+        self.assertIsNotNone(election.started_at)
+        self.assertEqual(election.get_status(), 'open')
+
+    def test_leaves_future_elections_alone(self):
+        """Test that elections which have not started are not opened"""
+        election = self.create_election(timedelta(days=1), timedelta(days=2))
+        self.run_scheduler()
+
+        election.refresh_from_db()
+        self.assertFalse(election.active)
+        self.assertIsNone(election.started_at)
+
+    def test_closes_and_tallies_expired_elections(self):
+        """Test that expired elections are closed and their results materialized"""
+        public_key, private_key = self.get_real_election_keys()
+        election = self.create_election(
+            timedelta(days=-1), timedelta(days=1),
+            active=True, public_key=public_key, private_key=private_key
+        )
+        candidate = Candidate.objects.create(
+            user=User.objects.create_user(username='candidate', password='testpass123'),
+            election=election
+        )
+        vote = Vote(user=User.objects.create_user(username='voter', password='testpass123'), election=election)
+        vote._candidate = candidate
+        vote.save()
+
+        Election.objects.filter(pk=election.pk).update(end_date=timezone.now() - timedelta(seconds=1))
+        self.run_scheduler()
+
+        election.refresh_from_db()
+        self.assertFalse(election.active)
+        self.assertIsNotNone(election.closed_at)
+        self.assertEqual(election.decrypted_total, '[1]')
+        self.assertTrue(election.verified)
+        self.assertEqual(ElectionResult.objects.get(election=election).votes, 1)
+
+    def test_failed_pass_does_not_stop_the_scheduler(self):
+        """Test that an error in one pass is logged and the loop sleeps until the next one"""
+        command = Command(stdout=StringIO())
+        with mock.patch.object(Command, 'run_pending', side_effect=DatabaseError('connection lost')), \
+                self.assertLogs('app.management.commands.run_election_scheduler', level='ERROR'):
+            self.assertEqual(command.run_pass(30.0), 30.0)
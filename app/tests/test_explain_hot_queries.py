@@ -0,0 +1,18 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class ExplainHotQueriesCommandTest(TestCase):
+    """Test cases for the explain_hot_queries management command"""
+
+    def test_prints_plan_for_each_hot_query(self):
+        """Test that plans are printed even when there is no data yet"""
+        out = StringIO()
+        call_command('explain_hot_queries', stdout=out)
+        output = out.getvalue()
+
+        self.assertIn('Election list: one page', output)
+        self.assertIn('app_invite_pending_idx', output)
+        self.assertIn('app_election_creator_idx', output)
+        self.assertIn('app_eligiblevoter_election_id_user_id', output.split('Vote: voter roll')[1])
@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from app.cache import clear_caches
+from app.models import Election, Candidate, Party
+
+
+@override_settings(PAGE_CACHE_SECONDS=0)
+class FragmentCacheTest(TestCase):
+    """Test cases for cached election cards and candidate lists"""
+
+    def setUp(self):
+        """Set up an ongoing public election with one candidate"""
+        clear_caches()
+        self.election = Election.objects.create(
+            name='Fragment Election',
+            description='An election whose cards are cached',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            active=True,
+            is_public=True
+        )
+        self.party = Party.objects.create(name='Old Party')
+        self.user = User.objects.create_user(username='candidate', first_name='Ayesha', last_name='Khan')
+        self.candidate = Candidate.objects.create(user=self.user, election=self.election, party=self.party)
+
+    def test_cards_are_reused_until_a_model_changes(self):
+        """Test that cards stay cached through silent updates and refresh on model saves"""
+        for url in (reverse('election_list'), reverse('election_detail', args=[self.election.uuid])):
+            self.client.get(url)
+            Party.objects.filter(pk=self.party.pk).update(name='Silent Party')  # No signal, no new version
+            self.assertContains(self.client.get(url), 'Old Party')
+
+            self.party.name = 'New Party'
+            self.party.save()
+            self.assertContains(self.client.get(url), 'New Party')
+
+            self.party.name = 'Old Party'
+            self.party.save()
+
+    def test_candidate_changes_refresh_the_card(self):
+        """Test that adding a candidate or renaming a user renders the card again"""
+        url = reverse('election_list')
+        self.client.get(url)
+
+        Candidate.objects.create(
+            user=User.objects.create_user(username='newcomer', first_name='Bilal', last_name='Ahmed'),
+            election=self.election
+        )
+        self.assertContains(self.client.get(url), 'Bilal Ahmed')
+
+        self.user.first_name = 'Sana'
+        self.user.save()
+        self.assertContains(self.client.get(url), 'Sana Khan')
+
+    def test_status_is_not_cached(self):
+        """Test that the status badge follows the dates while the card body is cached"""
+        url = reverse('election_list')
+        self.assertContains(self.client.get(url), 'left')
+
+        Election.objects.filter(pk=self.election.pk).update(
+            start_date=timezone.now() + timedelta(days=1), end_date=timezone.now() + timedelta(days=2)
+        )
+        self.assertContains(self.client.get(url), 'Starts in')
@@ -0,0 +1,111 @@
+import asyncio
+import uuid
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from app.cache import clear_caches
+from app.live import Broadcaster, format_event, read_live_state
+from app.models import Election, Vote
+
+
+class BroadcasterTest(SimpleTestCase):
+    """Test cases for fanning out live election state within a process"""
+
+    def setUp(self):
+        """Serve election state from a dict instead of the database"""
+        self.election = Election(uuid=uuid.uuid4(), name='Live Election')
+        self.state = {'status': 'open', 'turnout': 3}
+        patcher = mock.patch(
+            'app.live.read_live_state',
+            side_effect=lambda elections: {election.uuid: dict(self.state) for election in elections},
+        )
+        self.read_live_state = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(LIVE_POLL_SECONDS=0.01)
+    async def test_stream_pushes_changes_until_closed(self):
+        """Test that a subscriber gets a snapshot, then turnout deltas and the closing status"""
+        broadcaster = Broadcaster()
+        stream = broadcaster.stream(self.election)
+
+        self.assertEqual(await anext(stream), format_event('snapshot', {'status': 'open', 'turnout': 3}))
+        self.state['turnout'] = 5
+        self.assertEqual(await asyncio.wait_for(anext(stream), 1), format_event('turnout', {'total': 5, 'delta': 2}))
+        self.state['status'] = 'closed'
+        self.assertEqual(await asyncio.wait_for(anext(stream), 1), format_event('status', {'status': 'closed'}))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertEqual(broadcaster._queues, {})
+
+    @override_settings(LIVE_POLL_SECONDS=0.01)
+    async def test_stream_ends_when_voting_period_ends(self):
+        """Test that an election expiring before it is closed ends the stream"""
+        broadcaster = Broadcaster()
+        stream = broadcaster.stream(self.election)
+
+        await anext(stream)
+        self.state['status'] = 'expired'
+        self.assertEqual(await asyncio.wait_for(anext(stream), 1), format_event('status', {'status': 'expired'}))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+
+    async def test_one_read_per_tick_for_all_subscribers(self):
+        """Test that subscribers share each read of the election state"""
+        broadcaster = Broadcaster()
+        queues = [broadcaster.subscribe(self.election) for _ in range(50)]
+        broadcaster._task.cancel()  # Drive the ticks by hand
+
+        await broadcaster.tick()
+        self.state['turnout'] = 4
+        await broadcaster.tick()
+
+        self.assertEqual(self.read_live_state.call_count, 2)
+        for queue in queues:
+            self.assertEqual(queue.get_nowait(), ('turnout', {'total': 4, 'delta': 1}))
+
+
+class ElectionEventsViewTest(TestCase):
+    """Test cases for the Server-Sent Events endpoint"""
+
+    def setUp(self):
+        """Set up an open election with one vote"""
+        clear_caches()
+        self.election = Election.objects.create(
+            name='Live Election',
+            description='An election streamed to subscribers',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            active=True
+        )
+        Vote.objects.create(user=User.objects.create_user(username='voter'), election=self.election,
+                            ballot='[1, 0]', hashed='hash')
+        self.url = reverse('election_events', args=[self.election.uuid])
+
+    def test_sync_worker_sends_snapshot_and_retry(self):
+        """Test that a WSGI request gets the current state and a reconnect delay"""
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body, 'retry: 5000\n\n' + format_event('snapshot', {'status': 'open', 'turnout': 1}))
+
+    def test_closed_and_unknown_elections(self):
+        """Test that closed or expired elections end the stream and unknown ones are not found"""
+        Election.objects.filter(pk=self.election.pk).update(end_date=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(self.client.get(self.url).status_code, 204)  # Expired, the scheduler hasn't closed it yet
+
+        self.election.close_election()
+        self.election.save()
+        self.assertEqual(self.client.get(self.url).status_code, 204)
+        self.assertEqual(self.client.get(reverse('election_events', args=[uuid.uuid4()])).status_code, 404)
+
+    def test_saving_an_election_refreshes_its_status(self):
+        """Test that a cached status is dropped when the election is saved"""
+        self.assertEqual(read_live_state([self.election])[self.election.uuid]['status'], 'open')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.election.close_election()
+            self.election.save()
+        self.assertEqual(read_live_state([self.election])[self.election.uuid]['status'], 'closed')
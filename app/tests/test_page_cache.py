@@ -0,0 +1,111 @@
+import time
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from app.cache import clear_caches
+from app.models import Election
+from app.page_cache import _cache_key, anonymous_cache
+
+
+@override_settings(PAGE_CACHE_SECONDS=5, PAGE_CACHE_STATIC_SECONDS=3600)
+class AnonymousPageCacheTest(TestCase):
+    """Test cases for micro-caching pages of anonymous visitors"""
+
+    def setUp(self):
+        """Set up an ongoing election and an empty cache"""
+        clear_caches()
+        Election.objects.create(
+            name='Cached Election',
+            description='An election on the homepage',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            active=True,
+            is_public=True
+        )
+        self.url = reverse('index')
+
+    def cache_key(self):
+        """The page cache key of the homepage"""
+        return _cache_key(self.client.get(self.url).wsgi_request)
+
+    def test_repeat_visit_is_served_from_cache(self):
+        """Test that the second anonymous visit runs no queries and sets no cookies"""
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Page-Cache'], 'miss')
+
+        self.client.cookies.clear()
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.cookies, {})
+
+    def test_urls_are_cached_separately(self):
+        """Test that query strings get their own entries"""
+        self.client.get(reverse('election_list'))
+        response = self.client.get(reverse('election_list'), {'status': 'closed'})
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+
+    def test_signed_in_users_and_messages_bypass_the_cache(self):
+        """Test that personal pages are neither cached nor served from the cache"""
+        self.client.get(self.url)
+
+        self.client.post(reverse('contact'))  # Leaves a "thank you" message
+        self.assertNotIn('X-Page-Cache', self.client.get(self.url))
+
+        self.client.force_login(User.objects.create_user(username='voter'))
+        self.assertNotIn('X-Page-Cache', self.client.get(self.url))
+
+    def test_expired_page_is_rendered_once(self):
+        """Test that while one request re-renders an expired page, others get the stale copy"""
+        self.client.get(self.url)
+        key = self.cache_key()
+        expires, entry = caches['pages'].get(key)
+        caches['pages'].set(key, (time.time() - 1, entry), 60)
+
+        caches['pages'].add(f'{key}:lock', 1)  # Another worker is rendering
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'stale')
+
+        caches['pages'].delete(f'{key}:lock')
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'miss')
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'hit')
+
+    def test_static_pages_are_kept_longer(self):
+        """Test that legal pages get the long static lifetime"""
+        response = self.client.get(reverse('terms'))
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        expires, _ = caches['pages'].get(_cache_key(response.wsgi_request))
+        self.assertGreater(expires - time.time(), 3000)
+
+    def test_cached_pages_hold_no_csrf_token(self):
+        """Test that cached pages carry no token of the visitor who rendered them"""
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertNotIn(b'X-CSRFToken', response.content)
+        self.assertNotIn('csrftoken', response.cookies)
+
+    def test_pages_using_a_csrf_token_are_not_cached(self):
+        """Test that a page rendering a CSRF token is left out of the cache"""
+        view = anonymous_cache()(lambda request: HttpResponse(get_token(request)))
+        request = RequestFactory().get('/form/')
+        request.user = AnonymousUser()
+
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertIsNone(caches['pages'].get(_cache_key(request)))
+
+    def test_repeat_visit_is_answered_with_304(self):
+        """Test that cache hits honour If-None-Match"""
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': '"other"'}).status_code, 200)
@@ -0,0 +1,157 @@
+import json
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from app.cache import clear_caches
+from app.models import Election, Candidate, Vote
+from app.published_results import get_published_results, publish_results
+from app.tally import finalize_election
+from app.tests.test_base import TEST_FILES_ROOT, TestDataMixin
+
+
+@override_settings(PUBLISHED_RESULTS_ROOT=TEST_FILES_ROOT / 'results', PUBLISHED_RESULTS_URL='/media/results/')
+class PublishedResultsTest(TestDataMixin, TestCase):
+    """Test cases for the static results files published when an election closes"""
+
+    def setUp(self):
+        """Set up a public election with real keys and a few encrypted votes"""
+        clear_caches()
+        self.root = TEST_FILES_ROOT / 'results'
+        self.create_keyed_election('Published Election', votes=[0, 1, 1], is_public=True)
+
+    def close_and_publish(self):
+        """Close and finalize the election, returning its published results"""
+        self.close_and_finalize()
+        return get_published_results(self.election.uuid)
+
+    def test_finalizing_publishes_hashed_files(self):
+        """Test that closing an election writes its page, results and verification under content hashes"""
+        published = self.close_and_publish()
+        self.assertIsNotNone(published)
+
+        prefix = f'/media/results/{self.election.uuid}/'
+        for kind in ('page', 'results', 'verification'):
+            self.assertTrue(published[kind].startswith(prefix + kind + '.'))
+            self.assertTrue((self.root / str(self.election.uuid) / published[kind][len(prefix):]).is_file())
+
+        page = (self.root / str(self.election.uuid) / published['page'][len(prefix):]).read_text()
+        self.assertNotIn('csrfmiddlewaretoken', page)
+        self.assertNotIn('X-CSRFToken', page)
+
+        document = json.loads((self.root / str(self.election.uuid) / published['results'][len(prefix):]).read_text())
+        self.assertEqual(document['total_votes'], 3)
+        self.assertEqual(document['results'][0]['candidate'], str(self.candidates[1].uuid))
+        self.assertEqual(document['results'][0]['votes'], 2)
+        self.assertTrue(document['verified'])
+
+    def test_admin_end_action_closes_and_publishes(self):
+        """Test that ending an election from the admin closes it like the site does"""
+        admin_user = User.objects.create_superuser(username='admin', password='adminpass123')
+        self.client.force_login(admin_user)
+        self.client.post(reverse('admin:app_election_changelist'), {
+            'action': 'end_election',
+            '_selected_action': [self.election.pk],
+        })
+
+        self.election.refresh_from_db()
+        self.assertFalse(self.election.active)
+        self.assertIsNotNone(self.election.closed_at)
+        self.assertTrue(self.election.verified)
+        self.assertIsNotNone(get_published_results(self.election.uuid))
+
+    def test_open_and_private_elections_are_not_published(self):
+        """Test that only the final results of public elections become static files"""
+        self.assertIsNone(publish_results(self.election))
+
+        self.election.is_public = False
+        self.close_and_finalize()
+        self.assertIsNone(get_published_results(self.election.uuid))
+
+    def test_views_redirect_to_published_files(self):
+        """Test that results views send visitors to the static files without querying the database"""
+        published = self.close_and_publish()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('election_detail', args=[self.election.uuid]))
+        self.assertRedirects(response, published['page'], fetch_redirect_response=False)
+        response = self.client.get(reverse('election_results', args=[self.election.uuid]))
+        self.assertRedirects(response, published['results'], fetch_redirect_response=False)
+        response = self.client.get(reverse('verify_results', args=[self.election.uuid]))
+        self.assertRedirects(response, published['verification'], fetch_redirect_response=False)
+
+        # Signed-in visitors still get the dynamic page with their own controls
+        self.client.force_login(self.candidates[0].user)
+        self.assertEqual(self.client.get(reverse('election_detail', args=[self.election.uuid])).status_code, 200)
+
+    def test_published_files_are_cached_forever(self):
+        """Test that WhiteNoise serves files published after startup with immutable caching"""
+        self.client.get('/')  # Start the middleware before anything is published
+        published = self.close_and_publish()
+
+        response = self.client.get(published['page'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn(b'Published Election', b''.join(response.streaming_content))
+
+        manifest = f'/media/results/{self.election.uuid}/published.json'
+        self.assertEqual(self.client.get(manifest).status_code, 404)
+
+    def test_private_or_deleted_elections_are_unpublished(self):
+        """Test that results stop being served once an election is made private or deleted"""
+        self.client.get('/')  # Start the middleware before anything is published
+        published = self.close_and_publish()
+        self.assertEqual(self.client.get(published['page']).status_code, 200)
+
+        self.election.is_public = False
+        self.election.save()
+        self.assertIsNone(get_published_results(self.election.uuid))
+        self.assertEqual(self.client.get(published['page']).status_code, 404)
+        response = self.client.get(reverse('election_results', args=[self.election.uuid]))
+        self.assertEqual(response.status_code, 200)  # Built on request, not redirected
+
+        self.election.is_public = True
+        published = self.close_and_publish()
+        Vote.objects.filter(election=self.election).delete()
+        Candidate.objects.filter(election=self.election).delete()
+        self.election.delete()
+        self.assertIsNone(get_published_results(self.election.uuid))
+        self.assertFalse((self.root / str(self.election.uuid)).exists())
+
+    def test_unpublished_results_are_built_on_request(self):
+        """Test that the JSON view answers until results are published, and 404s before they exist"""
+        url = reverse('election_results', args=[self.election.uuid])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.election.is_public = False
+        self.close_and_finalize()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_votes'], 3)
+
+    def test_publish_results_command(self):
+        """Test that the command publishes closed elections that weren't published yet"""
+        self.election.close_election()
+        self.election.save()
+        self.assertIsNone(get_published_results(self.election.uuid))
+
+        Election.objects.filter(pk=self.election.pk).update(is_public=False)
+        finalize_election(Election.objects.get(pk=self.election.pk))
+        Election.objects.filter(pk=self.election.pk).update(is_public=True)
+
+        out = StringIO()
+        call_command('publish_results', stdout=out)
+        self.assertIn('Published "Published Election"', out.getvalue())
+        self.assertIsNotNone(get_published_results(self.election.uuid))
+
+    def test_republish_renders_published_elections_again(self):
+        """Test that --republish refreshes elections the plain command skips"""
+        self.close_and_finalize()
+
+        out = StringIO()
+        call_command('publish_results', stdout=out)
+        self.assertNotIn('Published Election', out.getvalue())
+
+        call_command('publish_results', '--republish', stdout=out)
+        self.assertIn('Published "Published Election"', out.getvalue())
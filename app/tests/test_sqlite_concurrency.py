@@ -0,0 +1,127 @@
+import importlib
+import os
+import runpy
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import SimpleTestCase
+from django.utils import timezone
+from datetime import timedelta
+from app.models import Election, Candidate, Vote
+from app.tests.test_base import TestDataMixin
+
+ALIAS = 'sqlite_concurrency'
+
+
+@unittest.skipUnless(settings.DATABASES[DEFAULT_DB_ALIAS]['ENGINE'] == 'django.db.backends.sqlite3',
+                     'SQLite profile only')
+class SQLiteConcurrencyTest(SimpleTestCase):
+    """Stress test parallel vote writers against a file-backed SQLite database"""
+
+    WRITERS = 8
+    VOTES_PER_WRITER = 5
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a migrated file database using the configured SQLite profile"""
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        database = cls.get_database_settings(str(Path(cls.tmpdir.name) / 'votes.sqlite3'))
+        connections.settings[ALIAS] = connections.configure_settings(
+            {DEFAULT_DB_ALIAS: settings.DATABASES[DEFAULT_DB_ALIAS], ALIAS: database}
+        )[ALIAS]
+        cls.databases = {ALIAS}  # Declared once the alias exists, after the runner has set up its databases
+        super().setUpClass()
+        for app_label in ('auth', 'app'):
+            call_command('migrate', app_label, database=ALIAS, verbosity=0)
+
+        public_key, private_key = TestDataMixin.get_real_election_keys()
+        now = timezone.now()
+        cls.election = Election.objects.using(ALIAS).create(
+            name='Busy Election', description='Many parallel voters', active=True,
+            start_date=now - timedelta(days=1), end_date=now + timedelta(days=1),
+            public_key=public_key, private_key=private_key, is_public=True
+        )
+        candidate_users = User.objects.using(ALIAS).bulk_create(
+            [User(username=f'candidate{i}') for i in range(2)]
+        )
+        Candidate.objects.using(ALIAS).bulk_create(
+            [Candidate(user=user, election=cls.election) for user in candidate_users]
+        )
+        cls.voters = User.objects.using(ALIAS).bulk_create(
+            [User(username=f'voter{i}') for i in range(cls.WRITERS * cls.VOTES_PER_WRITER)]
+        )
+
+    @classmethod
+    def get_database_settings(cls, name):
+        """Settings of the test database: the configured default database, stored in name"""
+        return dict(settings.DATABASES[DEFAULT_DB_ALIAS], NAME=name)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the temporary database"""
+        super().tearDownClass()
+        connections[ALIAS].close()
+        del connections[ALIAS]
+        del connections.settings[ALIAS]
+        cls.tmpdir.cleanup()
+
+    def cast_votes(self, voters, errors):
+        """Cast one vote per voter in its own transaction, as VoteView does"""
+        try:
+            election = Election.objects.using(ALIAS).get(pk=self.election.pk)
+            candidates = list(election.candidates.order_by('id'))
+            for i, voter in enumerate(voters):
+                vote = Vote(user=voter, election=election)
+                vote._candidate = candidates[i % len(candidates)]
+                with transaction.atomic(using=ALIAS):
+                    vote.save(using=ALIAS)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connections[ALIAS].close()
+
+    def test_wal_profile_is_applied(self):
+        """Test that connections use WAL journaling and immediate transactions"""
+        with connections[ALIAS].cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+        self.assertEqual(connections[ALIAS].transaction_mode, 'IMMEDIATE')
+
+    def test_parallel_writers_lose_no_votes(self):
+        """Test that every vote from parallel writers is recorded without lock errors"""
+        errors = []
+        threads = [
+            threading.Thread(
+                target=self.cast_votes,
+                args=(self.voters[i::self.WRITERS], errors)
+            )
+            for i in range(self.WRITERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Vote.objects.using(ALIAS).filter(election=self.election).count(), len(self.voters))
+
+
+class SQLiteDatabaseUrlConcurrencyTest(SQLiteConcurrencyTest):
+    """Run the same tests with the database configured from a sqlite:// DATABASE_URL, as deployed"""
+
+    @classmethod
+    def get_database_settings(cls, name):
+        """Settings of the test database as the settings module builds them from DATABASE_URL"""
+        settings_file = importlib.import_module(settings.SETTINGS_MODULE).__file__
+        with mock.patch.dict(os.environ, DATABASE_URL=f'sqlite:///{name}'):
+            database = runpy.run_path(settings_file)['DATABASES'][DEFAULT_DB_ALIAS]
+        assert database['NAME'] == name
+        return database
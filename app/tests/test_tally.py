@@ -0,0 +1,54 @@
+from django.test import TestCase
+from app.encryption import Ciphertext
+from app.tally import get_election_encryption, parse_ballot, sum_ballots, tally_election
+from app.tests.test_base import TestDataMixin
+import json
+
+
+class TallyTest(TestDataMixin, TestCase):
+    """Test cases for homomorphic tallying of ballots"""
+
+    def setUp(self):
+        """Set up an election with real Paillier keys and three candidates"""
+        self.create_keyed_election('Tally Election', candidates=3)
+
+    def test_parse_ballot(self):
+        """Test that stored ballots are parsed into integer components"""
+        self.assertEqual(parse_ballot('[12345, 67890]'), [12345, 67890])
+        self.assertIsNone(parse_ballot('3:abcdef'))
+        self.assertIsNone(parse_ballot(''))
+
+    def test_sum_ballots_without_votes(self):
+        """Test that an election without ballots has no tally"""
+        encryption = get_election_encryption(self.election)
+        self.assertIsNone(sum_ballots(self.election, encryption))
+        self.assertFalse(tally_election(self.election))
+
+    def test_sum_ballots_decrypts_to_vote_counts(self):
+        """Test that summed ballots decrypt to the per-candidate vote counts"""
+        self.cast_vote('voter1', self.candidates[0])
+        self.cast_vote('voter2', self.candidates[2])
+        self.cast_vote('voter3', self.candidates[2])
+
+        encryption = get_election_encryption(self.election, with_private_key=True)
+        totals = sum_ballots(self.election, encryption)
+
+        self.assertEqual(len(totals), 3)
+        self.assertEqual([encryption.decrypt(Ciphertext(total)) for total in totals], [1, 0, 2])
+
+    def test_tally_election_sets_zero_sum_proof(self):
+        """Test that tallying stores totals whose zero-sum proof checks out"""
+        self.cast_vote('voter1', self.candidates[1])
+        self.cast_vote('voter2', self.candidates[1])
+
+        self.assertTrue(tally_election(self.election))
+        self.election.save()
+        self.election.refresh_from_db()
+
+        self.assertEqual(json.loads(self.election.decrypted_total), [0, 2, 0])
+
+        encryption = get_election_encryption(self.election)
+        zero_sum = [Ciphertext.from_json(ct) for ct in json.loads(self.election.encrypted_zero_sum)]
+        zero_randomness = json.loads(self.election.zero_randomness)
+        for ct, randomness in zip(zero_sum, zero_randomness):
+            self.assertEqual(encryption.encrypt(0, randomness).ciphertext, ct.ciphertext)
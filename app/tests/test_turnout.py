@@ -0,0 +1,193 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import datetime, timedelta, timezone as dt_timezone
+from app.cache import clear_caches
+from app.models import Election, TurnoutBucket, TurnoutCounter, Vote
+from app.tally import finalize_election
+from app.turnout import count_turnout, get_turnout, rebuild_turnout_buckets, reconcile_turnout
+
+
+@override_settings(TURNOUT_COUNTER_SHARDS=4)
+class TurnoutCounterTest(TestCase):
+    """Test cases for the sharded turnout counters"""
+
+    def setUp(self):
+        """Set up an open election and an empty cache"""
+        clear_caches()
+        self.election = Election.objects.create(
+            name='Turnout Election',
+            description='An election with a turnout counter',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            active=True
+        )
+
+    def cast_votes(self, count, start=0):
+        """Cast plain votes through Vote.save"""
+        for i in range(start, start + count):
+            Vote.objects.create(
+                user=User.objects.create_user(username=f'voter{i}'), election=self.election,
+                ballot='[1, 0]', hashed=f'hash{i}'
+            )
+
+    def test_votes_increment_shards(self):
+        """Test that every vote is counted on one of the election's shards"""
+        self.cast_votes(20)
+
+        shards = TurnoutCounter.objects.filter(election=self.election)
+        self.assertLessEqual(shards.count(), 4)
+        self.assertTrue(all(0 <= shard < 4 for shard in shards.values_list('shard', flat=True)))
+        self.assertEqual(count_turnout(self.election), 20)
+        self.assertEqual(self.election.get_total_votes(), 20)
+
+    def test_updating_a_vote_does_not_count_it_again(self):
+        """Test that only inserts increment the counter"""
+        self.cast_votes(1)
+        vote = Vote.objects.get(election=self.election)
+        vote.hashed = 'rehashed'
+        vote.save()
+        self.assertEqual(count_turnout(self.election), 1)
+
+    def test_turnout_is_cached(self):
+        """Test that reads within the cache timeout don't query the shards again"""
+        self.cast_votes(2)
+        self.assertEqual(get_turnout(self.election), 2)
+        self.cast_votes(1, start=2)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_turnout(self.election), 2)
+
+    def test_reconcile_resets_drifted_counter(self):
+        """Test that reconciling counts votes written around Vote.save"""
+        self.cast_votes(3)
+        Vote.objects.filter(user__username='voter0').delete()
+        Vote.objects.bulk_create([
+            Vote(user=User.objects.create_user(username=f'bulk{i}'), election=self.election, ballot='[0, 1]')
+            for i in range(2)
+        ])
+        self.assertEqual(get_turnout(self.election), 3)
+
+        self.assertEqual(reconcile_turnout(self.election), (3, 4))
+        self.assertEqual(get_turnout(self.election), 4)
+        self.assertEqual(reconcile_turnout(self.election), (4, 4))
+
+    def test_finalizing_reconciles_turnout(self):
+        """Test that however an election is closed, its final turnout is recounted"""
+        self.cast_votes(2)
+        TurnoutCounter.objects.filter(election=self.election).update(count=0)
+
+        self.election.close_election()
+        finalize_election(self.election)
+        self.assertEqual(get_turnout(self.election), 2)
+
+    def test_reconcile_turnout_command(self):
+        """Test that the command reports and fixes drifted counters of open elections"""
+        self.cast_votes(2)
+        TurnoutCounter.objects.filter(election=self.election).update(count=0)
+
+        out = StringIO()
+        call_command('reconcile_turnout', stdout=out)
+        self.assertIn('counter said 0, reset to 2 votes', out.getvalue())
+        self.assertEqual(count_turnout(self.election), 2)
+
+
+class TurnoutSeriesTest(TestCase):
+    """Test cases for the per-minute, hourly and daily turnout buckets"""
+
+    def setUp(self):
+        """Set up an open election and an empty cache"""
+        clear_caches()
+        self.election = Election.objects.create(
+            name='Series Election',
+            description='An election with a turnout chart',
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+            active=True
+        )
+        self.url = reverse('election_turnout', args=[self.election.uuid])
+
+    def cast_vote_at(self, username, moment):
+        """Cast a committed vote and move it, with its buckets, to the given time"""
+        with self.captureOnCommitCallbacks(execute=True):
+            vote = Vote.objects.create(
+                user=User.objects.create_user(username=username), election=self.election,
+                ballot='[1, 0]', hashed=username
+            )
+        Vote.objects.filter(pk=vote.pk).update(created=moment)
+        return vote
+
+    def buckets(self, resolution):
+        """Counts of the election's buckets at one resolution"""
+        return dict(
+            TurnoutBucket.objects.filter(election=self.election, resolution=resolution)
+            .values_list('start', 'count')
+        )
+
+    def test_committed_votes_fill_buckets(self):
+        """Test that each committed vote lands in its minute, hour and day buckets"""
+        for i in range(3):
+            self.cast_vote_at(f'voter{i}', timezone.now())
+
+        for resolution in ('minute', 'hour', 'day'):
+            self.assertEqual(sum(self.buckets(resolution).values()), 3)
+        self.assertTrue(all(start.second == 0 for start in self.buckets('minute')))
+
+    def test_rebuild_downsamples_votes(self):
+        """Test that rebuilding groups votes by minute and sums hours and days from them"""
+        times = [
+            datetime(2026, 3, 1, 9, 15, 10, tzinfo=dt_timezone.utc),
+            datetime(2026, 3, 1, 9, 15, 50, tzinfo=dt_timezone.utc),
+            datetime(2026, 3, 1, 9, 40, tzinfo=dt_timezone.utc),
+            datetime(2026, 3, 2, 14, 5, tzinfo=dt_timezone.utc),
+        ]
+        for i, moment in enumerate(times):
+            self.cast_vote_at(f'voter{i}', moment)
+
+        self.assertEqual(rebuild_turnout_buckets(self.election), {'minute': 3, 'hour': 2, 'day': 2})
+        self.assertEqual(self.buckets('minute')[datetime(2026, 3, 1, 9, 15, tzinfo=dt_timezone.utc)], 2)
+        self.assertEqual(self.buckets('hour')[datetime(2026, 3, 1, 9, tzinfo=dt_timezone.utc)], 3)
+        self.assertEqual(self.buckets('day'), {
+            datetime(2026, 3, 1, tzinfo=dt_timezone.utc): 3,
+            datetime(2026, 3, 2, tzinfo=dt_timezone.utc): 1,
+        })
+
+    def test_series_endpoint(self):
+        """Test that a window is served as zero-filled buckets in a fixed number of queries"""
+        self.cast_vote_at('voter0', datetime(2026, 3, 1, 9, 15, tzinfo=dt_timezone.utc))
+        self.cast_vote_at('voter1', datetime(2026, 3, 1, 11, 30, tzinfo=dt_timezone.utc))
+        rebuild_turnout_buckets(self.election)
+
+        with self.assertNumQueries(3):  # Election, buckets, turnout shards
+            response = self.client.get(self.url, {
+                'resolution': 'hour', 'start': '2026-03-01T09:00:00Z', 'end': '2026-03-01T12:00:00Z',
+            })
+        data = response.json()
+        self.assertEqual(data['total'], 2)
+        self.assertEqual([bucket['votes'] for bucket in data['buckets']], [1, 0, 1])
+        self.assertEqual(data['buckets'][0]['start'], '2026-03-01T09:00:00+00:00')
+
+    def test_series_endpoint_rejects_bad_windows(self):
+        """Test that unknown resolutions and oversized windows are refused"""
+        self.assertEqual(self.client.get(self.url, {'resolution': 'second'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'start': 'yesterday'}).status_code, 400)
+        response = self.client.get(self.url, {
+            'resolution': 'minute', 'start': '2026-01-01T00:00:00Z', 'end': '2026-03-01T00:00:00Z',
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_htmx_poll(self):
+        """Test that htmx polls get the chart partial and are stopped once voting ends"""
+        self.cast_vote_at('voter0', timezone.now())
+        response = self.client.get(self.url, HTTP_HX_REQUEST='true')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Votes per hour')
+        self.assertIn('HX-Request', response['Vary'])
+
+        self.election.close_election()
+        self.election.save()
+        response = self.client.get(self.url, HTTP_HX_REQUEST='true')
+        self.assertEqual(response.status_code, 286)
+        self.assertContains(response, 'Total Votes', status_code=286)
@@ -0,0 +1,63 @@
+from django.test import TestCase
+from django.contrib.auth.models import User, Group
+
+
+class UserRoleCacheTest(TestCase):
+    """Test cases for the cached role helpers on User"""
+
+    def setUp(self):
+        """Create an official and the role groups"""
+        self.officials = Group.objects.create(name='Officials')
+        self.counters = Group.objects.create(name='Counters')
+        self.user = User.objects.create_user(username='official', password='testpass123')
+        self.user.groups.add(self.officials)
+
+    def test_role_helpers_share_one_query(self):
+        """Test that every role helper answers from a single group lookup"""
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.is_election_creator())
+            self.assertTrue(user.can_close_elections())
+            self.assertTrue(user.can_manage_candidates())
+            self.assertTrue(user.can_view_results())
+            self.assertEqual(user.get_role_display(), 'Election Official')
+
+    def test_group_names_cached_across_requests(self):
+        """Test that a fresh user instance reuses the cached group names"""
+        User.objects.get(pk=self.user.pk).get_group_names()
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.get_group_names(), frozenset({'Officials'}))
+
+    def test_membership_change_invalidates_cache(self):
+        """Test that adding or removing groups is reflected immediately"""
+        self.assertEqual(self.user.get_group_names(), frozenset({'Officials'}))
+
+        self.user.groups.add(self.counters)
+        self.assertEqual(self.user.get_group_names(), frozenset({'Officials', 'Counters'}))
+
+        self.officials.user_set.remove(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertFalse(user.can_close_elections())
+        self.assertEqual(user.get_all_roles(), ['Vote Counter'])
+
+    def test_other_users_signing_up_keep_the_cache(self):
+        """Test that adding other users to a group leaves this user's cached group names alone"""
+        User.objects.get(pk=self.user.pk).get_group_names()
+
+        citizens = Group.objects.create(name='Citizens')
+        User.objects.create_user(username='citizen', password='testpass123').groups.add(citizens)
+        citizens.user_set.add(User.objects.create_user(username='another', password='testpass123'))
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.get_group_names(), frozenset({'Officials'}))
+
+    def test_group_rename_invalidates_cache(self):
+        """Test that renaming a group is reflected for its members"""
+        self.assertEqual(self.user.get_group_names(), frozenset({'Officials'}))
+
+        self.officials.name = 'Managers'
+        self.officials.save()
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(user.get_group_names(), frozenset({'Managers'}))
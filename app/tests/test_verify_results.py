@@ -0,0 +1,82 @@
+from django.test import TestCase
+from django.contrib.auth.models import User, Group
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from app.models import Election, Candidate, Vote
+from app.tests.test_base import TestDataMixin
+
+
+class VerifyResultsViewTest(TestDataMixin, TestCase):
+    """Test cases for stored results verification"""
+
+    def setUp(self):
+        """Set up an open election with real keys, a candidate, a vote and an official"""
+        public_key, private_key = self.get_real_election_keys()
+        self.election = Election.objects.create(
+            name='Verified Election',
+            description='An election whose results are verified at close',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            public_key=public_key,
+            private_key=private_key,
+            active=True
+        )
+        candidate_user = User.objects.create_user(username='candidate', password='testpass123')
+        candidate = Candidate.objects.create(user=candidate_user, election=self.election)
+
+        voter = User.objects.create_user(username='voter', password='testpass123')
+        vote = Vote(user=voter, election=self.election)
+        vote._candidate = candidate
+        vote.save()
+
+        self.official = User.objects.create_user(username='official', password='testpass123')
+        self.official.groups.add(Group.objects.get_or_create(name='Officials')[0])
+        self.voter = voter
+
+    def close_election(self):
+        """Close the election through the view as an official"""
+        self.client.force_login(self.official)
+        self.client.post(reverse('close_election', kwargs={'uuid': self.election.uuid}))
+        self.client.logout()
+        self.election.refresh_from_db()
+
+    def test_closing_stores_verification(self):
+        """Test that closing an election tallies and verifies it once"""
+        self.close_election()
+
+        self.assertEqual(self.election.decrypted_total, '[1]')
+        self.assertTrue(self.election.verified)
+        self.assertIsNotNone(self.election.verified_at)
+        self.assertIn('"verified": true', self.election.verification_transcript)
+
+    def test_verify_results_sends_etag_and_not_modified(self):
+        """Test that the public verification page is served with a strong ETag"""
+        self.close_election()
+        url = reverse('verify_results', kwargs={'uuid': self.election.uuid})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Results verified successfully')
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_reverify_requires_official(self):
+        """Test that only officials can re-run verification"""
+        self.close_election()
+        verified_at = self.election.verified_at
+        url = reverse('reverify_results', kwargs={'uuid': self.election.uuid})
+
+        self.client.force_login(self.voter)
+        self.client.post(url)
+        self.election.refresh_from_db()
+        self.assertEqual(self.election.verified_at, verified_at)
+
+        self.client.force_login(self.official)
+        self.client.post(url)
+        self.election.refresh_from_db()
+        self.assertGreater(self.election.verified_at, verified_at)
+        self.assertTrue(self.election.verified)
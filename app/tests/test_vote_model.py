@@ -229,6 +229,24 @@ class VoteModelTest(TestCase):
         meta = Vote._meta
         self.assertIn(('user', 'election'), meta.unique_together)
 
+    def test_vote_uuid_unique_per_election(self):
+        """Test that vote uuids are unique within an election, as on the partitioned vote table"""
+        vote = Vote.objects.create(
+            user=self.voter1,
+            election=self.election,
+            ballot='[1, 0, 0]',
+            hashed='hash1'
+        )
+        
+        with self.assertRaises(IntegrityError):
+            Vote.objects.create(
+                uuid=vote.uuid,
+                user=self.voter2,
+                election=self.election,
+                ballot='[0, 1, 0]',
+                hashed='hash2'
+            )
+
     def test_vote_with_complex_ballot_data(self):
         """Test storing complex ballot data"""
         complex_ballot = {
@@ -0,0 +1,131 @@
+import unittest
+from io import StringIO
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.transaction import TransactionManagementError
+from django.test import TransactionTestCase
+from django.utils import timezone
+from datetime import timedelta
+from app.models import Election, Vote
+from app.partitions import (
+    create_vote_partition, detach_vote_partition, is_vote_table_partitioned, list_vote_partitions,
+    vote_partition_name
+)
+from app.tests.test_base import BaseTestCase
+
+
+class VotePartitionTest(BaseTestCase):
+    """Test cases that hold on every database backend"""
+
+    def test_partition_name(self):
+        """Test that partitions are named after the election id"""
+        self.assertEqual(vote_partition_name(self.test_election.pk), f'app_vote_e{self.test_election.pk}')
+
+    @unittest.skipIf(connection.vendor == 'postgresql', 'Non-partitioned backends only')
+    def test_helpers_are_noops_without_partitioning(self):
+        """Test that an unpartitioned vote table is left alone"""
+        self.assertFalse(is_vote_table_partitioned())
+        self.assertEqual(list_vote_partitions(), [])
+        self.assertFalse(detach_vote_partition(self.test_election.pk))
+        with self.assertRaises(CommandError):
+            call_command('retire_vote_partition', str(self.test_election.uuid), stdout=StringIO())
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+class PostgresVotePartitionTest(TransactionTestCase):
+    """
+    Test cases for per-election vote partitions on PostgreSQL.
+
+    Partitions are created once elections are committed and detached outside
+    transactions, so these tests commit for real.
+    """
+
+    def setUp(self):
+        """Set up a voter"""
+        self.voter = User.objects.create_user(username='voter', password='voterpass123')
+
+    def create_election(self, **kwargs):
+        """Create an election whose voting period has ended"""
+        return Election.objects.create(
+            name='Partitioned Election',
+            description='An election with its own vote partition',
+            start_date=timezone.now() - timedelta(days=7),
+            end_date=timezone.now() - timedelta(days=1),
+            **kwargs
+        )
+
+    def create_vote(self, election):
+        """Store a vote without encrypting a ballot"""
+        return Vote.objects.create(user=self.voter, election=election, ballot='[1]', hashed='test_hash')
+
+    def count_partition_rows(self, election):
+        """Count the rows stored in an election's (possibly detached) partition"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {vote_partition_name(election.pk)}')
+            return cursor.fetchone()[0]
+
+    def test_new_election_gets_its_own_partition(self):
+        """Test that votes of a new election land in that election's partition"""
+        election = self.create_election()
+        self.assertIn(vote_partition_name(election.pk), list_vote_partitions())
+
+        self.create_vote(election)
+        self.assertEqual(self.count_partition_rows(election), 1)
+
+    def test_partition_is_created_after_commit(self):
+        """Test that creating an election inside a transaction leaves the vote table alone until it commits"""
+        with transaction.atomic():
+            election = self.create_election()
+            self.assertNotIn(vote_partition_name(election.pk), list_vote_partitions())
+        self.assertIn(vote_partition_name(election.pk), list_vote_partitions())
+
+    def test_missing_partition_is_created_for_the_first_vote(self):
+        """Test that an election whose partition is missing still records votes"""
+        election = self.create_election()
+        detach_vote_partition(election.pk, drop=True)
+
+        self.create_vote(election)
+        self.assertIn(vote_partition_name(election.pk), list_vote_partitions())
+        self.assertEqual(self.count_partition_rows(election), 1)
+
+    def test_partition_is_not_created_inside_a_transaction(self):
+        """Test that the vote table isn't locked until a surrounding transaction ends"""
+        election = self.create_election()
+        detach_vote_partition(election.pk, drop=True)
+
+        with transaction.atomic(), self.assertRaises(TransactionManagementError):
+            create_vote_partition(election.pk)
+        self.assertNotIn(vote_partition_name(election.pk), list_vote_partitions())
+
+    def test_retire_detaches_closed_election(self):
+        """Test that retiring an election detaches its ballots from the vote table"""
+        election = self.create_election(closed_at=timezone.now())
+        self.create_vote(election)
+        self.addCleanup(self.drop_detached_partition, election)
+
+        call_command('retire_vote_partition', str(election.uuid), stdout=StringIO())
+
+        self.assertNotIn(vote_partition_name(election.pk), list_vote_partitions())
+        self.assertFalse(Vote.objects.filter(election=election).exists())
+        self.assertEqual(self.count_partition_rows(election), 1)
+
+    def test_detach_inside_transaction_with_pending_votes(self):
+        """Test that deferred foreign key checks of new votes don't block a detach in the same transaction"""
+        election = self.create_election(closed_at=timezone.now())
+        with transaction.atomic():
+            self.create_vote(election)
+            self.assertTrue(detach_vote_partition(election.pk, drop=True))
+        self.assertNotIn(vote_partition_name(election.pk), list_vote_partitions())
+
+    def test_retire_refuses_open_election(self):
+        """Test that an election still open for voting cannot be retired"""
+        election = self.create_election(active=True, end_date=timezone.now() + timedelta(days=1))
+        with self.assertRaises(CommandError):
+            call_command('retire_vote_partition', str(election.uuid), stdout=StringIO())
+
+    def drop_detached_partition(self, election):
+        """Drop a partition left behind as a standalone table"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {vote_partition_name(election.pk)}')
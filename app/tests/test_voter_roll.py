@@ -0,0 +1,103 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from app.models import Election, EligibleVoter, Invitation
+
+
+class VoterRollTest(TestCase):
+    """Test cases for the materialized voter roll of private elections"""
+
+    def setUp(self):
+        """Set up a private election, its official and an invited voter"""
+        self.official = User.objects.create_user(username='official', password='testpass123')
+        self.voter = User.objects.create_user(username='voter', email='voter@example.com', password='testpass123')
+        self.election = Election.objects.create(
+            name='Private Election',
+            description='Invitation only',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=1),
+            is_public=False,
+            active=True
+        )
+
+    def invite(self, email, **kwargs):
+        """Create an invitation to the private election"""
+        return Invitation.objects.create(
+            election=self.election,
+            invited_email=email,
+            invited_by=self.official,
+            expires_at=timezone.now() + timedelta(days=7),
+            **kwargs
+        )
+
+    def test_accepting_invitation_adds_voter(self):
+        """Test that only accepted invitations put users on the roll"""
+        invitation = self.invite('voter@example.com')
+        self.assertFalse(self.election.can_user_vote(self.voter))
+
+        invitation.accept(self.voter)
+        election = Election.objects.get(pk=self.election.pk)
+        self.assertTrue(election.can_user_vote(self.voter))
+        self.assertTrue(EligibleVoter.objects.filter(election=self.election, user=self.voter).exists())
+
+    def test_declined_or_cancelled_invitation_removes_voter(self):
+        """Test that changing or deleting an accepted invitation takes the user off the roll"""
+        invitation = self.invite('voter@example.com', status='accepted', invited_user=self.voter)
+        self.assertTrue(Election.objects.get(pk=self.election.pk).can_user_vote(self.voter))
+
+        invitation.status = 'declined'
+        invitation.save()
+        self.assertFalse(Election.objects.get(pk=self.election.pk).can_user_vote(self.voter))
+
+        invitation.status = 'accepted'
+        invitation.save()
+        invitation.delete()
+        self.assertFalse(Election.objects.get(pk=self.election.pk).can_user_vote(self.voter))
+
+    def test_account_created_after_invitation_is_linked(self):
+        """Test that a new account with an invited email joins the roll"""
+        self.invite('late@example.com', status='accepted')
+        late = User.objects.create_user(username='late', email='late@example.com', password='testpass123')
+        self.assertTrue(Election.objects.get(pk=self.election.pk).can_user_vote(late))
+
+    def test_eligibility_check_is_cached(self):
+        """Test that repeated checks are answered from memory"""
+        self.invite('voter@example.com', status='accepted')
+        election = Election.objects.get(pk=self.election.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(election.can_user_vote(self.voter))
+        with self.assertNumQueries(0):
+            self.assertTrue(election.can_user_vote(self.voter))
+            self.assertTrue(Election(pk=self.election.pk).can_user_vote(self.voter))
+
+    def test_pending_invitations_leave_the_roll_alone(self):
+        """Test that sending invitations doesn't recompute the roll"""
+        self.invite('voter@example.com', status='accepted')
+        with self.assertNumQueries(1):  # Just the insert
+            self.invite('other@example.com')
+
+    def test_relinking_an_accepted_invitation_moves_the_entry(self):
+        """Test that only the users an invitation covered before and after are updated"""
+        other = User.objects.create_user(username='other', password='testpass123')
+        invitation = self.invite(None, status='accepted', invited_user=self.voter)
+        self.assertTrue(Election.objects.get(pk=self.election.pk).can_user_vote(self.voter))
+
+        invitation.invited_user = other
+        invitation.save()
+        election = Election.objects.get(pk=self.election.pk)
+        self.assertFalse(election.can_user_vote(self.voter))
+        self.assertTrue(election.can_user_vote(other))
+
+    def test_roll_changes_only_drop_the_affected_entries(self):
+        """Test that accepting another user's invitation keeps this user's cached eligibility"""
+        self.invite('voter@example.com', status='accepted')
+        self.assertTrue(Election.objects.get(pk=self.election.pk).can_user_vote(self.voter))
+
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.invite('other@example.com').accept(other)
+
+        election = Election.objects.get(pk=self.election.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(election.can_user_vote(self.voter))
+        self.assertTrue(election.can_user_vote(other))
@@ -0,0 +1,173 @@
+"""
+Sharded turnout counters
+
+Counting an election's votes with COUNT(*) reads every vote row, which gets
+slow on big elections and runs on every detail page view. Instead each vote
+adds one to a TurnoutCounter row in the same transaction as the vote insert.
+The counter is spread over TURNOUT_COUNTER_SHARDS rows and each vote picks one
+at random, so concurrent voters rarely queue on the same row lock.
+
+Reading the turnout sums at most TURNOUT_COUNTER_SHARDS rows, and the sum is
+kept in the counters cache for TURNOUT_CACHE_SECONDS. Votes written without
+Vote.save (bulk inserts, deletes, restores) aren't counted, so ``manage.py
+reconcile_turnout`` periodically resets the counters to the number of votes in
+the database.
+
+For the votes-over-time chart, each committed vote is also added to its
+minute, hour and day TurnoutBucket, so any window of the series at any
+resolution is read with one range scan instead of grouping vote rows.
+``manage.py rollup_turnout`` rebuilds the buckets from the votes.
+"""
+import random
+from collections import Counter
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMinute
+
+BUCKET_WIDTHS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+
+
+def _cache_key(election):
+    return f'turnout:{election.uuid}'
+
+
+def _increment(model, using=None, **lookup):
+    """Add one to a counter row, creating it on first use"""
+    rows = model.objects.using(using).filter(**lookup)
+    if rows.update(count=F('count') + 1):
+        return
+    # get_or_create copes with another voter creating the row concurrently
+    _, created = model.objects.using(using).get_or_create(**lookup, defaults={'count': 1})
+    if not created:
+        rows.update(count=F('count') + 1)
+
+
+def increment_turnout(election_id, using=None):
+    """Add one vote to a random shard of the election's counter; call inside the vote's transaction"""
+    from app.models import TurnoutCounter
+
+    shard = random.randrange(settings.TURNOUT_COUNTER_SHARDS)
+    _increment(TurnoutCounter, using, election_id=election_id, shard=shard)
+
+
+def count_turnout(election, using=None):
+    """Sum the shards of the election's counter"""
+    from app.models import TurnoutCounter
+
+    total = TurnoutCounter.objects.using(using).filter(election=election).aggregate(total=Sum('count'))['total']
+    return total or 0
+
+
+def get_turnout(election):
+    """The election's turnout, at most TURNOUT_CACHE_SECONDS old"""
+    cache = caches['counters']
+    key = _cache_key(election)
+    turnout = cache.get(key)
+    if turnout is None:
+        turnout = count_turnout(election)
+        cache.set(key, turnout, settings.TURNOUT_CACHE_SECONDS)
+    return turnout
+
+
+def reconcile_turnout(election, using=None):
+    """
+    Reset the election's counter to the number of votes in the database.
+
+    The shards are locked first, so a vote that commits meanwhile either is
+    already counted by both or increments the reset counter afterwards.
+    Returns (counted, actual).
+    """
+    from app.models import TurnoutCounter, Vote
+
+    with transaction.atomic(using=using):
+        shards = TurnoutCounter.objects.using(using).select_for_update().filter(election=election)
+        counted = sum(shards.values_list('count', flat=True))
+        actual = Vote.objects.using(using).filter(election=election).count()
+        if counted != actual:
+            shards.exclude(shard=0).update(count=0)
+            TurnoutCounter.objects.using(using).update_or_create(
+                election=election, shard=0, defaults={'count': actual}
+            )
+    caches['counters'].delete(_cache_key(election))
+    return counted, actual
+
+
+def bucket_start(moment, resolution):
+    """Start (UTC) of the minute, hour or day bucket holding a moment"""
+    moment = moment.astimezone(dt_timezone.utc).replace(second=0, microsecond=0)
+    if resolution in ('hour', 'day'):
+        moment = moment.replace(minute=0)
+    if resolution == 'day':
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def record_vote_buckets(election_id, created, using=None):
+    """Add a committed vote to its minute, hour and day buckets"""
+    from app.models import TurnoutBucket
+
+    with transaction.atomic(using=using):
+        for resolution in BUCKET_WIDTHS:  # Always the same order, so concurrent voters can't deadlock
+            _increment(TurnoutBucket, using, election_id=election_id,
+                       resolution=resolution, start=bucket_start(created, resolution))
+
+
+def rebuild_turnout_buckets(election, using=None):
+    """
+    Recount the election's buckets from its votes.
+
+    Votes are grouped by minute in the database and the hour and day buckets
+    are summed from the minutes. Returns the number of buckets per resolution.
+    """
+    from app.models import TurnoutBucket, Vote
+
+    minutes = (
+        Vote.objects.using(using).filter(election=election).order_by()
+        .annotate(minute=TruncMinute('created', tzinfo=dt_timezone.utc))
+        .values('minute').annotate(count=Count('pk')).values_list('minute', 'count')
+    )
+    counts = {'minute': Counter(dict(minutes))}
+    for finer, coarser in (('minute', 'hour'), ('hour', 'day')):
+        counts[coarser] = Counter()
+        for start, count in counts[finer].items():
+            counts[coarser][bucket_start(start, coarser)] += count
+
+    with transaction.atomic(using=using):
+        TurnoutBucket.objects.using(using).filter(election=election).delete()
+        TurnoutBucket.objects.using(using).bulk_create(
+            [
+                TurnoutBucket(election=election, resolution=resolution, start=start, count=count)
+                for resolution, buckets in counts.items()
+                for start, count in buckets.items()
+            ],
+            batch_size=1000,
+        )
+    return {resolution: len(buckets) for resolution, buckets in counts.items()}
+
+
+def get_turnout_series(election, resolution, start, end):
+    """
+    Votes per bucket from start (inclusive) to end (exclusive) as a list of
+    (bucket start, count), with empty buckets filled in as zero.
+    """
+    from app.models import TurnoutBucket
+
+    start = bucket_start(start, resolution)
+    counts = dict(
+        TurnoutBucket.objects.filter(election=election, resolution=resolution, start__gte=start, start__lt=end)
+        .values_list('start', 'count')
+    )
+    series = []
+    width = BUCKET_WIDTHS[resolution]
+    while start < end:
+        series.append((start, counts.get(start, 0)))
+        start += width
+    return series
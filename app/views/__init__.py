@@ -1,7 +1,12 @@
 # Import all views to make them available at package level
-from .election import ElectionListView, ElectionDetailView, ElectionCreateView, ElectionUpdateView
+from .election import (
+    ElectionListView, ElectionDetailView, ElectionTurnoutView, ElectionEventsView,
+    ElectionCreateView, ElectionUpdateView
+)
 from .candidate import CandidateCreateView, CandidateUpdateView, CandidateDeleteView, CandidateDetailView
-from .vote import VoteView, VerifyResultsView, CloseElectionView, StartElectionView
+from .vote import (
+    VoteView, ElectionResultsView, VerifyResultsView, ReverifyResultsView, CloseElectionView, StartElectionView
+)
 from .invitation import (
     send_invitations, manage_invitations, invitation_accept, 
     resend_invitation, cancel_invitation, process_pending_invitation
@@ -12,11 +17,13 @@ from .auth import CustomLoginView
 # For backwards compatibility, make views available at the package level
 __all__ = [
     # Election views
-    'ElectionListView', 'ElectionDetailView', 'ElectionCreateView', 'ElectionUpdateView',
+    'ElectionListView', 'ElectionDetailView', 'ElectionTurnoutView', 'ElectionEventsView',
+    'ElectionCreateView', 'ElectionUpdateView',
     # Candidate views  
     'CandidateCreateView', 'CandidateUpdateView', 'CandidateDeleteView', 'CandidateDetailView',
     # Vote views
-    'VoteView', 'VerifyResultsView', 'CloseElectionView', 'StartElectionView',
+    'VoteView', 'ElectionResultsView', 'VerifyResultsView', 'ReverifyResultsView', 'CloseElectionView',
+    'StartElectionView',
     # Invitation views
     'send_invitations', 'manage_invitations', 'invitation_accept', 
     'resend_invitation', 'cancel_invitation', 'process_pending_invitation',
@@ -3,47 +3,36 @@ Base views for general functionality like homepage and profile
 """
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
+from django.utils import timezone
 from app.models import Election, Vote, Invitation
+from app.models.election import ElectionQuerySet
+from app.page_cache import anonymous_cache
 
+@anonymous_cache()
 def index(request):
     """Homepage view showing election summary and ongoing elections"""
-    # Get elections organized by status
-    all_elections = Election.objects.all().select_related('created_by')
+    # Get elections with their status computed in the database
+    all_elections = (
+        Election.objects.with_status(timezone.now()).without_crypto()
+        .select_related('created_by')
+    )
     
-    ongoing_elections = []
-    upcoming_elections = []
-    recently_closed_elections = []
+    # Ongoing elections sorted by end date (soonest ending first)
+    ongoing_elections = list(all_elections.filter_status_groups(['ongoing']).order_by('end_date'))
+    upcoming_elections = list(all_elections.filter_status_groups(['upcoming']).order_by('start_date')[:4])
+    recently_closed_elections = list(all_elections.filter_status_groups(['closed'])[:3])
+    # Candidates are only loaded for the cards that aren't cached
+    ElectionQuerySet.prefetch_uncached_previews(ongoing_elections + upcoming_elections[:3] + recently_closed_elections)
     
-    for election in all_elections:
-        status = election.get_status()
-        if status == 'open':
-            ongoing_elections.append(election)
-        elif status in ['scheduled', 'inactive']:
-            upcoming_elections.append(election)
-        elif status in ['closed', 'expired']:
-            recently_closed_elections.append(election)
-    
-    # Sort ongoing elections by end date (soonest ending first)
-    ongoing_elections.sort(key=lambda x: x.end_date)
-    
-    # Get featured elections (up to 4 most recent ongoing or upcoming)
-    featured_elections = ongoing_elections[:4]
-    if len(featured_elections) < 4:
-        remaining_slots = 4 - len(featured_elections)
-        upcoming_elections.sort(key=lambda x: x.start_date)
-        featured_elections.extend(upcoming_elections[:remaining_slots])
+    # Get featured elections (up to 4 most recent ongoing or upcoming) from the lists already fetched
+    featured_elections = (ongoing_elections + upcoming_elections)[:4]
     
     context = {
         'elections': featured_elections,  # For backward compatibility
         'ongoing_elections': ongoing_elections,
         'upcoming_elections': upcoming_elections[:3],  # Show only next 3 upcoming
-        'recently_closed_elections': recently_closed_elections[:3],  # Show only last 3 closed
-        'elections_count': {
-            'ongoing': len(ongoing_elections),
-            'upcoming': len(upcoming_elections),
-            'recently_closed': len(recently_closed_elections),
-            'total': len(all_elections)
-        }
+        'recently_closed_elections': recently_closed_elections,  # Show only last 3 closed
+        'elections_count': all_elections.status_counts(),
     }
     
     return render(request, 'app/index.html', context)
@@ -51,10 +40,15 @@ def index(request):
 @login_required
 def profile(request):
     """User profile view showing their voting history, created elections, and invitations"""
-    votes = Vote.objects.filter(user=request.user).select_related('election')
+    votes = Vote.objects.filter(user=request.user).select_related('election').defer(
+        'ballot', *ElectionQuerySet.crypto_fields('election')
+    )
     
     # Get elections created by this user (if they're an official)
-    created_elections = Election.objects.filter(created_by=request.user).order_by('-created')
+    created_elections = (
+        Election.objects.filter(created_by=request.user).without_crypto().order_by('-created')
+    )
+    ElectionQuerySet.prefetch_uncached_previews(created_elections)
     
     # Add can_edit attribute to each election using the model method
     for election in created_elections:
@@ -64,7 +58,7 @@ def profile(request):
     # Get invitations for this user
     invitations = Invitation.objects.filter(
         invited_email=request.user.email
-    ).select_related('election').order_by('-created_at')
+    ).select_related('election').defer(*ElectionQuerySet.crypto_fields('election')).order_by('-created_at')
     
     # Categorize invitations by status
     pending_invitations = invitations.filter(status='pending')
@@ -87,14 +81,17 @@ def profile(request):
     })
 
 # Legal pages
+@anonymous_cache(static=True)
 def terms(request):
     """Terms of Service page"""
     return render(request, 'app/legal/terms.html')
 
+@anonymous_cache(static=True)
 def privacy(request):
     """Privacy Policy page"""
     return render(request, 'app/legal/privacy.html')
 
+@anonymous_cache(static=True)
 def accessibility(request):
     """Accessibility page"""
     return render(request, 'app/legal/accessibility.html')
@@ -112,10 +109,12 @@ def contact(request):
     
     return render(request, 'app/legal/contact.html')
 
+@anonymous_cache(static=True)
 def faqs(request):
     """Frequently Asked Questions page"""
     return render(request, 'app/legal/faqs.html')
 
+@anonymous_cache(static=True)
 def how(request):
     """How It Works page explaining the platform"""
     return render(request, 'app/how.html')
\ No newline at end of file
@@ -9,6 +9,7 @@ from django.urls import reverse_lazy
 
 from app.models import Candidate, Election
 from app.forms import CandidateForm
+from app.views.mixins import ElectionConditionalGetMixin
 
 
 class CandidateCreateView(LoginRequiredMixin, CreateView):
@@ -83,7 +84,7 @@ class CandidateCreateView(LoginRequiredMixin, CreateView):
     
     def _is_official(self, user):
         """Check if user is an official who can manage candidates"""
-        return user.is_superuser or user.groups.filter(name='Officials').exists()
+        return user.is_superuser or 'Officials' in user.get_group_names()
 
 
 class CandidateUpdateView(LoginRequiredMixin, UpdateView):
@@ -154,7 +155,7 @@ class CandidateUpdateView(LoginRequiredMixin, UpdateView):
     
     def _is_official(self, user):
         """Check if user is an official who can manage candidates"""
-        return user.is_superuser or user.groups.filter(name='Officials').exists()
+        return user.is_superuser or 'Officials' in user.get_group_names()
 
 
 class CandidateDeleteView(LoginRequiredMixin, DeleteView):
@@ -219,10 +220,10 @@ class CandidateDeleteView(LoginRequiredMixin, DeleteView):
     
     def _is_official(self, user):
         """Check if user is an official who can manage candidates"""
-        return user.is_superuser or user.groups.filter(name='Officials').exists()
+        return user.is_superuser or 'Officials' in user.get_group_names()
 
 
-class CandidateDetailView(DetailView):
+class CandidateDetailView(ElectionConditionalGetMixin, DetailView):
     """View a candidate's profile"""
     model = Candidate
     template_name = 'app/candidates/detail.html'
@@ -234,9 +235,16 @@ class CandidateDetailView(DetailView):
         """Verify candidate exists"""
         return super().dispatch(request, *args, **kwargs)
     
+    def get_queryset(self):
+        """Fetch the candidate with everything the profile page displays in one query"""
+        return Candidate.objects.select_related('user__profile', 'party', 'election__created_by')
+    
+    def get_conditional_election(self):
+        return self.object.election
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        candidate = self.get_object()
+        candidate = self.object
         election = candidate.election
         context['election'] = election
         
@@ -244,7 +252,7 @@ class CandidateDetailView(DetailView):
             # Check if current user has voted in this election
             from app.models import Vote
             user_votes = Vote.objects.filter(election=election, user=self.request.user)
-            context['voted'] = user_votes.count()
+            context['voted'] = int(user_votes.exists())
             
             # Check if current user can remove this candidate
             context['can_remove_candidate'] = self._can_remove_candidate(
@@ -1,18 +1,34 @@
 """
 Class-based views for Election model operations
 """
-from django.views.generic import ListView, DetailView, CreateView, UpdateView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.shortcuts import redirect
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect, render, get_object_or_404
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from asgiref.sync import sync_to_async
 from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
 
 from app.models import Election, Vote
+from app.models.election import ElectionQuerySet
 from app.forms import ElectionForm, ElectionUpdateForm
+from app.live import TERMINAL_STATUSES, broadcaster, format_event, read_live_state
+from app.page_cache import anonymous_cache
+from app.published_results import get_published_results
+from app.turnout import BUCKET_WIDTHS, get_turnout, get_turnout_series
+from app.views.mixins import ElectionConditionalGetMixin
 
 
+@method_decorator(anonymous_cache(), name='dispatch')
 class ElectionListView(ListView):
     """List elections organized by status: ongoing, upcoming, and recently closed"""
     model = Election
@@ -37,8 +53,11 @@ class ElectionListView(ListView):
         else:
             selected_statuses = [status_filter]
         
-        # Get all elections and apply search filter
-        all_elections = Election.objects.all().select_related('created_by')
+        # Get all elections with their status computed in the database and apply search filter
+        all_elections = (
+            Election.objects.with_status(now).without_crypto()
+            .select_related('created_by')
+        )
         
         if search_term:
             all_elections = all_elections.filter(name__icontains=search_term)
@@ -67,44 +86,21 @@ class ElectionListView(ListView):
                     end_date__lte=end_date
                 )
         
-        # Organize by status and apply status filter
-        ongoing_elections = []
-        upcoming_elections = []
-        recently_closed_elections = []
-        
-        for election in all_elections:
-            status = election.get_status()
-            if status == 'open' and 'ongoing' in selected_statuses:
-                ongoing_elections.append(election)
-            elif status in ['scheduled', 'inactive'] and 'upcoming' in selected_statuses:
-                upcoming_elections.append(election)
-            elif status in ['closed', 'expired'] and 'closed' in selected_statuses:
-                recently_closed_elections.append(election)
-        
-        # Sort each category
-        ongoing_elections.sort(key=lambda x: x.end_date)  # Soonest ending first
-        upcoming_elections.sort(key=lambda x: x.start_date)  # Soonest starting first
-        recently_closed_elections.sort(key=lambda x: x.end_date, reverse=True)  # Most recently closed first
-        
-        # Combine all filtered elections into a single list
-        all_filtered_elections = ongoing_elections + upcoming_elections + recently_closed_elections
-        
-        # Sort the combined list: ongoing first (by end date), then upcoming (by start date), then closed (by end date desc)
-        def sort_key(election):
-            status = election.get_status()
-            if status == 'open':
-                return (0, election.end_date)  # Ongoing elections first, sorted by end date
-            elif status in ['scheduled', 'inactive']:
-                return (1, election.start_date)  # Upcoming elections second, sorted by start date
-            else:  # closed/expired
-                return (2, -election.end_date.timestamp())  # Closed elections last, sorted by end date desc
-        
-        all_filtered_elections.sort(key=sort_key)
-        
-        # Add pagination
-        paginator = Paginator(all_filtered_elections, 6)  # Show 6 elections per page (3 rows of 2)
+        # Apply status filter, then count each status group in one aggregate query
+        filtered_elections = all_elections.filter_status_groups(selected_statuses)
+        elections_count = filtered_elections.status_counts()
+        
+        # Ongoing first (by end date), then upcoming (by start date), then closed (by end date desc)
+        filtered_elections = filtered_elections.order_by_status()
+        
+        # Add pagination; only the rows for the requested page are fetched
+        paginator = Paginator(filtered_elections, 6)  # Show 6 elections per page (3 rows of 2)
+        paginator.count = elections_count['total']  # Already counted by the aggregate above
         page_number = self.request.GET.get('page')
         page_obj = paginator.get_page(page_number)
+        # Candidates are only loaded for the cards that aren't cached
+        page_obj.object_list = list(page_obj.object_list)
+        ElectionQuerySet.prefetch_uncached_previews(page_obj.object_list)
         
         # Prepare query parameters for pagination
         query_params = {
@@ -117,15 +113,7 @@ class ElectionListView(ListView):
             'elections': page_obj,  # Paginated elections for template
             'page_obj': page_obj,  # Page object for pagination controls
             'query_params': query_params,  # For pagination partial
-            'ongoing_elections': ongoing_elections,
-            'upcoming_elections': upcoming_elections,
-            'recently_closed_elections': recently_closed_elections,
-            'elections_count': {
-                'ongoing': len(ongoing_elections),
-                'upcoming': len(upcoming_elections),
-                'recently_closed': len(recently_closed_elections),
-                'total': len(all_filtered_elections)
-            },
+            'elections_count': elections_count,
             'selected_statuses': selected_statuses,
             'selected_status': status_filter,  # Single status for dropdown
             'search_term': search_term,
@@ -139,7 +127,7 @@ class ElectionListView(ListView):
         return Election.objects.none()
 
 
-class ElectionDetailView(DetailView):
+class ElectionDetailView(ElectionConditionalGetMixin, DetailView):
     """Display election details with voting options and results"""
     model = Election
     template_name = 'app/elections/detail.html'
@@ -147,14 +135,27 @@ class ElectionDetailView(DetailView):
     slug_field = 'uuid'
     slug_url_kwarg = 'uuid'
     
+    def get_queryset(self):
+        """Fetch the election with its counters in one query"""
+        return Election.objects.with_counts().select_related('created_by')
+    
+    def get(self, request, *args, **kwargs):
+        # Anonymous visitors of a closed election get its published static page
+        if not request.user.is_authenticated:
+            published = get_published_results(kwargs['uuid'])
+            if published:
+                return redirect(published['page'])
+        return super().get(request, *args, **kwargs)
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        election = self.get_object()
+        election = self.object
+        context['status_info'] = election.get_status_display()
         
         # Check if current user has voted (only for authenticated users)
         if self.request.user.is_authenticated:
             user_votes = Vote.objects.filter(election=election, user=self.request.user)
-            context['voted'] = user_votes.count()
+            context['voted'] = int(user_votes.exists())
             context['can_edit'] = self._can_edit_election(election, self.request.user)
             context['can_user_vote'] = election.can_user_vote(self.request.user)
         else:
@@ -181,6 +182,115 @@ class ElectionDetailView(DetailView):
         return election.get_results()
 
 
+class ElectionTurnoutView(View):
+    """
+    Serve an election's votes over time from the pre-aggregated turnout buckets.
+
+    Query parameters are `resolution` (minute, hour or day) and an optional
+    ISO 8601 `start` and `end`. htmx requests get the live turnout partial of
+    the detail page instead of JSON.
+    """
+    default_windows = {
+        'minute': timedelta(hours=1),
+        'hour': timedelta(hours=24),
+        'day': timedelta(days=30),
+    }
+    max_buckets = 1500
+    # htmx stops polling on this status, e.g. once the election has closed
+    stop_polling_status = 286
+    
+    def get(self, request, uuid):
+        election = get_object_or_404(Election.objects.without_crypto(), uuid=uuid)
+        if request.htmx and election.get_status() != 'open':
+            response = render(request, 'app/partials/turnout_chart.html', {
+                'election': election,
+                'total': get_turnout(election),
+            }, status=self.stop_polling_status)
+            patch_vary_headers(response, ['HX-Request'])
+            return response
+        
+        resolution = request.GET.get('resolution', 'hour')
+        if resolution not in BUCKET_WIDTHS:
+            return JsonResponse({'error': f'Unknown resolution "{resolution}"'}, status=400)
+        try:
+            end = self._parse_time(request.GET.get('end')) or timezone.now()
+            start = self._parse_time(request.GET.get('start')) or end - self.default_windows[resolution]
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        if not start < end or (end - start) / BUCKET_WIDTHS[resolution] > self.max_buckets:
+            return JsonResponse({'error': f'Choose a window of 1 to {self.max_buckets} {resolution}s'}, status=400)
+        
+        series = get_turnout_series(election, resolution, start, end)
+        total = get_turnout(election)
+        if request.htmx:
+            response = self._render_chart(request, election, series, total)
+        else:
+            response = JsonResponse({
+                'election': str(election.uuid),
+                'resolution': resolution,
+                'total': total,
+                'buckets': [{'start': bucket.isoformat(), 'votes': count} for bucket, count in series],
+            })
+        patch_vary_headers(response, ['HX-Request'])
+        patch_cache_control(response, public=True, max_age=settings.TURNOUT_CACHE_SECONDS)
+        return response
+    
+    def _parse_time(self, value):
+        """Parse an ISO 8601 query parameter, reading naive times as UTC"""
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f'"{value}" is not an ISO 8601 date and time')
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, dt_timezone.utc)
+        return parsed
+    
+    def _render_chart(self, request, election, series, total):
+        """Render the detail page's turnout partial with bar heights relative to the busiest bucket"""
+        busiest = max((count for _, count in series), default=0) or 1
+        return render(request, 'app/partials/turnout_chart.html', {
+            'election': election,
+            'total': total,
+            'resolution': request.GET.get('resolution', 'hour'),
+            'buckets': [
+                {'start': bucket, 'votes': count, 'height': count * 100 // busiest}
+                for bucket, count in series
+            ],
+        })
+
+
+class ElectionEventsView(View):
+    """
+    Stream an election's status and turnout as Server-Sent Events.
+
+    Subscribers get a `snapshot` event on connect, then `turnout` and
+    `status` events as they change. Closed elections, and those past their end
+    date, answer 204 so browsers stop reconnecting.
+    """
+    retry_ms = 5000
+    
+    async def get(self, request, uuid):
+        try:
+            election = await Election.objects.without_crypto().aget(uuid=uuid)
+        except Election.DoesNotExist:
+            raise Http404('No election found matching the query')
+        if election.get_status() in TERMINAL_STATUSES:
+            return HttpResponse(status=204)
+        
+        if isinstance(request, ASGIRequest):
+            events = broadcaster.stream(election)
+        else:
+            # A sync worker can't hold the connection open, so send the state and let the browser reconnect
+            state = (await sync_to_async(read_live_state)([election]))[election.uuid]
+            events = [f'retry: {self.retry_ms}\n\n', format_event('snapshot', state)]
+        
+        response = StreamingHttpResponse(events, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+        return response
+
+
 class ElectionCreateView(LoginRequiredMixin, CreateView):
     """Create a new election"""
     model = Election
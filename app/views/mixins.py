@@ -0,0 +1,56 @@
+"""
+Mixins shared by election and candidate views
+"""
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from app.turnout import get_turnout
+
+
+class ElectionConditionalGetMixin:
+    """
+    Answer repeat anonymous visits to an election's pages with 304 Not Modified.
+
+    The ETag comes from the election's `updated` stamp, status and turnout, so
+    it is computed from the object the view already fetched, without rendering.
+    Pages of closed elections no longer change and may be cached by browsers
+    and proxies for CLOSED_ELECTION_MAX_AGE; other pages must be revalidated.
+    Signed-in users see personal content and always get a full page.
+    """
+
+    def get_conditional_election(self):
+        """The election whose version the page depends on"""
+        return self.object
+
+    def get_etag(self, election):
+        version = ':'.join(str(part) for part in (
+            self.object._meta.label, self.object.pk, election.updated.isoformat(),
+            election.get_status(), get_turnout(election),
+        ))
+        return hashlib.sha256(version.encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        if request.user.is_authenticated:
+            return self.render_to_response(self.get_context_data(object=self.object))
+
+        election = self.get_conditional_election()
+        closed = election.get_status() == 'closed'
+        etag = quote_etag(self.get_etag(election))
+        # Votes don't bump `updated`, so only closed elections can be validated by date
+        last_modified = int(election.updated.timestamp()) if closed else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.render_to_response(self.get_context_data(object=self.object))
+
+        response['ETag'] = etag
+        if closed:
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, public=True, max_age=settings.CLOSED_ELECTION_MAX_AGE)
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return response
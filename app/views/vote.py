@@ -1,16 +1,26 @@
 """
 Class-based views for voting and result operations
 """
-import json
+import hashlib
+import logging
 from django.views.generic import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import Http404
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 
 from app.models import Election, Candidate, Vote
-from app.encryption import Encryption
 from app.email_utils import send_vote_confirmation
+from app.partitions import ensure_vote_partition
+from app.published_results import get_published_results, results_document
+from app.tally import finalize_election, record_verification
+
+logger = logging.getLogger(__name__)
 
 
 class VoteView(LoginRequiredMixin, View):
@@ -76,7 +86,15 @@ class VoteView(LoginRequiredMixin, View):
                 election=election
             )
             vote._candidate = candidate  # Temporary attribute for encryption
-            vote.save()  # This will trigger the encryption in the model
+            # A missing partition is created in its own transaction, not the vote's
+            ensure_vote_partition(election.pk)
+            try:
+                with transaction.atomic():
+                    vote.save()  # This will trigger the encryption in the model
+            except IntegrityError:
+                # A concurrent request from the same user recorded a vote first
+                messages.error(request, "You have already voted in this election.")
+                return redirect('election_detail', uuid=election.uuid)
             
             # Send confirmation email
             if request.user.email:
@@ -146,6 +164,7 @@ class CloseElectionView(LoginRequiredMixin, View):
             if election.close_election():
                 election.save()
                 messages.success(request, f"Election '{election.name}' has been closed successfully.")
+                self._finalize(request, election)
             else:
                 messages.error(request, f"Failed to close election '{election.name}'.")
             
@@ -154,6 +173,14 @@ class CloseElectionView(LoginRequiredMixin, View):
         except Election.DoesNotExist:
             messages.error(request, "Election not found.")
             return redirect('election_list')
+    
+    def _finalize(self, request, election):
+        """Tally and verify the closed election so results are served from stored data"""
+        try:
+            finalize_election(election)
+        except Exception as e:
+            logger.error(f"Failed to finalize election {election.uuid}: {str(e)}")
+            messages.warning(request, "Results could not be tallied yet. An official can re-verify them later.")
 
 
 class StartElectionView(LoginRequiredMixin, View):
@@ -192,67 +219,98 @@ class StartElectionView(LoginRequiredMixin, View):
             return redirect('election_list')
 
 
+class ElectionResultsView(View):
+    """Serve the results of a closed election as JSON"""
+    
+    def get(self, request, uuid):
+        """Redirect to the published results document, or build it if there is none yet"""
+        published = get_published_results(uuid)
+        if published:
+            return redirect(published['results'])
+        
+        election = get_object_or_404(Election, uuid=uuid)
+        if not election.can_show_results():
+            raise Http404("Results are not available until the election is closed")
+        return JsonResponse(results_document(election))
+
+
 class VerifyResultsView(View):
-    """Verify election results using homomorphic encryption"""
+    """Serve the stored homomorphic verification of election results"""
+    
+    cache_timeout = 60 * 60 * 24
     
     def get(self, request, uuid):
         """Display results verification page"""
-        try:
-            election = get_object_or_404(Election, uuid=uuid)
-            
-            # Perform verification if election has encryption data
-            verified = self._verify_results(election)
-            
+        # Published verification pages are static files; skip the database entirely
+        published = get_published_results(uuid)
+        if published:
+            return redirect(published['verification'])
+        
+        election = get_object_or_404(Election, uuid=uuid)
+        
+        # Elections closed before verification was stored are verified once here
+        if election.verified_at is None and election.decrypted_total:
+            record_verification(election)
+            election.save(update_fields=['verified', 'verified_at', 'verification_transcript'])
+        
+        if election.verified_at is None:
             return render(request, 'app/elections/verify_results.html', {
-                'election': election, 
-                'verified': verified
+                'election': election,
+                'verified': None
             })
-            
-        except Election.DoesNotExist:
-            raise Http404("Election not found")
+        
+        # The transcript only changes on re-verification, so its digest is a strong ETag
+        etag = quote_etag(self.get_digest(election))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(self.get_cached_content(election))
+        
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=300)
+        return response
     
-    def _verify_results(self, election):
-        """Verify election results using homomorphic encryption"""
-        try:
-            if not election.public_key:
-                return None  # No encryption data available
-            
-            # Parse public key
-            cleaned_key = election.public_key.replace("'", '"')
-            public_key = json.loads(cleaned_key)
-            encryption = Encryption(public_key=f"{public_key['g']},{public_key['n']}")
-            
-            # Convert decrypted total to negative vector
-            decrypted_total = json.loads(election.decrypted_total)
-            decrypted_negative_total = [-x for x in decrypted_total]
-            
-            # Encrypt negative total
-            encrypted_negative_total = []
-            for i in decrypted_negative_total:
-                encrypted_negative_total.append(encryption.encrypt(plaintext=i, rand=1))
-            
-            # Get encrypted positive total and compute zero sum
-            encrypted_positive_total = json.loads(election.encrypted_positive_total)
-            encrypted_zero_sum = []
-            
-            for i in range(len(encrypted_positive_total)):
-                from app.encryption import Ciphertext
-                temp_ept = Ciphertext.from_json(encrypted_positive_total[i])
-                encrypted_zero_sum.append(encryption.add(temp_ept, encrypted_negative_total[i]))
-            
-            # Recalculate zero sum with stored randomness
-            zero_randomness = json.loads(election.zero_randomness)
-            recalculated_zero_sum = []
-            for i in range(len(zero_randomness)):
-                recalculated_zero_sum.append(encryption.encrypt(plaintext=0, rand=zero_randomness[i]))
-            
-            # Verify if sums match
-            for i in range(len(encrypted_zero_sum)):
-                if encrypted_zero_sum[i].ciphertext != recalculated_zero_sum[i].ciphertext:
-                    return False
-            
-            return True
-            
-        except (json.JSONDecodeError, KeyError, IndexError, ValueError) as e:
-            # Return None if verification cannot be performed
-            return None
\ No newline at end of file
+    @staticmethod
+    def get_digest(election):
+        """Digest of the stored verification transcript"""
+        return hashlib.sha256(election.verification_transcript.encode()).hexdigest()
+    
+    @classmethod
+    def get_cached_content(cls, election):
+        """Render the verification fragment once per transcript and cache it"""
+        cache_key = f'verify-results:{election.uuid}:{cls.get_digest(election)}'
+        cache = caches['crypto']
+        content = cache.get(cache_key)
+        if content is None:
+            content = render_to_string('app/elections/verify_results.html', {
+                'election': election,
+                'verified': election.verified
+            })
+            cache.set(cache_key, content, cls.cache_timeout)
+        return content
+
+
+class ReverifyResultsView(LoginRequiredMixin, View):
+    """Recompute the stored verification of election results (only for officials)"""
+    
+    def post(self, request, uuid):
+        """Re-run the zero-sum verification for the specified election"""
+        if not request.user.can_close_elections():
+            messages.error(request, "You don't have permission to re-verify election results.")
+            return redirect('election_detail', uuid=uuid)
+        
+        election = get_object_or_404(Election, uuid=uuid)
+        if not election.can_show_results():
+            messages.error(request, f"Results of '{election.name}' are not available until it is closed.")
+            return redirect('election_detail', uuid=uuid)
+        
+        finalize_election(election)
+        verified = election.verified
+        
+        if verified:
+            messages.success(request, f"Results of '{election.name}' have been re-verified successfully.")
+        elif verified is None:
+            messages.warning(request, f"Election '{election.name}' has no tally to verify.")
+        else:
+            messages.error(request, f"Results verification failed for '{election.name}'.")
+        
+        return redirect('election_detail', uuid=uuid)
@@ -0,0 +1,101 @@
+"""
+Voter roll of private elections, materialized from accepted invitations
+"""
+import uuid
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+VOTER_ROLL_CACHE_TIMEOUT = 60 * 60
+
+
+def _voter_roll_version_key(election_id):
+    """Cache key for the version an election's cached roll entries are stored under"""
+    return f'voter-roll:{election_id}:version'
+
+
+def _voter_roll_cache_key(election_id, user_id):
+    """Cache key for whether a user is on an election's voter roll, under the election's current version"""
+    version = cache.get_or_set(_voter_roll_version_key(election_id), lambda: uuid.uuid4().hex, None)
+    return f'voter-roll:{election_id}:{version}:{user_id}'
+
+
+def forget_voter_roll(election_id, user_ids=None, using=None):
+    """
+    Drop cached roll entries now and again once the surrounding transaction commits.
+
+    Only the given users' entries are dropped; without user_ids the whole
+    election's roll is.
+    """
+    def forget():
+        if user_ids is None:
+            cache.set(_voter_roll_version_key(election_id), uuid.uuid4().hex, None)
+        elif user_ids:
+            cache.delete_many([_voter_roll_cache_key(election_id, user_id) for user_id in user_ids])
+
+    forget()
+    transaction.on_commit(forget, using=using)
+
+
+def is_eligible_voter(election, user):
+    """Check whether a user is on an election's voter roll, answered at most once per request"""
+    checked = election.__dict__.setdefault('_voter_roll', {})
+    if user.pk not in checked:
+        key = _voter_roll_cache_key(election.pk, user.pk)
+        eligible = cache.get(key)
+        if eligible is None:
+            eligible = election.eligible_voters.filter(user_id=user.pk).exists()
+            cache.set(key, eligible, VOTER_ROLL_CACHE_TIMEOUT)
+        checked[user.pk] = eligible
+    return checked[user.pk]
+
+
+def invitation_user_ids(invited_user_id, invited_email):
+    """Users an invitation applies to: the linked account and any account with the invited email"""
+    user_ids = {invited_user_id} if invited_user_id else set()
+    if invited_email:
+        user_ids.update(User.objects.filter(email=invited_email).values_list('pk', flat=True))
+    return user_ids
+
+
+def update_voter_roll(election_id, user_ids):
+    """Add or remove the roll entries of a few users of an election, after one of its invitations changed"""
+    from app.models import EligibleVoter, Invitation
+
+    if not user_ids:
+        return
+    with transaction.atomic():
+        for user in User.objects.filter(pk__in=user_ids).only('pk', 'email'):
+            match = Q(invited_user=user)
+            if user.email:
+                match |= Q(invited_email=user.email)
+            if Invitation.objects.filter(match, election_id=election_id, status='accepted').exists():
+                EligibleVoter.objects.bulk_create(
+                    [EligibleVoter(election_id=election_id, user=user)], ignore_conflicts=True
+                )
+            else:
+                EligibleVoter.objects.filter(election_id=election_id, user=user).delete()
+    forget_voter_roll(election_id, user_ids)
+
+
+def refresh_user_eligibility(user):
+    """Bring a user's voter roll entries in line with the invitations linked to their account or email"""
+    from app.models import EligibleVoter, Invitation
+
+    match = Q(invited_user=user)
+    if user.email:
+        match |= Q(invited_email=user.email)
+    with transaction.atomic():
+        wanted = set(Invitation.objects.filter(match, status='accepted').values_list('election_id', flat=True))
+        current = set(EligibleVoter.objects.filter(user=user).values_list('election_id', flat=True))
+        if wanted == current:
+            return
+
+        EligibleVoter.objects.filter(user=user, election_id__in=current - wanted).delete()
+        EligibleVoter.objects.bulk_create(
+            [EligibleVoter(election_id=election_id, user=user) for election_id in wanted - current],
+            ignore_conflicts=True,
+        )
+    for election_id in wanted ^ current:
+        forget_voter_roll(election_id, [user.pk])
@@ -19,6 +19,10 @@ python manage.py collectstatic --noinput --clear
 echo "🗃️ Running database migrations..."
 python manage.py migrate --noinput
 
+# Published results pages link to hashed static files, which collectstatic --clear just replaced
+echo "📰 Republishing election results..."
+python manage.py publish_results --republish
+
 # Create superuser if environment variables are set
 if [ ! -z "$DJANGO_SUPERUSER_USERNAME" ] && [ ! -z "$DJANGO_SUPERUSER_EMAIL" ] && [ ! -z "$DJANGO_SUPERUSER_PASSWORD" ]; then
     echo "👤 Creating superuser..."
@@ -11,8 +11,15 @@ bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+# Every worker process holds its own database connections (one per thread), so
+# workers * threads must stay below the database's max_connections.
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+# ASGI worker classes such as uvicorn.workers.UvicornWorker (pip install uvicorn)
+# keep idle Server-Sent Events connections on an event loop instead of pinning
+# a sync worker each, and need the ASGI application.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+wsgi_app = 'project.asgi:application' if worker_class.startswith('uvicorn') else 'project.wsgi:application'
 worker_connections = 1000
 timeout = 30
 keepalive = 2
@@ -11,6 +11,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
+import dj_database_url
 import environ
 
 env = environ.Env(
@@ -18,6 +20,40 @@ env = environ.Env(
     DEBUG=(bool, True),
     SECRET_KEY=(str, 'django-insecure-w=tfvfl2c!o30i0r%1-%g(z3*4y+2eebd9k77#lt6n-$!f0yk('),
     FIELD_ENCRYPTION_KEY=(str, ''),
+    # Database settings (SQLite is used when DATABASE_URL is empty)
+    DATABASE_URL=(str, ''),
+    DATABASE_CONN_MAX_AGE=(int, 600),
+    DATABASE_CONN_HEALTH_CHECKS=(bool, True),
+    DATABASE_POOL=(bool, False),
+    DATABASE_POOL_MIN_SIZE=(int, 1),
+    DATABASE_POOL_MAX_SIZE=(int, 0),
+    DATABASE_POOL_TIMEOUT=(float, 10.0),
+    DATABASE_REPLICA_URLS=(list, []),
+    DATABASE_REPLICA_PIN_SECONDS=(int, 15),
+    GUNICORN_THREADS=(int, 1),
+    SQLITE_BUSY_TIMEOUT=(int, 20),
+    # Backend of the named caches (locmem, file or redis; default: locmem with DEBUG, else file)
+    # and its directory or server URL
+    CACHE_BACKEND=(str, ''),
+    CACHE_LOCATION=(str, ''),
+    # Directory for compressed ballot archives of closed elections (default: BASE_DIR/archive)
+    BALLOT_ARCHIVE_ROOT=(str, ''),
+    # Directory for the append-only ballot stores used by tallies (empty: disabled)
+    BALLOT_STORE_ROOT=(str, ''),
+    # Directory and URL of the static results of closed elections (default: MEDIA_ROOT/results)
+    PUBLISHED_RESULTS_ROOT=(str, ''),
+    PUBLISHED_RESULTS_URL=(str, '/media/results/'),
+    # Rows each election's turnout counter is spread over, and how long sums are cached
+    TURNOUT_COUNTER_SHARDS=(int, 8),
+    TURNOUT_CACHE_SECONDS=(int, 5),
+    # How often each process reads the state of elections watched over Server-Sent Events
+    LIVE_POLL_SECONDS=(float, 2.0),
+    # How long browsers and proxies may reuse pages of closed elections
+    CLOSED_ELECTION_MAX_AGE=(int, 60 * 60 * 24),
+    # Micro-cache of anonymous pages: lifetimes of dynamic and static pages, stale grace
+    PAGE_CACHE_SECONDS=(int, 5),
+    PAGE_CACHE_STATIC_SECONDS=(int, 60 * 60),
+    PAGE_CACHE_STALE_SECONDS=(int, 60),
     ENCRYPTION_KEY_PATH=(str, ''),
     ALLOWED_HOSTS=(list, ['localhost', '127.0.0.1']),
     LANGUAGE_CODE=(str, 'en-us'),
@@ -98,7 +134,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'app.middleware.PublishedResultsMiddleware',  # WhiteNoise, plus published election results
+    'app.middleware.PrimaryPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -133,13 +170,115 @@ WSGI_APPLICATION = 'project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Single-node profile shared by several gunicorn workers: WAL lets readers
+# run alongside the one writer, writers wait up to SQLITE_BUSY_TIMEOUT seconds
+# for the lock, and IMMEDIATE takes the write lock when a transaction begins
+# instead of failing with "database is locked" halfway through it
+SQLITE_OPTIONS = {
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=134217728;'
+        'PRAGMA cache_size=-20000;'
+    ),
+    'timeout': env('SQLITE_BUSY_TIMEOUT'),
+    'transaction_mode': 'IMMEDIATE',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': dict(SQLITE_OPTIONS),
     }
 }
 
+if env('DATABASE_URL'):
+    # Persistent connections, checked before reuse, so a request only pays for
+    # connection setup after the previous connection has gone bad
+    DATABASES['default'] = dj_database_url.parse(
+        env('DATABASE_URL'),
+        conn_max_age=env('DATABASE_CONN_MAX_AGE'),
+        conn_health_checks=env('DATABASE_CONN_HEALTH_CHECKS'),
+    )
+
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+        # sqlite:// URLs keep the single-node profile above
+        DATABASES['default']['OPTIONS'] = {**SQLITE_OPTIONS, **DATABASES['default'].get('OPTIONS', {})}
+
+    if env('DATABASE_POOL'):
+        # Django's native connection pool (requires psycopg 3 with the pool extra).
+        # Each gunicorn worker process has its own pool, and a worker serves at most
+        # GUNICORN_THREADS requests at once, so that is all the connections it needs.
+        # See "Database Connections" in DEPLOYMENT.md for sizing against max_connections.
+        DATABASES['default']['CONN_MAX_AGE'] = 0  # Pooling replaces persistent connections
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': env('DATABASE_POOL_MIN_SIZE'),
+            'max_size': env('DATABASE_POOL_MAX_SIZE') or env('GUNICORN_THREADS'),
+            'timeout': env('DATABASE_POOL_TIMEOUT'),
+        }
+
+    # Read replicas (replica_1, replica_2, ...) share the primary's connection settings;
+    # the test runner mirrors them to the primary
+    for number, replica_url in enumerate(env('DATABASE_REPLICA_URLS'), start=1):
+        replica = dj_database_url.parse(replica_url, conn_health_checks=env('DATABASE_CONN_HEALTH_CHECKS'))
+        replica['CONN_MAX_AGE'] = DATABASES['default']['CONN_MAX_AGE']
+        if 'pool' in DATABASES['default'].get('OPTIONS', {}):
+            replica.setdefault('OPTIONS', {})['pool'] = dict(DATABASES['default']['OPTIONS']['pool'])
+        replica['TEST'] = {'MIRROR': 'default'}
+        DATABASES[f'replica_{number}'] = replica
+
+# Reads go to replicas when any are configured; writes, and reads for a short
+# time after a browser writes (DATABASE_REPLICA_PIN_SECONDS), stay on the primary
+DATABASE_ROUTERS = ['app.db_router.ReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = env('DATABASE_REPLICA_PIN_SECONDS')
+
+
+# Caches
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHE_BACKENDS = {
+    # Per process, for development and tests
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    # Shared by the workers of a single node
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    # Shared by every node (requires the redis package)
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+# Workers only share cached data through the file or redis backends
+CACHE_BACKEND = env('CACHE_BACKEND') or ('locmem' if DEBUG else 'file')
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}")
+
+# One cache per kind of data, so each has its own lifetime and eviction policy
+# and a flood of one kind can't evict the others (see app.cache):
+# alias: (default timeout, max entries, 1/n of the entries culled when full)
+CACHE_NAMESPACES = {
+    'default': (5 * 60, 1000, 3),                   # Voter rolls and other small lookups
+    'pages': (60, 500, 2),                          # Anonymous pages (app.page_cache)
+    'template_fragments': (60 * 60, 5000, 3),       # {% cache %} fragments
+    'crypto': (60 * 60 * 24, 200, 4),               # Rendered verification transcripts
+    'counters': (5 * 60, 10000, 3),                 # Turnout sums and live election statuses
+}
+
+CACHES = {}
+for alias, (timeout, max_entries, cull_frequency) in CACHE_NAMESPACES.items():
+    CACHES[alias] = {
+        'BACKEND': 'app.cache.InstrumentedCache',
+        'WRAPS': CACHE_BACKENDS[CACHE_BACKEND],
+        'TIMEOUT': timeout,
+        'KEY_PREFIX': alias,
+    }
+    if CACHE_BACKEND == 'redis':
+        # One server holds every namespace; it evicts by its own maxmemory-policy
+        CACHES[alias]['LOCATION'] = env('CACHE_LOCATION')
+    else:
+        CACHES[alias]['LOCATION'] = (
+            str(Path(env('CACHE_LOCATION') or BASE_DIR / 'cache') / alias)
+            if CACHE_BACKEND == 'file' else alias
+        )
+        CACHES[alias]['OPTIONS'] = {'MAX_ENTRIES': max_entries, 'CULL_FREQUENCY': cull_frequency}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -214,6 +353,31 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = env('MEDIA_URL')
 MEDIA_ROOT = BASE_DIR / 'uploads'
 
+# Cold storage for the ballots of archived elections (see app.archive)
+BALLOT_ARCHIVE_ROOT = Path(env('BALLOT_ARCHIVE_ROOT') or BASE_DIR / 'archive')
+
+# Fixed-width binary copies of each election's ballots for fast tallies (see app.ballot_store)
+BALLOT_STORE_ROOT = env('BALLOT_STORE_ROOT')
+
+# Pre-rendered results of closed elections, served by WhiteNoise (see app.published_results)
+PUBLISHED_RESULTS_ROOT = Path(env('PUBLISHED_RESULTS_ROOT') or MEDIA_ROOT / 'results')
+PUBLISHED_RESULTS_URL = env('PUBLISHED_RESULTS_URL')
+
+# Sharded turnout counters updated with every vote (see app.turnout)
+TURNOUT_COUNTER_SHARDS = env('TURNOUT_COUNTER_SHARDS')
+TURNOUT_CACHE_SECONDS = env('TURNOUT_CACHE_SECONDS')
+
+# Live status and turnout streams (see app.live)
+LIVE_POLL_SECONDS = env('LIVE_POLL_SECONDS')
+
+# Cache lifetime of anonymous election and candidate pages once the election is closed
+CLOSED_ELECTION_MAX_AGE = env('CLOSED_ELECTION_MAX_AGE')
+
+# Pages rendered once for all anonymous visitors (see app.page_cache)
+PAGE_CACHE_SECONDS = env('PAGE_CACHE_SECONDS')
+PAGE_CACHE_STATIC_SECONDS = env('PAGE_CACHE_STATIC_SECONDS')
+PAGE_CACHE_STALE_SECONDS = env('PAGE_CACHE_STALE_SECONDS')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -4,7 +4,8 @@ from app.views import (
     # Base views
     index, profile, terms, privacy, accessibility, contact,
     # Election views
-    ElectionListView, ElectionDetailView, ElectionCreateView, ElectionUpdateView,
+    ElectionListView, ElectionDetailView, ElectionTurnoutView, ElectionEventsView,
+    ElectionCreateView, ElectionUpdateView,
     # Candidate views
     CandidateCreateView, CandidateUpdateView, CandidateDeleteView, CandidateDetailView,
     # Vote views
@@ -34,11 +35,12 @@ from app.views import (
     # Base views
     index, profile, terms, privacy, accessibility, contact, faqs, how,
     # Election views
-    ElectionListView, ElectionDetailView, ElectionCreateView, ElectionUpdateView,
+    ElectionListView, ElectionDetailView, ElectionTurnoutView, ElectionEventsView,
+    ElectionCreateView, ElectionUpdateView,
     # Candidate views
     CandidateCreateView, CandidateUpdateView, CandidateDeleteView, CandidateDetailView,
     # Vote views
-    VoteView, CloseElectionView, StartElectionView, VerifyResultsView,
+    VoteView, CloseElectionView, StartElectionView, ElectionResultsView, VerifyResultsView, ReverifyResultsView,
     # Invitation views
     send_invitations, manage_invitations, invitation_accept, 
     resend_invitation, cancel_invitation, process_pending_invitation,
@@ -66,6 +68,8 @@ urlpatterns = [
     path('elections', ElectionListView.as_view(), name='election_list'),
     path('elections/create', ElectionCreateView.as_view(), name='create_election'),
     path('elections/<uuid:uuid>', ElectionDetailView.as_view(), name='election_detail'),
+    path('elections/<uuid:uuid>/turnout', ElectionTurnoutView.as_view(), name='election_turnout'),
+    path('elections/<uuid:uuid>/events', ElectionEventsView.as_view(), name='election_events'),
     path('elections/<uuid:uuid>/edit', ElectionUpdateView.as_view(), name='edit_election'),
     path('elections/<uuid:uuid>/close', CloseElectionView.as_view(), name='close_election'),
     path('elections/<uuid:uuid>/start', StartElectionView.as_view(), name='start_election'),
@@ -78,7 +82,9 @@ urlpatterns = [
     
     # Voting and results
     path('candidates/<uuid:uuid>/vote', VoteView.as_view(), name='vote'),
+    path('elections/<uuid:uuid>/results.json', ElectionResultsView.as_view(), name='election_results'),
     path('elections/<uuid:uuid>/verify-results', VerifyResultsView.as_view(), name='verify_results'),
+    path('elections/<uuid:uuid>/verify-results/reverify', ReverifyResultsView.as_view(), name='reverify_results'),
     
     # Invitation management
     path('elections/<uuid:uuid>/invitations', manage_invitations, name='manage_invitations'),